@@ -1,6 +1,7 @@
 import random
 from core import Action, State
-from typing import Any, Callable, Dict, List, Set, Tuple
+from typing import Dict, List, Set, Tuple
+from core.core_scoring import ActionScorer
 from core.core_bases import Agent, Problem
 from core.core_registers import AgentRegistry
 
@@ -46,16 +47,13 @@ class NormalDFSAgentOptimized(Agent):
 
         self.dfs_stack: List[Tuple[State, Action]] = []
         self.visited: Set[State] = set()
-        self.evaluate_func: Callable[[Problem, State, Action], Any] = lambda *_: 0
+        self.scorer = ActionScorer()
 
     @classmethod
     def from_config(cls, **config) -> "NormalDFSAgentOptimized":
-        """ 使用配置文件初始化 """
-        evaluate_func = config.get("evaluate_func")
+        """ 使用配置文件初始化，evaluate_func 与批量的 evaluate_actions 二选一即可 """
         instance = cls()
-        
-        if evaluate_func:
-            instance.evaluate_func = evaluate_func
+        instance.scorer = ActionScorer.from_config(**config)
 
         return instance
     
@@ -83,12 +81,7 @@ class NormalDFSAgentOptimized(Agent):
     def _sort(
         self, actions: List[Action], problem: Problem
     ) -> List[Action]:
-        cur_state = problem.get_state()
-
-        def action_score(action: Action) -> tuple[int, float]:
-            return self.evaluate_func(problem, cur_state, action)
-
-        return sorted(actions, key=action_score)
+        return self.scorer.sort(problem, problem.get_state(), actions)
 
 
 @AgentRegistry.register("DFSAgent")
@@ -194,7 +187,7 @@ class DFSAgentOptimized(Agent):
     def _get_back_path(self) -> List[Tuple[State, Action]]:
         """ 找到从最后一个有效位置出发到当前位置的路径 """
         back_path: List[Tuple[State, Action]] = []
-        while True:
+        while self.path:
             state, action = self.path.pop()
             back_path.append((state, action))
             if self.all_valid_actions[state]:
@@ -225,16 +218,13 @@ class DFSAgentOptimized2(Agent):
         self.all_valid_actions: Dict[State, Set[Action]] = {}
         self.visited: Dict[State, Set[Action]] = {}
         self.path: List[Tuple[State, Action]] = []
-        self.evaluate_func: Callable[[Problem, State, Action], Any] = lambda *_: 0
+        self.scorer = ActionScorer()
 
     @classmethod
     def from_config(cls, **config) -> "DFSAgentOptimized2":
-        """ 使用配置文件初始化 """
-        evaluate_func = config.get("evaluate_func")
+        """ 使用配置文件初始化，evaluate_func 与批量的 evaluate_actions 二选一即可 """
         instance = cls()
-        
-        if evaluate_func:
-            instance.evaluate_func = evaluate_func
+        instance.scorer = ActionScorer.from_config(**config)
 
         return instance
 
@@ -282,7 +272,7 @@ class DFSAgentOptimized2(Agent):
     def _get_back_path(self) -> List[Tuple[State, Action]]:
         """ 找到从最后一个有效位置出发到当前位置的路径 """
         back_path: List[Tuple[State, Action]] = []
-        while True:
+        while self.path:
             state, action = self.path.pop()
             back_path.append((state, action))
             if self.all_valid_actions[state]:
@@ -308,9 +298,4 @@ class DFSAgentOptimized2(Agent):
     def _sort(
         self, actions: List[Action], problem: Problem
     ) -> List[Action]:
-        cur_state = problem.get_state()
-
-        def action_score(action: Action) -> tuple[int, float]:
-            return self.evaluate_func(problem, cur_state, action)
-
-        return sorted(actions, key=action_score, reverse=True)
\ No newline at end of file
+        return self.scorer.sort(problem, problem.get_state(), actions, reverse=True)
\ No newline at end of file
@@ -1,7 +1,22 @@
-from .random_agent import RandomAgent
-from .DFS_agent import DFSAgent, DFSAgentOptimized, DFSAgentOptimized2, NormalDFSAgent
+import importlib
+from core.core_discovery import get_package_plugins
 
-__all__ = [
-    "RandomAgent", 
-    "DFSAgent", "DFSAgentOptimized", "DFSAgentOptimized2", "NormalDFSAgent"
-]
+
+def _agent_modules():
+    """ 插件清单中由本包注册的智能体：名称 -> 模块路径 """
+    return get_package_plugins(__name__, "agent")
+
+
+def __getattr__(name: str):
+    # 按需导入：访问某个智能体时，只会导入清单中它所在的模块
+    module_path = _agent_modules().get(name)
+    if module_path is not None:
+        return getattr(importlib.import_module(module_path), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted({*globals(), *_agent_modules()})
+
+
+__all__ = sorted(_agent_modules())
@@ -0,0 +1,201 @@
+from math import floor
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Sequence, Tuple
+from core import Action, ActionScorer, State
+from core.core_bases import Agent, Problem
+from core.core_registers import AgentRegistry
+
+
+INFINITY = float("inf")
+# (启发值, 动作, 后继状态)
+Child = Tuple[float, Action, State]
+
+
+class TranspositionTable:
+    """ 定长的置换表，每个槽位记录 (状态, 到达时的步数, 改进后的启发值, 所属迭代)
+
+    槽位由状态的哈希取模得到，冲突时按深度优先的策略替换：空槽、其他迭代留下的条目、
+    或者新条目离根更近（其下的子树更大）时才覆盖，表的大小在构建时就固定下来。
+    """
+    def __init__(self, size: int) -> None:
+        if size < 1:
+            raise ValueError("置换表大小必须是正整数")
+        self.size = size
+        self.states: List[Optional[State]] = [None] * size
+        self.depths: List[int] = [0] * size
+        self.bounds: List[float] = [0] * size
+        self.stamps: List[int] = [-1] * size
+        self.hits = 0
+        self.replacements = 0
+
+    def clear(self) -> None:
+        size = self.size
+        self.states = [None] * size
+        self.depths = [0] * size
+        self.bounds = [0] * size
+        self.stamps = [-1] * size
+
+    def lookup(self, slot: int, state: State) -> bool:
+        if self.states[slot] is not None and self.states[slot] == state:
+            self.hits += 1
+            return True
+        return False
+
+    def store(self, slot: int, state: State, depth: int, bound: float, stamp: int) -> None:
+        stored = self.states[slot]
+        if stored is not None and stored != state:
+            if self.stamps[slot] == stamp and self.depths[slot] < depth:
+                return
+            self.replacements += 1
+        self.states[slot] = state
+        self.depths[slot] = depth
+        self.bounds[slot] = bound
+        self.stamps[slot] = stamp
+
+
+@AgentRegistry.register("IDAStarAgent")
+class IDAStarAgent(Agent):
+    """ 迭代加深 A*：适用于任意 Problem，只依赖 get_legal_actions / apply_action_to_state / reverse
+
+    evaluate_func（或批量的 evaluate_actions）经 ActionScorer 给出的后继状态分数作为启发值，分数为元组时取第一项；
+    启发值可采纳时得到最优解（迷宫分数的第一项是曼哈顿距离）。搜索用显式栈进行，
+    除定长置换表与打分缓存外内存只与解的深度成正比。
+    置换表记录本次迭代中到达过的状态，以更长的步数再次到达时剪枝；子树搜索失败后记录更紧的下界，
+    后续迭代据此减少重复展开。
+
+    第一次调用 select_action 时规划整条路径，之后逐步执行；状态与计划不一致时重新规划。
+    """
+    def __init__(
+        self, evaluate_func: Optional[Callable[..., Any]] = None,
+        evaluate_actions: Optional[Callable[..., List[Any]]] = None,
+        table_size: int = 1 << 18, max_expanded: Optional[int] = None,
+        score_cache_size: int = 1 << 16
+    ) -> None:
+        super().__init__()
+        self.scorer = ActionScorer(evaluate_func, evaluate_actions, score_cache_size)
+        self.table = TranspositionTable(table_size)
+        # 展开节点数的上限，None 表示不限制；超过后放弃规划
+        self.max_expanded = max_expanded
+        self.stats: Dict[str, int] = {"iterations": 0, "expanded": 0, "max_depth": 0}
+        self._plan: Deque[Action] = deque()
+        self._expected: Optional[State] = None
+        self._problem: Optional[Problem] = None
+
+    @classmethod
+    def from_config(cls, **config) -> "IDAStarAgent":
+        """ 使用配置文件初始化，evaluate_func 与批量的 evaluate_actions 二选一即可 """
+        return cls(
+            evaluate_func=config.get("evaluate_func"),
+            evaluate_actions=config.get("evaluate_actions"),
+            table_size=config.get("table_size", 1 << 18),
+            max_expanded=config.get("max_expanded"),
+            score_cache_size=config.get("score_cache_size", 1 << 16)
+        )
+
+    def _scores(self, problem: Problem, state: State, actions: Sequence[Action]) -> List[float]:
+        scores = self.scorer.score(problem, state, actions)
+        return [score[0] if isinstance(score, tuple) else score for score in scores]
+
+    def _expand(self, problem: Problem, state: State, last_action: Optional[Action]) -> List[Child]:
+        """ 后继状态按启发值从小到大排列，不走回头路 """
+        self.stats["expanded"] += 1
+        back = last_action.reverse() if last_action is not None else None
+        actions = [action for action in problem.get_legal_actions(state) if action != back]
+        children: List[Child] = []
+        for score, action in zip(self._scores(problem, state, actions), actions):
+            child = problem.apply_action_to_state(state, action)
+            if child != state:
+                children.append((score, action, child))
+        children.sort(key=lambda child: child[0])
+        return children
+
+    def search(self, problem: Problem, root: State) -> Optional[List[Action]]:
+        """ 从 root 搜索到结束状态的动作序列，无解或超过 max_expanded 时返回 None """
+        if problem.is_end_state(root):
+            return []
+
+        table = self.table
+        table.clear()
+        state_hash: Callable[[Hashable], int] = getattr(problem, "state_hash", hash)
+        size = table.size
+        expanded_before = self.stats["expanded"]
+        bound: float = 0
+        iteration = 0
+        while bound < INFINITY:
+            iteration += 1
+            self.stats["iterations"] += 1
+            path: List[Action] = []
+            table.store(state_hash(root) % size, root, 0, 0, iteration)
+            # 栈帧：[状态, 步数, 启发值, 后继列表, 下一个后继的下标, 超出界限的最小 f 值, 子树是否未被置换表剪枝]
+            stack: List[List[Any]] = [[root, 0, 0, self._expand(problem, root, None), 0, INFINITY, True]]
+            next_iteration_bound = INFINITY
+            while stack:
+                frame = stack[-1]
+                state, depth, heuristic, children, index, next_bound, exact = frame
+                if index == len(children):
+                    stack.pop()
+                    # 子树中有被剪掉的置换时，超出界限的最小 f 值不一定是下界，只能确定这一轮界限内无解
+                    improved = next_bound - depth if exact else floor(bound) + 1 - depth
+                    table.store(state_hash(state) % size, state, depth, max(heuristic, improved), iteration)
+                    if stack:
+                        parent = stack[-1]
+                        parent[5] = min(parent[5], next_bound)
+                        parent[6] = parent[6] and exact
+                        path.pop()
+                    else:
+                        next_iteration_bound = next_bound
+                    continue
+
+                frame[4] += 1
+                child_heuristic, action, child = children[index]
+                child_depth = depth + 1
+                slot = state_hash(child) % size
+                if table.lookup(slot, child):
+                    if table.stamps[slot] == iteration and table.depths[slot] <= child_depth:
+                        # 本次迭代已经以不更长的步数到达过（或者就在当前路径上）
+                        frame[6] = False
+                        continue
+                    child_heuristic = max(child_heuristic, table.bounds[slot])
+
+                cost = child_depth + child_heuristic
+                if cost > bound:
+                    frame[5] = min(next_bound, cost)
+                    continue
+                if problem.is_end_state(child):
+                    path.append(action)
+                    return path
+                if self.max_expanded is not None and self.stats["expanded"] - expanded_before >= self.max_expanded:
+                    return None
+
+                table.store(slot, child, child_depth, child_heuristic, iteration)
+                path.append(action)
+                stack.append([
+                    child, child_depth, child_heuristic, self._expand(problem, child, action), 0, INFINITY, True
+                ])
+                self.stats["max_depth"] = max(self.stats["max_depth"], child_depth)
+            bound = next_iteration_bound
+        return None
+
+    def _replan(self, problem: Problem, state: State) -> None:
+        self._plan.clear()
+        path = self.search(problem, state)
+        if path is not None:
+            self._plan.extend(path)
+
+    def select_action(self, problem: Problem) -> Optional[Action]:
+        """ 基于当前问题状态选择动作 """
+        if problem is not self._problem:
+            self._problem = problem
+            self._expected = None
+
+        state = problem.get_state()
+        if problem.is_end_state(state):
+            return None
+        if state != self._expected or not self._plan:
+            self._replan(problem, state)
+        if not self._plan:
+            return None
+
+        action = self._plan.popleft()
+        self._expected = problem.apply_action_to_state(state, action)
+        return action
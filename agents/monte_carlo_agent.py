@@ -0,0 +1,98 @@
+import time
+import random
+from typing import Dict, List, Optional
+from core import Action, State
+from core.core_bases import Agent, Problem
+from core.core_registers import AgentRegistry
+from core.core_scoring import ActionScorer
+
+
+@AgentRegistry.register("MonteCarloAgent")
+class MonteCarloAgent(Agent):
+    """ 在时间预算内对每个候选动作做随机展开，选择平均代价最低的动作
+
+    展开代价：到达终点时为 (步数 - reach_bonus)，否则为展开路径上启发值的最小值；
+    另外按第一步后继状态的已访问次数加罚，避免在已走过的区域来回打转。
+    """
+    anytime = True
+
+    def __init__(
+        self, rollout_depth: int = 32, budget: float = 0.005,
+        revisit_penalty: float = 2.0, reach_bonus: float = 1e6
+    ) -> None:
+        super().__init__()
+
+        self.rollout_depth = rollout_depth
+        self.budget = budget
+        self.revisit_penalty = revisit_penalty
+        self.reach_bonus = reach_bonus
+        self.visit_counts: Dict[State, int] = {}
+        self.scorer = ActionScorer()
+
+    @classmethod
+    def from_config(cls, **config) -> "MonteCarloAgent":
+        """ 使用配置文件初始化 """
+        instance = cls(
+            rollout_depth=config.get("rollout_depth", 32),
+            budget=config.get("budget", 0.005),
+            revisit_penalty=config.get("revisit_penalty", 2.0),
+            reach_bonus=config.get("reach_bonus", 1e6)
+        )
+        instance.scorer = ActionScorer.from_config(**config)
+
+        return instance
+
+    def select_action(self, problem: Problem, deadline: Optional[float] = None) -> Action:
+        """ 在 deadline 之前选择动作；未给出 deadline 时使用默认预算 """
+        if deadline is None:
+            deadline = time.perf_counter() + self.budget
+
+        cur_state = problem.get_state()
+        self.visit_counts[cur_state] = self.visit_counts.get(cur_state, 0) + 1
+
+        actions: List[Action] = list(problem.get_legal_actions(cur_state))
+        if not actions:
+            return None
+
+        totals = [0.0] * len(actions)
+        counts = [0] * len(actions)
+        index = 0
+        # 每个动作至少展开一次，之后轮流展开直到截止时间
+        while index < len(actions) or time.perf_counter() < deadline:
+            slot = index % len(actions)
+            totals[slot] += self._rollout(problem, cur_state, actions[slot])
+            counts[slot] += 1
+            index += 1
+
+        best = min(range(len(actions)), key=lambda slot: totals[slot] / counts[slot])
+        return actions[best]
+
+    def _heuristic(self, problem: Problem, state: State, action: Action) -> float:
+        score = self.scorer.score(problem, state, (action,))[0]
+        return score[0] if isinstance(score, tuple) else score
+
+    def _rollout(self, problem: Problem, state: State, action: Action) -> float:
+        """ 从 state 执行 action 后随机游走，返回展开代价（越小越好） """
+        next_state = problem.apply_action_to_state(state, action)
+        penalty = self.revisit_penalty * self.visit_counts.get(next_state, 0)
+        if problem.is_end_state(next_state):
+            return 1 - self.reach_bonus + penalty
+
+        best = self._heuristic(problem, state, action)
+        last_action = action
+        cur_state = next_state
+        for depth in range(2, self.rollout_depth + 1):
+            actions = [
+                candidate for candidate in problem.get_legal_actions(cur_state)
+                if candidate != last_action.reverse()
+            ] or list(problem.get_legal_actions(cur_state))
+            if not actions:
+                break
+
+            last_action = random.choice(actions)
+            best = min(best, self._heuristic(problem, cur_state, last_action))
+            cur_state = problem.apply_action_to_state(cur_state, last_action)
+            if problem.is_end_state(cur_state):
+                return depth - self.reach_bonus + penalty
+
+        return best + penalty
@@ -0,0 +1,176 @@
+import time
+import queue
+import multiprocessing
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from core import Action, State
+from core.core_bases import Agent, Problem
+from core.core_registers import AgentRegistry
+
+
+# (执行动作前的状态, 动作)：有的智能体在决策时通过 set_state 直接移动问题，回放时需要先回到记录的状态
+Step = Tuple[State, Action]
+MODES = ("first", "shortest")
+# 等待结果时检查成员进程是否还存活的间隔（秒）
+POLL_INTERVAL = 0.1
+
+
+def _race_worker(
+    result_queue: "multiprocessing.Queue", index: int, agent_name: str,
+    agent_config: Dict[str, Any], problem: Problem, max_steps: int
+) -> None:
+    """ 子进程：在问题副本上运行一个智能体直到结束状态，回传 (编号, 动作序列)；失败时动作序列为 None """
+    plan: Optional[List[Step]] = None
+    try:
+        agent = AgentRegistry.get_agent(agent_name).from_config(**agent_config)
+        steps: List[Step] = []
+        for _ in range(max_steps):
+            if problem.is_end_state(problem.get_state()):
+                plan = steps
+                break
+            action = agent.select_action(problem)
+            if action is None:
+                break
+            steps.append((problem.get_state(), action))
+            problem.apply_action(action)
+        else:
+            if problem.is_end_state(problem.get_state()):
+                plan = steps
+    except KeyboardInterrupt:
+        return
+    except Exception:
+        # 成员抛出异常（包括在守护进程中无法再创建子进程）时同样回报失败，避免主进程一直等待
+        plan = None
+    result_queue.put((index, plan))
+
+
+@AgentRegistry.register("PortfolioAgent")
+class PortfolioAgent(Agent):
+    """ 在多个进程中让几个已注册的智能体同时求解同一问题的副本，采用胜出者的动作序列
+
+    mode="first" 时采用第一个到达结束状态的智能体；mode="shortest" 时等待全部完成或到达 time_limit，
+    采用其中最短的动作序列。决出胜者后终止其余进程，之后逐步回放胜者的动作；状态与回放不一致时重新比赛。
+    evaluate_func 等配置原样传给每个成员，agent_params 可以按名称为成员单独指定参数。
+    """
+    def __init__(
+        self, agents: Optional[List[str]] = None, agent_config: Optional[Dict[str, Any]] = None,
+        agent_params: Optional[Dict[str, Dict[str, Any]]] = None, mode: str = "first",
+        time_limit: Optional[float] = None, max_steps: int = 1000000
+    ) -> None:
+        super().__init__()
+        self.agents: List[str] = list(agents or ["DFSAgentOptimized2", "NormalDFSAgentOptimized", "IDAStarAgent"])
+        if not self.agents:
+            raise ValueError("PortfolioAgent 至少需要一个成员")
+        if "PortfolioAgent" in self.agents:
+            raise ValueError("PortfolioAgent 不能包含自身")
+        registered = set(AgentRegistry.list_agents())
+        unknown = [name for name in self.agents if name not in registered]
+        if unknown:
+            raise ValueError(f"未注册的智能体：{', '.join(unknown)}")
+        if mode not in MODES:
+            raise ValueError(f"未知的 mode：{mode}，可选 {', '.join(MODES)}")
+
+        self.agent_config: Dict[str, Any] = dict(agent_config or {})
+        self.agent_params: Dict[str, Dict[str, Any]] = dict(agent_params or {})
+        self.mode = mode
+        self.time_limit = time_limit
+        self.max_steps = max_steps
+        # 最近一次比赛的结果：胜者、各成员的动作序列长度（失败为 None，未完成的不出现）与耗时
+        self.stats: Dict[str, Any] = {}
+        self._plan: Deque[Step] = deque()
+        self._expected: Optional[State] = None
+        self._problem: Optional[Problem] = None
+
+    @classmethod
+    def from_config(cls, **config) -> "PortfolioAgent":
+        """ 使用配置文件初始化：agents / agent_params / mode / time_limit / max_steps 之外的配置传给每个成员 """
+        own = ("agents", "agent_params", "mode", "time_limit", "max_steps")
+        return cls(
+            agents=config.get("agents"),
+            agent_config={name: value for name, value in config.items() if name not in own},
+            agent_params=config.get("agent_params"),
+            mode=config.get("mode", "first"),
+            time_limit=config.get("time_limit"),
+            max_steps=config.get("max_steps", 1000000)
+        )
+
+    def race(self, problem: Problem) -> Optional[List[Step]]:
+        """ 从问题的当前状态开始比赛，返回胜者的动作序列；没有成员在时限内求解时返回 None """
+        start = time.perf_counter()
+        deadline = start + self.time_limit if self.time_limit is not None else None
+        result_queue: "multiprocessing.Queue" = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(
+                target=_race_worker, daemon=True,
+                args=(
+                    result_queue, index, name, {**self.agent_config, **self.agent_params.get(name, {})},
+                    problem.fork(), self.max_steps
+                )
+            )
+            for index, name in enumerate(self.agents)
+        ]
+        for process in processes:
+            process.start()
+
+        lengths: Dict[str, Optional[int]] = {}
+        best: Optional[Tuple[int, List[Step]]] = None
+        try:
+            while len(lengths) < len(processes):
+                timeout = POLL_INTERVAL if deadline is None else min(POLL_INTERVAL, deadline - time.perf_counter())
+                if timeout <= 0:
+                    break
+                try:
+                    index, plan = result_queue.get(timeout=timeout)
+                except queue.Empty:
+                    # 被强行结束的成员来不及回报结果，全部成员都退出后不再等待
+                    if any(process.is_alive() for process in processes) or not result_queue.empty():
+                        continue
+                    break
+
+                lengths[self.agents[index]] = None if plan is None else len(plan)
+                if plan is not None and (best is None or len(plan) < len(best[1])):
+                    best = (index, plan)
+                if best is not None and self.mode == "first":
+                    break
+        finally:
+            # 还在运行（或结果尚未被读取）的成员直接终止
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+            for process in processes:
+                process.join()
+            result_queue.close()
+
+        self.stats = {
+            "winner": self.agents[best[0]] if best is not None else None,
+            "lengths": lengths,
+            "elapsed_s": time.perf_counter() - start
+        }
+        return best[1] if best is not None else None
+
+    def _replan(self, problem: Problem) -> None:
+        self._plan.clear()
+        plan = self.race(problem)
+        if plan is not None:
+            self._plan.extend(plan)
+
+    def select_action(self, problem: Problem) -> Optional[Action]:
+        """ 基于当前问题状态选择动作 """
+        if problem is not self._problem:
+            self._problem = problem
+            self._expected = None
+
+        state = problem.get_state()
+        if problem.is_end_state(state):
+            return None
+        if state != self._expected or not self._plan:
+            self._replan(problem)
+        if not self._plan:
+            return None
+
+        recorded_state, action = self._plan.popleft()
+        if recorded_state != problem.get_state():
+            # 胜者当时通过 set_state 移动过问题，回放时同样移动
+            problem.set_state(recorded_state)
+        self._expected = problem.apply_action_to_state(recorded_state, action)
+        return action
@@ -0,0 +1,18 @@
+import os
+
+# 基准测试必须能在无显示器的环境下运行，需在导入 pygame 之前设置
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from .scenarios import SCENARIOS, DEFAULT_AGENTS, DEFAULT_SIZES, LARGE_SIZES  # noqa: E402
+from .runner import run_benchmarks, compare_results, load_results, save_results  # noqa: E402
+
+__all__ = [
+    "SCENARIOS",
+    "DEFAULT_AGENTS",
+    "DEFAULT_SIZES",
+    "LARGE_SIZES",
+    "run_benchmarks",
+    "compare_results",
+    "load_results",
+    "save_results"
+]
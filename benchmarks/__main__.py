@@ -0,0 +1,64 @@
+import sys
+import argparse
+from . import (
+    SCENARIOS, DEFAULT_AGENTS, DEFAULT_SIZES, LARGE_SIZES,
+    run_benchmarks, compare_results, load_results, save_results
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="固定种子的迷宫生成 / 问题 / 智能体 / 渲染基准测试"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="迷宫边长列表")
+    parser.add_argument(
+        "--large", action="store_true", help=f"在尺寸列表后追加大迷宫 {' '.join(map(str, LARGE_SIZES))}（非常慢）"
+    )
+    parser.add_argument("--scenarios", nargs="+", default=SCENARIOS, choices=SCENARIOS, help="要运行的场景")
+    parser.add_argument("--agents", nargs="+", default=DEFAULT_AGENTS, help="参与单步开销测试的智能体")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--repeat", type=int, default=3, help="计时重复次数（取最小值）")
+    parser.add_argument("--max-steps", type=int, default=20000, help="智能体场景的步数上限")
+    parser.add_argument("--render-max-size", type=int, default=1024, help="渲染场景的最大迷宫边长")
+    parser.add_argument("--render-frames", type=int, default=5, help="渲染场景每次绘制的帧数")
+    parser.add_argument("--no-memory", action="store_true", help="跳过 tracemalloc 峰值内存测量")
+    parser.add_argument("--output", "-o", help="结果 JSON 的保存路径")
+    parser.add_argument("--baseline", "-b", help="用于比较的基线 JSON")
+    parser.add_argument("--threshold", type=float, default=0.1, help="判定退化的相对阈值")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    sizes = list(args.sizes)
+    if args.large:
+        sizes.extend(size for size in LARGE_SIZES if size not in sizes)
+    results = run_benchmarks(
+        sizes, args.scenarios, seed=args.seed,
+        agents=args.agents, repeat=args.repeat, max_steps=args.max_steps,
+        render_max_size=args.render_max_size, render_frames=args.render_frames,
+        memory=not args.no_memory
+    )
+
+    if args.output:
+        save_results(results, args.output)
+        print(f"\n结果已保存到 {args.output}")
+
+    if args.baseline:
+        regressions = compare_results(results, load_results(args.baseline), args.threshold)
+        if regressions:
+            print(f"\n发现 {len(regressions)} 项超过 {args.threshold:.0%} 的退化：")
+            for item in regressions:
+                print(
+                    f"  {item['scenario']} @ {item['size']} {item['metric']}: "
+                    f"{item['baseline']:.4g} -> {item['current']:.4g} (x{item['ratio']:.2f})"
+                )
+            return 1
+        print("\n未发现退化")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+import gc
+import json
+import time
+import random
+import platform
+import tracemalloc
+from typing import Any, Dict, List, Optional
+from .scenarios import get_scenarios
+
+
+def _measure(scenario: str, size: int, seed: int, options: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """ 运行单个场景：计时取多次重复中的最小值，峰值内存单独用 tracemalloc 测一次 """
+    prepare = get_scenarios(options.get("agents", []))[scenario]
+    random.seed(seed)
+    prepared = prepare(size, seed, options)
+    if prepared is None:
+        return None
+
+    run, unit = prepared
+    best_time = float("inf")
+    ops = 0
+    for _ in range(max(1, options.get("repeat", 1))):
+        random.seed(seed)
+        gc.collect()
+        start = time.perf_counter()
+        ops = run()
+        best_time = min(best_time, time.perf_counter() - start)
+
+    peak_bytes = None
+    if options.get("memory", True):
+        random.seed(seed)
+        gc.collect()
+        tracemalloc.start()
+        run()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "scenario": scenario,
+        "size": size,
+        "seed": seed,
+        "time_s": best_time,
+        "peak_bytes": peak_bytes,
+        "ops": ops,
+        "throughput": ops / best_time if best_time > 0 else None,
+        "unit": unit
+    }
+
+
+def run_benchmarks(
+    sizes: List[int], scenarios: List[str], seed: int = 0, verbose: bool = True, **options
+) -> Dict[str, Any]:
+    """ 按 尺寸 × 场景 运行全部基准，返回可直接写入 JSON 的结果 """
+    selected = [
+        name for name in get_scenarios(options.get("agents", []))
+        if name in scenarios or (name.startswith("agent:") and "agents" in scenarios)
+    ]
+
+    results: List[Dict[str, Any]] = []
+    for size in sizes:
+        for scenario in selected:
+            result = _measure(scenario, size, seed, options)
+            if result is None:
+                continue
+            results.append(result)
+            if verbose:
+                print(_format_result(result), flush=True)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "options": dict(options)
+        },
+        "results": results
+    }
+
+
+def _format_result(result: Dict[str, Any]) -> str:
+    peak = result["peak_bytes"]
+    peak_str = f"{peak / 1024 / 1024:9.2f} MiB" if peak is not None else "        - MiB"
+    throughput = result["throughput"]
+    throughput_str = f"{throughput:14.1f} {result['unit']}" if throughput else "-"
+    return (
+        f"{result['scenario']:<34} {result['size']:>6} "
+        f"{result['time_s']:10.4f} s {peak_str} {throughput_str}"
+    )
+
+
+def save_results(results: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(results, file, ensure_ascii=False, indent=2)
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def compare_results(
+    current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.1
+) -> List[Dict[str, Any]]:
+    """ 与基线比较，返回耗时或峰值内存超过 (1 + threshold) 倍基线的条目 """
+    baseline_index = {
+        (result["scenario"], result["size"]): result for result in baseline["results"]
+    }
+
+    regressions: List[Dict[str, Any]] = []
+    for result in current["results"]:
+        base = baseline_index.get((result["scenario"], result["size"]))
+        if base is None:
+            continue
+
+        for metric in ("time_s", "peak_bytes"):
+            cur_value, base_value = result.get(metric), base.get(metric)
+            if not cur_value or not base_value:
+                continue
+
+            ratio = cur_value / base_value
+            if ratio > 1 + threshold:
+                regressions.append({
+                    "scenario": result["scenario"],
+                    "size": result["size"],
+                    "metric": metric,
+                    "baseline": base_value,
+                    "current": cur_value,
+                    "ratio": ratio
+                })
+
+    return regressions
@@ -0,0 +1,150 @@
+import random
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from core import AgentRegistry, Problem
+from problems.maze.maze_problem import MazeProblem, evaluate_func, evaluate_actions
+from problems.maze.utils.generate_walls import generate_walls
+
+
+# 默认尺寸最大 1024；更大的迷宫单进程生成就要数分钟，需要用 --large 显式开启
+DEFAULT_SIZES: List[int] = [16, 64, 256, 1024]
+LARGE_SIZES: List[int] = [2048, 4096]
+DEFAULT_AGENTS: List[str] = [
+    "NormalDFSAgent", "NormalDFSAgentOptimized",
+    "DFSAgent", "DFSAgentOptimized", "DFSAgentOptimized2"
+]
+
+# 场景准备函数返回 (可重复执行的测量体, 吞吐量单位)，测量体返回本次完成的操作数
+Prepared = Tuple[Callable[[], int], str]
+
+
+_cached_problem: Dict[Tuple[int, int], MazeProblem] = {}
+
+
+def _get_problem(size: int, seed: int) -> MazeProblem:
+    """ 按 (尺寸, 种子) 缓存迷宫，只保留最近一个以免大迷宫占用过多内存 """
+    key = (size, seed)
+    if key not in _cached_problem:
+        _cached_problem.clear()
+        random.seed(seed)
+        _cached_problem[key] = MazeProblem(rows=size, cols=size)
+    return _cached_problem[key]
+
+
+def prepare_generate(size: int, seed: int, options: Dict[str, Any]) -> Prepared:
+    """ 迷宫生成：整张 size × size 迷宫的 generate_walls 调用 """
+    break_rate = options.get("break_rate", 0.05)
+    max_size = options.get("max_size", 40)
+
+    def run() -> int:
+        generate_walls(size, size, break_rate, max_size)
+        return size * size
+
+    return run, "cells/s"
+
+
+def prepare_legal_actions(size: int, seed: int, options: Dict[str, Any]) -> Prepared:
+    """ 合法动作查询：对固定的随机格子序列调用 get_legal_actions """
+    problem = _get_problem(size, seed)
+    rng = random.Random(seed)
+    samples = min(size * size, options.get("legal_samples", 100000))
+    cells = [(rng.randrange(size), rng.randrange(size)) for _ in range(samples)]
+
+    def run() -> int:
+        for cell in cells:
+            problem.get_legal_actions(cell)
+        return samples
+
+    return run, "calls/s"
+
+
+def make_prepare_agent(agent_name: str) -> Callable[[int, int, Dict[str, Any]], Prepared]:
+    """ 智能体单步开销：从起点开始运行，直到到达终点或达到步数上限 """
+    def prepare_agent(size: int, seed: int, options: Dict[str, Any]) -> Prepared:
+        problem: Problem = _get_problem(size, seed)
+        agent_class = AgentRegistry.get_agent(agent_name)
+        if agent_class is None:
+            raise ValueError(f"未注册的智能体：{agent_name}")
+        max_steps = options.get("max_steps", 20000)
+
+        def run() -> int:
+            problem.init_problem_state()
+            agent = agent_class.from_config(evaluate_func=evaluate_func, evaluate_actions=evaluate_actions)
+            steps = 0
+            while steps < max_steps and not problem.is_end_state(problem.get_state()):
+                problem.apply_action(agent.select_action(problem))
+                steps += 1
+            return steps
+
+        return run, "steps/s"
+
+    return prepare_agent
+
+
+def prepare_swarm(size: int, seed: int, options: Dict[str, Any]) -> Optional[Prepared]:
+    """ 多智能体覆盖：swarm_agents 个 DFSAgentOptimized2 在同一迷宫中运行，动作被挡住时不能打乱它们的路径记录 """
+    if size > options.get("swarm_max_size", 64):
+        return None
+
+    from problems.maze.multi_maze_problem import MultiMazeProblem
+
+    num_agents = min(options.get("swarm_agents", 100), size * size // 4)
+    problem = MultiMazeProblem(rows=size, cols=size, num_agents=num_agents, end_condition="coverage", seed=seed)
+    agent_class = AgentRegistry.get_agent("MazeSwarmAgent")
+    max_ticks = options.get("swarm_ticks", 2000)
+
+    def run() -> int:
+        problem.init_problem_state()
+        agent = agent_class.from_config(
+            swarm_agent="DFSAgentOptimized2", evaluate_func=evaluate_func, evaluate_actions=evaluate_actions
+        )
+        ticks = 0
+        while ticks < max_ticks and not problem.is_end_state(problem.get_state()):
+            problem.apply_action(agent.select_action(problem))
+            ticks += 1
+        return ticks * num_agents
+
+    return run, "moves/s"
+
+
+def prepare_render(size: int, seed: int, options: Dict[str, Any]) -> Optional[Prepared]:
+    """ 渲染开销：在 dummy 视频驱动下重复调用 MazeRenderer.render """
+    if size > options.get("render_max_size", 1024):
+        return None
+
+    import pygame
+    from problems.maze.utils.maze_renderer import MazeRenderer
+
+    problem = _get_problem(size, seed)
+    problem.init_problem_state()
+    frames = options.get("render_frames", 5)
+    cell_size = max(1, min(16, 768 // size))
+    offset = 30
+    side = size * (cell_size + 1) + 2 * offset
+
+    pygame.display.init()
+    screen = pygame.display.set_mode((side, side))
+    renderer = MazeRenderer(screen, problem, cell_size=cell_size, offset=offset)
+
+    def run() -> int:
+        for _ in range(frames):
+            renderer.render()
+        return frames
+
+    return run, "frames/s"
+
+
+def get_scenarios(agent_names: List[str]) -> Dict[str, Callable[[int, int, Dict[str, Any]], Optional[Prepared]]]:
+    """ 返回 场景名 -> 准备函数 的有序字典 """
+    scenarios: Dict[str, Callable[[int, int, Dict[str, Any]], Optional[Prepared]]] = {
+        "generate_walls": prepare_generate,
+        "get_legal_actions": prepare_legal_actions,
+    }
+    for agent_name in agent_names:
+        scenarios[f"agent:{agent_name}"] = make_prepare_agent(agent_name)
+    scenarios["swarm"] = prepare_swarm
+    scenarios["render"] = prepare_render
+
+    return scenarios
+
+
+SCENARIOS: List[str] = ["generate_walls", "get_legal_actions", "agents", "swarm", "render"]
@@ -1,5 +1,7 @@
 from .core_bases import Problem, Renderer, Agent, Action, State
 from .core_registers import ProblemRegistry, RendererRegistry, AgentRegistry
+from .core_scoring import ActionScorer
+from .core_counting import CountingProblem, deep_sizeof
 
 __all__ = [
     "Problem",
@@ -9,5 +11,8 @@ __all__ = [
     "RendererRegistry",
     "AgentRegistry",
     "Action",
-    "State"
+    "State",
+    "ActionScorer",
+    "CountingProblem",
+    "deep_sizeof"
 ]
\ No newline at end of file
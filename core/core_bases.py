@@ -1,7 +1,12 @@
-from pygame import Surface
-from typing import Dict, Set
+import copy
+import asyncio
+from typing import TYPE_CHECKING, Any, Dict, Optional, Set
 from abc import ABC, abstractmethod
 
+if TYPE_CHECKING:
+    # 仅用于类型标注，运行时不导入 pygame，使无需渲染的进程可以不依赖 pygame
+    from pygame import Surface
+
 class Action(ABC):
     @abstractmethod
     def __init__(self, action_str: str) -> None:
@@ -84,13 +89,42 @@ class Problem(ABC):
         """ 直接设置问题的状态 """
         pass
 
+    def snapshot(self) -> Any:
+        """ 返回记录当前完整状态的令牌，之后可以用 restore 回到该状态 """
+        return self.get_state()
+
+    def restore(self, token: Any) -> None:
+        """ 回到 snapshot 记录的状态，令牌只在同一次 init_problem_state 之后有效 """
+        self.set_state(token)
+
+    def fork(self) -> "Problem":
+        """ 返回可以独立修改的副本，子类可以共享不可变数据以降低开销 """
+        return copy.deepcopy(self)
+
 
 class Agent(ABC):
+    # 为 True 时 select_action 接受 deadline 参数（time.perf_counter() 时刻），并在截止前返回当前最优动作
+    anytime: bool = False
+
     @abstractmethod
     def select_action(self, problem: Problem) -> State:
         """ 基于当前问题状态选择动作 """
         pass
 
+    def select_action_before(self, problem: Problem, deadline: Optional[float] = None) -> Action:
+        """ 统一的限时决策入口：只把截止时间传给支持它的智能体 """
+        if self.anytime:
+            return self.select_action(problem, deadline=deadline)
+        return self.select_action(problem)
+
+    async def select_action_async(self, problem: Problem, deadline: Optional[float] = None) -> Action:
+        """ 异步决策，默认在线程中执行 select_action_before，调用方可以用超时等待它 """
+        return await asyncio.to_thread(self.select_action_before, problem, deadline)
+
+    def fallback_action(self, problem: Problem) -> Optional[Action]:
+        """ 超过截止时间仍未决策时使用的动作，默认原地不动，避免打乱有状态智能体的内部记录 """
+        return None
+
     @classmethod
     @abstractmethod
     def from_config(cls, **config) -> "Agent":
@@ -99,7 +133,7 @@ class Agent(ABC):
 
 
 class Renderer(ABC):
-    def __init__(self, screen: Surface, problem: Problem, **config) -> None:
+    def __init__(self, screen: "Surface", problem: Problem, **config) -> None:
         self.problem = problem
         self.config = config
         self.screen = screen
@@ -0,0 +1,171 @@
+import sys
+import weakref
+from collections import deque
+from types import FunctionType, MethodType, ModuleType
+from typing import Any, Dict, Iterable, Iterator, Optional, Set
+from .core_bases import Action, Problem, State
+
+
+# 计数的方法，按调用次数记录
+COUNTED_METHODS = ("get_legal_actions", "apply_action_to_state", "set_state", "get_state")
+
+# 这些对象不算作智能体自己的内存：共享的代码、类型，以及被包装的问题
+_SKIPPED_TYPES = (type, ModuleType, FunctionType, MethodType)
+
+
+def _walk(roots: Iterable[Any], seen: Set[int]) -> Iterator[Any]:
+    """ 深度优先遍历 roots 引用的容器与实例属性，跳过 seen 中的对象，遍历到的对象加入 seen """
+    stack = list(roots)
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _SKIPPED_TYPES):
+            continue
+        seen.add(id(obj))
+        yield obj
+
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+            stack.extend(obj)
+        if hasattr(obj, "__dict__"):
+            stack.append(obj.__dict__)
+        for slot in getattr(type(obj), "__slots__", ()):
+            if hasattr(obj, slot):
+                stack.append(getattr(obj, slot))
+
+
+def deep_sizeof(root: Any, exclude: Iterable[Any] = (), shared: Iterable[Any] = ()) -> int:
+    """ 递归统计对象及其引用的容器、实例属性占用的字节数，每个对象只计一次
+
+    类、模块、函数与 exclude 中的对象本身不计入；shared 中的对象以及从它们出发能访问到的所有对象
+    （例如问题内部的缓存）也不计入，即使 root 同样引用了它们。
+    """
+    seen: Set[int] = {id(obj) for obj in exclude}
+    for _ in _walk(shared, seen):
+        pass
+    return sum(sys.getsizeof(obj) for obj in _walk([root], seen))
+
+
+class CountingProblem(Problem):
+    """ 包装任意 Problem，统计智能体的搜索工作量，与机器速度和解释器开销无关
+
+    记录 get_legal_actions / apply_action_to_state / set_state / get_state 的调用次数，
+    以及这些调用中出现过的不同状态数；sample_agent 记录智能体内存占用的峰值。
+    其余方法与属性原样转发给被包装的问题，因此 getattr(problem, "fog") 之类的探测照常工作。
+    只把包装后的问题交给智能体，运行循环自己的查询仍使用原来的问题，不计入统计。
+    """
+    def __init__(self, problem: Problem, track_states: bool = True) -> None:
+        self.problem = problem
+        self.counts: Dict[str, int] = {name: 0 for name in COUNTED_METHODS}
+        # 出现过的状态，关闭后不统计 distinct_states，避免额外的内存占用
+        self.states: Optional[Set[State]] = set() if track_states else None
+        self.agent_peak_bytes = 0
+        # fork 出的包装与被包装的问题，与所有副本共享；只保存弱引用，不延长副本的生命周期
+        self._forks: "weakref.WeakSet[Problem]" = weakref.WeakSet()
+
+    @classmethod
+    def from_config(cls, **config) -> "CountingProblem":
+        """ config["problem"] 为被包装的问题 """
+        return cls(config["problem"], track_states=config.get("track_states", True))
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # 弱引用集合不能序列化，传到其他进程的副本从空集合开始记录
+        state = dict(self.__dict__)
+        del state["_forks"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._forks = weakref.WeakSet()
+
+    def __getattr__(self, name: str) -> Any:
+        # 只在自身没有该属性时调用；problem 尚未设置（例如反序列化过程中）时不能再转发
+        if name == "problem":
+            raise AttributeError(name)
+        return getattr(self.problem, name)
+
+    def _touch(self, state: State) -> None:
+        if self.states is not None:
+            self.states.add(state)
+
+    def init_problem_state(self) -> None:
+        self.problem.init_problem_state()
+
+    def get_start_state(self) -> State:
+        return self.problem.get_start_state()
+
+    def get_end_state(self) -> State:
+        return self.problem.get_end_state()
+
+    def get_end_info(self) -> Any:
+        return self.problem.get_end_info()
+
+    def get_state(self) -> State:
+        self.counts["get_state"] += 1
+        state = self.problem.get_state()
+        self._touch(state)
+        return state
+
+    def is_end_state(self, cur_state: State) -> bool:
+        return self.problem.is_end_state(cur_state)
+
+    def get_legal_actions(self, state: State) -> Set[Action]:
+        self.counts["get_legal_actions"] += 1
+        self._touch(state)
+        return self.problem.get_legal_actions(state)
+
+    def apply_action(self, action: Action) -> State:
+        return self.problem.apply_action(action)
+
+    def apply_action_to_state(self, state: State, action: Action) -> State:
+        self.counts["apply_action_to_state"] += 1
+        next_state = self.problem.apply_action_to_state(state, action)
+        self._touch(state)
+        self._touch(next_state)
+        return next_state
+
+    def get_static_render_data(self) -> Dict[str, State]:
+        return self.problem.get_static_render_data()
+
+    def get_dynamic_render_data(self) -> Dict[str, State]:
+        return self.problem.get_dynamic_render_data()
+
+    def set_state(self, state: State) -> None:
+        self.counts["set_state"] += 1
+        self._touch(state)
+        self.problem.set_state(state)
+
+    def snapshot(self) -> Any:
+        return self.problem.snapshot()
+
+    def restore(self, token: Any) -> None:
+        self.problem.restore(token)
+
+    def fork(self) -> "CountingProblem":
+        """ 副本与原问题共用同一份计数，智能体在副本上的搜索同样计入 """
+        child = object.__new__(type(self))
+        child.__dict__.update(self.__dict__)
+        child.problem = self.problem.fork()
+        self._forks.add(child)
+        return child
+
+    def sample_agent(self, agent: Any) -> int:
+        """ 统计智能体当前的内存占用并更新峰值
+
+        被包装的问题、fork 出的副本以及它们引用的数据（例如问题缓存的 MazeGraph、墙壁）都不计入，
+        代价与智能体和问题的数据量之和成正比。
+        """
+        forks = list(self._forks)
+        size = deep_sizeof(
+            agent, exclude=[self, *forks], shared=[self.problem, *(fork.problem for fork in forks)]
+        )
+        self.agent_peak_bytes = max(self.agent_peak_bytes, size)
+        return size
+
+    def summary(self) -> Dict[str, int]:
+        summary = dict(self.counts)
+        if self.states is not None:
+            summary["distinct_states"] = len(self.states)
+        summary["agent_peak_bytes"] = self.agent_peak_bytes
+        return summary
@@ -0,0 +1,222 @@
+import os
+import ast
+import sys
+import json
+from typing import Dict, List, Optional, Tuple
+
+
+# 扫描这些顶层包中的源文件，寻找 XxxRegistry.register("Name") 装饰的类
+PLUGIN_PACKAGES: Tuple[str, ...] = ("agents", "problems")
+
+# 第三方包通过入口点声明插件：名称 -> "module.path:ClassName"
+ENTRY_POINT_GROUPS: Dict[str, str] = {
+    "agent": "agents_lab.agents",
+    "problem": "agents_lab.problems",
+    "renderer": "agents_lab.renderers",
+}
+
+REGISTRY_KINDS: Dict[str, str] = {
+    "AgentRegistry": "agent",
+    "ProblemRegistry": "problem",
+    "RendererRegistry": "renderer",
+}
+
+MANIFEST_VERSION = 1
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (kind, name, module_path)
+Plugin = Tuple[str, str, str]
+
+_manifest: Optional[Dict[str, Dict[str, str]]] = None
+
+
+def get_manifest_path() -> str:
+    """ 清单缓存的位置，可以通过环境变量 AGENTS_LAB_MANIFEST 覆盖 """
+    return os.environ.get(
+        "AGENTS_LAB_MANIFEST",
+        os.path.join(PROJECT_ROOT, ".cache", "plugin_manifest.json")
+    )
+
+
+def _registry_kind(node: ast.expr) -> Optional[str]:
+    """ 识别 AgentRegistry.register / core.AgentRegistry.register 形式的装饰器 """
+    if not isinstance(node, ast.Attribute) or node.attr != "register":
+        return None
+
+    owner = node.value
+    if isinstance(owner, ast.Name):
+        return REGISTRY_KINDS.get(owner.id)
+    if isinstance(owner, ast.Attribute):
+        return REGISTRY_KINDS.get(owner.attr)
+    return None
+
+
+def scan_source(source: str, module_path: str) -> List[Plugin]:
+    """ 只解析语法树，不执行模块，找出模块中注册的全部类 """
+    if "Registry.register" not in source:
+        return []
+
+    plugins: List[Plugin] = []
+    for node in ast.walk(ast.parse(source)):
+        if not isinstance(node, ast.ClassDef):
+            continue
+
+        for decorator in node.decorator_list:
+            if not isinstance(decorator, ast.Call) or not decorator.args:
+                continue
+            kind = _registry_kind(decorator.func)
+            name = decorator.args[0]
+            if kind and isinstance(name, ast.Constant) and isinstance(name.value, str):
+                plugins.append((kind, name.value, module_path))
+
+    return plugins
+
+
+def _module_path(rel_path: str) -> str:
+    parts = rel_path[:-len(".py")].split(os.sep)
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+def _iter_source_files(root: str, packages: Tuple[str, ...]) -> List[str]:
+    """ 按确定的顺序列出插件包中的全部 .py 文件（相对 root 的路径） """
+    files: List[str] = []
+    for package in packages:
+        for dir_path, dir_names, file_names in os.walk(os.path.join(root, package)):
+            dir_names[:] = sorted(name for name in dir_names if not name.startswith((".", "__pycache__")))
+            for file_name in sorted(file_names):
+                if file_name.endswith(".py"):
+                    files.append(os.path.relpath(os.path.join(dir_path, file_name), root))
+    return files
+
+
+def _scan_directories(root: str, cached_files: Dict[str, dict]) -> Tuple[Dict[str, dict], bool]:
+    """ 扫描插件目录；大小与修改时间都没变的文件直接沿用缓存结果 """
+    files: Dict[str, dict] = {}
+    changed = False
+
+    for rel_path in _iter_source_files(root, PLUGIN_PACKAGES):
+        stat = os.stat(os.path.join(root, rel_path))
+        cached = cached_files.get(rel_path)
+        if cached and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+            files[rel_path] = cached
+            continue
+
+        with open(os.path.join(root, rel_path), "r", encoding="utf-8") as file:
+            source = file.read()
+        try:
+            plugins = scan_source(source, _module_path(rel_path))
+        except SyntaxError:
+            plugins = []
+
+        files[rel_path] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "plugins": [list(plugin) for plugin in plugins]
+        }
+        changed = True
+
+    return files, changed or set(files) != set(cached_files)
+
+
+def _entry_point_key() -> List[List]:
+    """ 安装或卸载包会改变 sys.path 中目录的修改时间，以此判断入口点缓存是否失效 """
+    key = []
+    for path in sys.path:
+        if not path:
+            # 当前工作目录经常被写入，不把它计入缓存键
+            continue
+        try:
+            key.append([path, os.stat(path).st_mtime_ns])
+        except OSError:
+            continue
+    return key
+
+
+def _scan_entry_points() -> List[List[str]]:
+    from importlib.metadata import entry_points
+
+    plugins: List[List[str]] = []
+    for kind, group in ENTRY_POINT_GROUPS.items():
+        for entry_point in entry_points(group=group):
+            plugins.append([kind, entry_point.name, entry_point.value.split(":")[0]])
+    return plugins
+
+
+def _read_cache(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            cache = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return cache if cache.get("version") == MANIFEST_VERSION else {}
+
+
+def _write_cache(path: str, cache: dict) -> None:
+    """ 原子写入；只读文件系统等情况下放弃缓存，不影响使用 """
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(cache, file, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def build_manifest(use_cache: bool = True) -> Dict[str, Dict[str, str]]:
+    """ 生成 kind -> {name: module_path} 的插件清单，整个过程不导入任何插件模块 """
+    path = get_manifest_path()
+    cache = _read_cache(path) if use_cache else {}
+
+    files, files_changed = _scan_directories(PROJECT_ROOT, cache.get("files", {}))
+
+    entry_key = _entry_point_key()
+    cached_entries = cache.get("entry_points", {})
+    if cached_entries.get("key") == entry_key:
+        entry_plugins = cached_entries["plugins"]
+        entries_changed = False
+    else:
+        entry_plugins = _scan_entry_points()
+        entries_changed = True
+
+    if files_changed or entries_changed:
+        _write_cache(path, {
+            "version": MANIFEST_VERSION,
+            "files": files,
+            "entry_points": {"key": entry_key, "plugins": entry_plugins}
+        })
+
+    manifest: Dict[str, Dict[str, str]] = {kind: {} for kind in ENTRY_POINT_GROUPS}
+    for file_info in files.values():
+        for kind, name, module_path in file_info["plugins"]:
+            manifest[kind].setdefault(name, module_path)
+    for kind, name, module_path in entry_plugins:
+        manifest.setdefault(kind, {}).setdefault(name, module_path)
+
+    return manifest
+
+
+def get_manifest() -> Dict[str, Dict[str, str]]:
+    """ 进程内只构建一次清单 """
+    global _manifest
+    if _manifest is None:
+        _manifest = build_manifest()
+    return _manifest
+
+
+def reset_manifest() -> None:
+    """ 丢弃进程内的清单，下次访问时重新扫描 """
+    global _manifest
+    _manifest = None
+
+
+def get_package_plugins(package: str, *kinds: str) -> Dict[str, str]:
+    """ 清单中模块位于 package（含子包）内的插件：名称 -> 模块路径；不指定 kinds 时包括全部种类 """
+    manifest = get_manifest()
+    return {
+        name: module_path
+        for kind in (kinds or manifest) for name, module_path in manifest.get(kind, {}).items()
+        if module_path.startswith(f"{package}.")
+    }
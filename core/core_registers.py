@@ -1,13 +1,25 @@
-from typing import Dict, List
+import importlib
+from typing import Any, Dict, List
 from .core_bases import Agent, Problem, Renderer
+from .core_discovery import get_manifest
 
 
-class AgentRegistry:
-    """智能体注册器单例类"""
+class _Registry:
+    """注册器基类：保存已注册的类，并按插件清单中的模块路径延迟导入
+
+    除了已导入模块中注册的类之外，还会从插件清单（目录扫描与入口点）中得知
+    尚未导入的类，获取时只导入对应的那一个模块，列出名称时不导入任何模块。
+    """
+    _kind: str = ""
     _instance = None
-    _agents: Dict[str, "Agent"] = {}
+    _classes: Dict[str, Any] = {}
 
-    def __new__(cls) -> "AgentRegistry":
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._instance = None
+        cls._classes = {}
+
+    def __new__(cls) -> "_Registry":
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
@@ -15,75 +27,66 @@ class AgentRegistry:
     @classmethod
     def register(cls, name: str):
         """注册装饰器"""
-        def decorator(agent_class: "Agent"):
-            cls._agents[name] = agent_class
-            return agent_class
+        def decorator(registered_class: Any):
+            cls._classes[name] = registered_class
+            return registered_class
         return decorator
 
+    @classmethod
+    def _get(cls, name: str) -> Any:
+        if name not in cls._classes:
+            module_path = get_manifest().get(cls._kind, {}).get(name)
+            if module_path:
+                importlib.import_module(module_path)
+        return cls._classes.get(name)
+
+    @classmethod
+    def _list(cls) -> List[str]:
+        names = list(get_manifest().get(cls._kind, {}))
+        names.extend(cls._classes)
+        return list(dict.fromkeys(names))
+
+
+class AgentRegistry(_Registry):
+    """智能体注册器单例类"""
+    _kind = "agent"
+
     @classmethod
     def get_agent(cls, name: str) -> "Agent":
         """获取智能体类"""
-        return cls._agents.get(name)
+        return cls._get(name)
 
     @classmethod
     def list_agents(cls) -> List[str]:
         """列出所有注册的智能体"""
-        return list(cls._agents.keys())
+        return cls._list()
     
 
-class ProblemRegistry:
+class ProblemRegistry(_Registry):
     """问题注册器单例类"""
-    _instance = None
-    _problems: Dict[str, "Problem"] = {}
-
-    def __new__(cls) -> "ProblemRegistry":
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
-
-    @classmethod
-    def register(cls, name: str):
-        """注册装饰器"""
-        def decorator(problem_class: "Problem"):
-            cls._problems[name] = problem_class
-            return problem_class
-        return decorator
+    _kind = "problem"
 
     @classmethod
     def get_problem(cls, name: str) -> "Problem":
         """获取问题类"""
-        return cls._problems.get(name)
+        return cls._get(name)
 
     @classmethod
     def list_problems(cls) -> List[str]:
         """列出所有注册的问题"""
-        return list(cls._problems.keys())
+        return cls._list()
     
 
-class RendererRegistry:
+class RendererRegistry(_Registry):
     """渲染器注册器单例类"""
-    _instance = None
-    _renderers: Dict[str, "Renderer"] = {}
-
-    def __new__(cls) -> "RendererRegistry":
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
-
-    @classmethod
-    def register(cls, name: str):
-        """注册装饰器"""
-        def decorator(renderer_class: "Renderer"):
-            cls._renderers[name] = renderer_class
-            return renderer_class
-        return decorator
+    _kind = "renderer"
 
     @classmethod
     def get_renderer(cls, name: str) -> "Renderer":
         """获取渲染器类"""
-        return cls._renderers.get(name)
+        return cls._get(name)
 
     @classmethod
     def list_renderers(cls) -> List[str]:
         """列出所有注册的渲染器"""
-        return list(cls._renderers.keys())
+        return cls._list()
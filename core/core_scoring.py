@@ -0,0 +1,85 @@
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, List, Optional, Sequence, Tuple
+from .core_bases import Action, Problem, State
+
+
+# evaluate_func(problem, state, action) -> score，逐个动作打分
+EvaluateFunc = Callable[[Problem, State, Action], Any]
+# evaluate_actions(problem, state, actions) -> scores，一次为同一状态下的多个动作打分
+EvaluateActions = Callable[[Problem, State, Sequence[Action]], List[Any]]
+
+
+class ActionScorer:
+    """ 为启发式智能体统一两种打分接口，并在前面加一层按 (state, action) 缓存的 LRU
+
+    同时给出 evaluate_actions 时优先使用批量接口，只对未命中缓存的动作调用一次。
+    缓存假设分数只取决于 (state, action)，换用另一个问题实例时会自动清空。
+    """
+    def __init__(
+        self, evaluate_func: Optional[EvaluateFunc] = None,
+        evaluate_actions: Optional[EvaluateActions] = None, maxsize: int = 1 << 16
+    ) -> None:
+        self.evaluate_func = evaluate_func
+        self.evaluate_actions = evaluate_actions
+        self.maxsize = maxsize
+        self._memo: "OrderedDict[Tuple[Hashable, Hashable], Any]" = OrderedDict()
+        self._problem: Optional[Problem] = None
+
+    def clear(self) -> None:
+        self._memo.clear()
+
+    def score(self, problem: Problem, state: State, actions: Sequence[Action]) -> List[Any]:
+        """ 返回与 actions 一一对应的分数 """
+        if problem is not self._problem:
+            self._problem = problem
+            self._memo.clear()
+
+        memo = self._memo
+        scores: List[Any] = [None] * len(actions)
+        missing: List[int] = []
+        for index, action in enumerate(actions):
+            key = (state, action)
+            if key in memo:
+                memo.move_to_end(key)
+                scores[index] = memo[key]
+            else:
+                missing.append(index)
+
+        if not missing:
+            return scores
+
+        pending = [actions[index] for index in missing]
+        if self.evaluate_actions is not None:
+            computed = self.evaluate_actions(problem, state, pending)
+        elif self.evaluate_func is not None:
+            computed = [self.evaluate_func(problem, state, action) for action in pending]
+        else:
+            computed = [0] * len(pending)
+
+        for index, action, value in zip(missing, pending, computed):
+            scores[index] = value
+            memo[(state, action)] = value
+        while len(memo) > self.maxsize:
+            memo.popitem(last=False)
+
+        return scores
+
+    def sort(
+        self, problem: Problem, state: State, actions: Sequence[Action], reverse: bool = False
+    ) -> List[Action]:
+        """ 按分数排序，分数相同时保持原有顺序（与 sorted(actions, key=...) 一致） """
+        if len(actions) < 2:
+            return list(actions)
+
+        scores = self.score(problem, state, actions)
+        order = sorted(range(len(actions)), key=scores.__getitem__, reverse=reverse)
+        return [actions[index] for index in order]
+
+    @classmethod
+    def from_config(cls, **config) -> "ActionScorer":
+        """ 读取智能体配置中的 evaluate_func / evaluate_actions / score_cache_size """
+        return cls(
+            evaluate_func=config.get("evaluate_func"),
+            evaluate_actions=config.get("evaluate_actions"),
+            maxsize=config.get("score_cache_size", 1 << 16)
+        )
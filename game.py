@@ -1,17 +1,17 @@
+import time
 import random
+import asyncio
 import pygame
-import agents
-from typing import Any, List 
-from problems import evaluate_func
+import threading
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional
+from problems import get_evaluate_funcs
 from core import (
     ProblemRegistry, RendererRegistry, AgentRegistry,
     Problem, Renderer, Agent
 )
 
 
-assert(agents)
-
-
 def select(array: List[Any], prompt: str) -> Any:
     while True:
         for idx, value in enumerate(array):
@@ -37,26 +37,55 @@ def main() -> None:
     agent_str: str = select(AgentRegistry.list_agents(), "请输入智能体编号 >>> ")
 
     fps = int(input("请输入 FPS >>> ")) if "HumanAgent" not in agent_str else 50
+    threaded = (
+        "HumanAgent" not in agent_str
+        and input("是否让智能体全速运行、只按帧率渲染最新状态？(y/N) >>> ").strip().lower() == "y"
+    )
 
     SelectedProblem = ProblemRegistry.get_problem(problem_str)
     SelectedRenderer = RendererRegistry.get_renderer(renderer_str)
     SelectedAgent = AgentRegistry.get_agent(agent_str)
+    step_budget = None
+    if SelectedAgent.anytime:
+        step_budget = float(input("请输入每步的时间预算（毫秒） >>> ")) / 1000
 
     screen = pygame.display.set_mode((800, 800))
     problem: Problem = SelectedProblem.from_config()
     renderer: Renderer = SelectedRenderer(screen, problem)
-    agent = SelectedAgent.from_config(evaluate_func=evaluate_func)
+    # 启发函数取自所选问题所在的包，例如拼图问题使用 problems.puzzle 中的曼哈顿距离
+    evaluate_func, evaluate_actions = get_evaluate_funcs(SelectedProblem)
+    agent = SelectedAgent.from_config(evaluate_func=evaluate_func, evaluate_actions=evaluate_actions)
 
-    main_loop(problem, renderer, agent, fps = fps)
+    if threaded:
+        threaded_main_loop(problem, renderer, agent, fps = fps)
+    elif step_budget is not None:
+        asyncio.run(async_main_loop(problem, renderer, agent, fps = fps, step_budget = step_budget))
+    else:
+        main_loop(problem, renderer, agent, fps = fps)
 
     pygame.quit()
 
 
-def main_loop(problem: Problem, renderer: Renderer, agent: Agent, fps) -> None:
+def _apply(problem: Problem, action: Any, recorder=None) -> None:
+    """ 应用动作，recorder 不为空时记录成功的移动 """
+    before = problem.get_state()
+    problem.apply_action(action)
+    if recorder is not None and problem.get_state() != before:
+        recorder.record_move(before, problem.get_state())
+
+
+def main_loop(
+    problem: Problem, renderer: Renderer, agent: Agent, fps,
+    recorder=None, step_budget: Optional[float] = None
+) -> None:
+    """ recorder 为 TrajectoryRecorder 时，把每一次成功的移动写入轨迹文件；
+    step_budget（秒）只对 anytime 智能体生效，作为每步决策的截止时间 """
     clock = pygame.time.Clock()
     problem.init_problem_state()
     renderer.render()
     random.seed(5)
+    if recorder is not None:
+        recorder.begin_episode(problem)
 
     running = True
     while running:
@@ -69,11 +98,190 @@ def main_loop(problem: Problem, renderer: Renderer, agent: Agent, fps) -> None:
             if event.type == pygame.QUIT:
                 running = False
 
-        action = agent.select_action(problem)
-        problem.apply_action(action)
+        deadline = time.perf_counter() + step_budget if step_budget is not None else None
+        action = agent.select_action_before(problem, deadline)
+        _apply(problem, action, recorder)
         renderer.render()
         clock.tick(fps)
 
 
+async def async_main_loop(
+    problem: Problem, renderer: Renderer, agent: Agent, fps, step_budget: float, recorder=None
+) -> None:
+    """ 每步最多等待 step_budget 秒，超时则使用 agent.fallback_action，保证固定的单步延迟
+
+    超时的决策不会被取消：在它完成之前不会发起新的决策，智能体因此不会与自己并发运行。
+    如果回退动作改变了状态，迟到的结果会被丢弃；默认回退动作为原地不动，迟到的结果仍然有效。
+    """
+    clock = pygame.time.Clock()
+    problem.init_problem_state()
+    renderer.render()
+    random.seed(5)
+    if recorder is not None:
+        recorder.begin_episode(problem)
+
+    pending: Optional[asyncio.Future] = None
+    stale = False
+    running = True
+    while running:
+        if problem.is_end_state(problem.get_state()):
+            print(problem.get_end_info())
+            break
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+
+        if pending is None:
+            deadline = time.perf_counter() + step_budget
+            pending = asyncio.ensure_future(agent.select_action_async(problem, deadline))
+            stale = False
+
+        done, _ = await asyncio.wait({pending}, timeout=step_budget)
+        if pending in done and not stale:
+            action = pending.result()
+        else:
+            action = agent.fallback_action(problem)
+            stale = stale or action is not None
+        if pending in done:
+            pending = None
+
+        _apply(problem, action, recorder)
+        renderer.render()
+        clock.tick(fps)
+
+    if pending is not None:
+        await pending
+
+
+class SnapshotBoard:
+    """ 模拟线程与渲染线程之间的交换区：快照按发布顺序排队，渲染线程每帧一次取走全部 """
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._snapshots: List[Mapping[str, Any]] = []
+        self._requested = threading.Event()
+        self.done = threading.Event()
+        self.error: Optional[BaseException] = None
+
+    def request(self) -> None:
+        """ 渲染线程请求一份新快照，模拟线程会在下一步之后发布 """
+        self._requested.set()
+
+    def wants_snapshot(self) -> bool:
+        return self._requested.is_set()
+
+    def publish(self, snapshot: Mapping[str, Any]) -> None:
+        # 先清除请求再保存快照：发布过程中到达的请求会保留下来，由下一步重新发布
+        with self._lock:
+            self._requested.clear()
+            self._snapshots.append(snapshot)
+
+    def take(self) -> List[Mapping[str, Any]]:
+        """ 取走上一次之后发布的全部快照；增量快照需要按顺序全部应用 """
+        with self._lock:
+            snapshots, self._snapshots = self._snapshots, []
+            return snapshots
+
+
+def take_snapshot(problem: Problem) -> Mapping[str, Any]:
+    """ 复制动态渲染数据，使之与之后的模拟步骤无关 """
+    data: Dict[str, Any] = dict(problem.get_dynamic_render_data())
+    if "history_path" in data:
+        data["history_path"] = tuple(data["history_path"])
+    if "visible" in data:
+        data["visible"] = frozenset(data["visible"])
+    return MappingProxyType(data)
+
+
+class FullSnapshotStream:
+    """ 不支持增量渲染的问题：每次发布一份完整的快照，渲染时只用最新的一份 """
+    def __init__(self, problem: Problem) -> None:
+        self.problem = problem
+
+    def delta(self) -> Mapping[str, Any]:
+        return take_snapshot(self.problem)
+
+    def create_view(self) -> "FullSnapshotView":
+        return FullSnapshotView()
+
+
+class FullSnapshotView:
+    def __init__(self) -> None:
+        self._snapshot: Optional[Mapping[str, Any]] = None
+
+    def apply(self, snapshot: Mapping[str, Any]) -> None:
+        self._snapshot = snapshot
+
+    def data(self) -> Optional[Mapping[str, Any]]:
+        return self._snapshot
+
+
+def open_render_stream(problem: Problem) -> Any:
+    """ 问题提供 open_render_stream（如 MazeProblem）时只发布两帧之间的增量，否则每帧复制完整的渲染数据 """
+    open_stream = getattr(problem, "open_render_stream", None)
+    return open_stream() if open_stream is not None else FullSnapshotStream(problem)
+
+
+def _simulate(problem: Problem, agent: Agent, stream: Any, board: SnapshotBoard, stop: threading.Event) -> None:
+    """ 模拟线程：不受帧率限制地推进问题，只在渲染线程需要时才生成快照 """
+    try:
+        while not stop.is_set():
+            if problem.is_end_state(problem.get_state()):
+                break
+
+            problem.apply_action(agent.select_action(problem))
+            if board.wants_snapshot():
+                board.publish(stream.delta())
+
+        board.publish(stream.delta())
+    except BaseException as error:
+        board.error = error
+    finally:
+        board.done.set()
+
+
+def threaded_main_loop(problem: Problem, renderer: Renderer, agent: Agent, fps) -> None:
+    """ 智能体在单独的线程中全速运行，主线程按 fps 绘制最新快照并处理 pygame 事件
+
+    两次绘制之间的中间状态会被跳过，所以渲染开销不再拖慢模拟，智能体也不再受帧率限制。
+    """
+    clock = pygame.time.Clock()
+    problem.init_problem_state()
+    renderer.render()
+    random.seed(5)
+
+    board = SnapshotBoard()
+    stream = open_render_stream(problem)
+    view = stream.create_view()
+    stop = threading.Event()
+    simulation = threading.Thread(target=_simulate, args=(problem, agent, stream, board, stop), daemon=True)
+    simulation.start()
+
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                stop.set()
+
+        finished = board.done.is_set()
+        snapshots = board.take()
+        for snapshot in snapshots:
+            view.apply(snapshot)
+        if snapshots:
+            renderer.render(dynamic_data=view.data())
+        if finished or stop.is_set():
+            break
+
+        board.request()
+        clock.tick(fps)
+
+    stop.set()
+    simulation.join()
+    if board.error is not None:
+        raise board.error
+
+    if problem.is_end_state(problem.get_state()):
+        print(problem.get_end_info())
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,10 +1,41 @@
-from .maze import MazeProblem, MazeRenderer, coordinates, Matrix, Direction, evaluate_func
+import importlib
+from typing import Any, Callable, Optional, Tuple
+from core.core_discovery import get_package_plugins
+from . import maze, puzzle
+from .maze import MazeProblem, MultiMazeProblem, coordinates, Matrix, Direction, evaluate_func, evaluate_actions
+from .puzzle import PuzzleProblem, Move
+
+
+def get_evaluate_funcs(problem_class: Any) -> Tuple[Optional[Callable], Optional[Callable]]:
+    """ 返回问题所在包导出的 (evaluate_func, evaluate_actions)，包中没有定义时对应项为 None """
+    package = importlib.import_module(problem_class.__module__.rpartition(".")[0] or problem_class.__module__)
+    return getattr(package, "evaluate_func", None), getattr(package, "evaluate_actions", None)
+
+
+def _plugin_modules():
+    """ 插件清单中由各问题包注册的问题与渲染器：名称 -> 模块路径 """
+    return get_package_plugins(__name__, "problem", "renderer")
+
+
+def __getattr__(name: str):
+    # 渲染器依赖 pygame，按清单只在真正需要时才导入所在的模块
+    module_path = _plugin_modules().get(name)
+    if module_path is not None:
+        return getattr(importlib.import_module(module_path), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted({*globals(), *_plugin_modules()})
+
 
 __all__ = [
-    "MazeProblem",
-    "MazeRenderer",
+    "Move",
     "coordinates",
     "Matrix",
     "Direction",
-    "evaluate_func"
-]
\ No newline at end of file
+    "evaluate_func",
+    "evaluate_actions",
+    "get_evaluate_funcs",
+    *sorted(_plugin_modules())
+]
@@ -1,14 +1,37 @@
-from .utils.maze_renderer import MazeRenderer
-from .maze_problem import MazeProblem, evaluate_func
+import importlib
+from core.core_discovery import get_package_plugins
+from .maze_problem import MazeProblem, evaluate_func, evaluate_actions
+from .multi_maze_problem import MultiMazeProblem
+from .utils.maze_pool import MazePool, pool_seed
 from .utils.types import coordinates, Matrix, Direction
-from .agents import MazeHumanAgent
+
+
+def _plugin_modules():
+    """ 插件清单中由本包注册的渲染器与智能体：名称 -> 模块路径 """
+    return get_package_plugins(__name__, "renderer", "agent")
+
+
+def __getattr__(name: str):
+    # 渲染器与人类智能体依赖 pygame，按清单只在真正需要时才导入所在的模块
+    module_path = _plugin_modules().get(name)
+    if module_path is not None:
+        return getattr(importlib.import_module(module_path), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted({*globals(), *_plugin_modules()})
+
 
 __all__ = [
     "MazeProblem",
-    "MazeRenderer",
+    "MultiMazeProblem",
+    "MazePool",
+    "pool_seed",
     "coordinates",
     "Matrix",
     "Direction",
-    "MazeHumanAgent",
-    "evaluate_func"
-]
\ No newline at end of file
+    "evaluate_func",
+    "evaluate_actions",
+    *sorted(_plugin_modules())
+]
@@ -1,5 +1,22 @@
-from .human_agent import MazeHumanAgent
+import importlib
+from core.core_discovery import get_package_plugins
 
-__all__ = [
-    "MazeHumanAgent",
-]
\ No newline at end of file
+
+def _agent_modules():
+    """ 插件清单中由本包注册的智能体：名称 -> 模块路径 """
+    return get_package_plugins(__name__, "agent")
+
+
+def __getattr__(name: str):
+    # 按需导入：human_agent 依赖 pygame，只有访问到的智能体所在的模块才会被导入
+    module_path = _agent_modules().get(name)
+    if module_path is not None:
+        return getattr(importlib.import_module(module_path), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted({*globals(), *_agent_modules()})
+
+
+__all__ = sorted(_agent_modules())
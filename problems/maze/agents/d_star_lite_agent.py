@@ -0,0 +1,186 @@
+import heapq
+from typing import Dict, List, Optional, Tuple
+from core import Agent, AgentRegistry, Problem
+from ..utils.types import coordinates, Direction
+
+
+INF = float("inf")
+Key = Tuple[float, float]
+
+
+@AgentRegistry.register("MazeDStarLiteAgent")
+class MazeDStarLiteAgent(Agent):
+    """ D* Lite：从终点向当前位置反向搜索，未知区域按无墙假设规划
+
+    迷雾模式下每走一步只把新揭示格子相关的边交给 _update_vertex，再增量修复最短路，
+    重新规划的代价与变化的规模有关，而与迷宫大小无关；非迷雾模式下只在第一步规划一次。
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        self._problem: Optional[Problem] = None
+
+    @classmethod
+    def from_config(cls, **config) -> "MazeDStarLiteAgent":
+        return cls()
+
+    def _initialize(self, problem: Problem) -> None:
+        static_data = problem.get_static_render_data()
+        self.rows: int = static_data["rows"]
+        self.cols: int = static_data["cols"]
+        self._problem = problem
+        self.goal: coordinates = problem.get_end_state()
+        self.start: coordinates = problem.get_state()
+        self.last: coordinates = self.start
+        self.km = 0
+        self.g: Dict[coordinates, float] = {}
+        self.rhs: Dict[coordinates, float] = {self.goal: 0}
+        # 开放列表：堆中可能有过期的条目，以 queued 中记录的键为准
+        self.queue: List[Tuple[float, float, coordinates]] = []
+        self.queued: Dict[coordinates, Key] = {}
+        self._neighbors: Dict[coordinates, Tuple[coordinates, ...]] = {}
+        self._edge_cache: Dict[coordinates, Tuple[coordinates, ...]] = {}
+        _, self._reveal_index = self._get_revealed(problem, 0)
+
+        self._push(self.goal, self._calculate_key(self.goal))
+        self._compute_shortest_path()
+
+    @staticmethod
+    def _get_revealed(problem: Problem, index: int) -> Tuple[List[coordinates], int]:
+        get_revealed_since = getattr(problem, "get_revealed_since", None)
+        if get_revealed_since is None:
+            return [], index
+        return get_revealed_since(index)
+
+    def _heuristic(self, a: coordinates, b: coordinates) -> int:
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+    def _calculate_key(self, state: coordinates) -> Key:
+        value = min(self.g.get(state, INF), self.rhs.get(state, INF))
+        return (value + self._heuristic(self.start, state) + self.km, value)
+
+    def _push(self, state: coordinates, key: Key) -> None:
+        self.queued[state] = key
+        heapq.heappush(self.queue, (key[0], key[1], state))
+
+    def _top_key(self) -> Key:
+        """ 丢弃堆顶过期的条目后返回最小键 """
+        queue = self.queue
+        while queue:
+            k1, k2, state = queue[0]
+            if self.queued.get(state) == (k1, k2):
+                return (k1, k2)
+            heapq.heappop(queue)
+        return (INF, INF)
+
+    def _open_neighbors(self, state: coordinates) -> Tuple[coordinates, ...]:
+        """ 按问题当前给出的信息（迷雾中未知的墙视为不存在）可以走到的相邻格子 """
+        neighbors = self._neighbors.get(state)
+        if neighbors is None:
+            neighbors = tuple(
+                (state[0] + action.value[0], state[1] + action.value[1])
+                for action in self._problem.get_legal_actions(state)
+            )
+            self._neighbors[state] = neighbors
+        return neighbors
+
+    def _edges(self, state: coordinates) -> Tuple[coordinates, ...]:
+        """ 两侧都没有已知墙壁的相邻格子，边的代价均为 1 """
+        edges = self._edge_cache.get(state)
+        if edges is None:
+            edges = tuple(
+                neighbor for neighbor in self._open_neighbors(state)
+                if state in self._open_neighbors(neighbor)
+            )
+            self._edge_cache[state] = edges
+        return edges
+
+    def _update_queue(self, state: coordinates) -> None:
+        if self.g.get(state, INF) != self.rhs.get(state, INF):
+            self._push(state, self._calculate_key(state))
+        else:
+            self.queued.pop(state, None)
+
+    def _update_vertex(self, state: coordinates) -> None:
+        if state != self.goal:
+            g = self.g
+            self.rhs[state] = min((g.get(neighbor, INF) + 1 for neighbor in self._edges(state)), default=INF)
+        self._update_queue(state)
+
+    def _compute_shortest_path(self) -> None:
+        g, rhs = self.g, self.rhs
+        while (
+            self._top_key() < self._calculate_key(self.start)
+            or rhs.get(self.start, INF) != g.get(self.start, INF)
+        ):
+            old_key = self._top_key()
+            if old_key == (INF, INF):
+                break
+
+            _, _, state = heapq.heappop(self.queue)
+            new_key = self._calculate_key(state)
+            if old_key < new_key:
+                self._push(state, new_key)
+            elif g.get(state, INF) > rhs.get(state, INF):
+                # 过一致：g 降低只会让邻居的 rhs 变小，不需要重新对所有邻居取最小值
+                g[state] = rhs[state]
+                del self.queued[state]
+                value = g[state] + 1
+                for neighbor in self._edges(state):
+                    if neighbor != self.goal and value < rhs.get(neighbor, INF):
+                        rhs[neighbor] = value
+                        self._update_queue(neighbor)
+            else:
+                # 欠一致：只有 rhs 来自 state 的邻居需要重新计算
+                old_value = g[state] + 1
+                g[state] = INF
+                self._update_vertex(state)
+                for neighbor in self._edges(state):
+                    if rhs.get(neighbor, INF) == old_value:
+                        self._update_vertex(neighbor)
+
+    def _apply_revealed(self, cells: List[coordinates]) -> None:
+        """ 新揭示格子的墙壁可能截断原有的边：清掉它们的邻接缓存，更新两端的顶点 """
+        self.km += self._heuristic(self.last, self.start)
+        self.last = self.start
+
+        affected = set()
+        for cell in cells:
+            # 揭示之前按无墙假设与所有相邻格子相连，这些边都可能被截断
+            self._neighbors.pop(cell, None)
+            affected.add(cell)
+            for dx, dy in Direction._members.values():
+                neighbor = (cell[0] + dx, cell[1] + dy)
+                if 0 <= neighbor[0] < self.rows and 0 <= neighbor[1] < self.cols:
+                    affected.add(neighbor)
+
+        for state in affected:
+            self._edge_cache.pop(state, None)
+        for state in affected:
+            self._update_vertex(state)
+        self._compute_shortest_path()
+
+    def select_action(self, problem: Problem) -> Optional[Direction]:
+        """ 基于当前问题状态选择动作 """
+        if problem is not self._problem or problem.get_end_state() != self.goal:
+            self._initialize(problem)
+
+        self.start = problem.get_state()
+        if self.start == self.goal:
+            return None
+
+        cells, self._reveal_index = self._get_revealed(problem, self._reveal_index)
+        if cells:
+            self._apply_revealed(cells)
+
+        if self.g.get(self.start, INF) == INF:
+            return None
+
+        best_action, best_cost = None, INF
+        for action in Direction.iter():
+            neighbor = (self.start[0] + action.value[0], self.start[1] + action.value[1])
+            if neighbor in self._edges(self.start):
+                cost = self.g.get(neighbor, INF) + 1
+                if cost < best_cost:
+                    best_action, best_cost = action, cost
+
+        return best_action
@@ -0,0 +1,313 @@
+import heapq
+from array import array
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+from core import Agent, AgentRegistry, Problem
+from ..utils.block_tree import BlockTree, build_block_tree, TREE_LEAF_CELLS
+from ..utils.codec import walls_to_masks, WALL_BITS
+from ..utils.maze_analyzer import _mask_offsets
+from ..utils.types import coordinates, Direction
+
+
+class HierarchicalPlanner:
+    """ 在分块树上做 HPA* 式的分层搜索
+
+    最上层是块图：先按块中心的距离找出一条块序列，连同周围 corridor 圈的块作为走廊；
+    中间层是走廊内传送门组成的抽象图：块间的边代价为 1，块内的边在第一次展开某个传送门时，
+    只在它所在的叶子块里做一次 BFS 得到，并缓存下来供之后的查询复用；
+    最后只在抽象路径经过的块里做 BFS 还原出逐格的路径。因此一次查询只接触走廊里的格子。
+    corridor 为 None 时不限制走廊，块间的每一处通路都是传送门、块内距离是精确的，得到的是最短路；
+    限制走廊时得到的是走廊内的最短路。
+    """
+    def __init__(self, masks: bytes, tree: BlockTree, corridor: Optional[int] = 1) -> None:
+        self.masks = masks
+        self.corridor = corridor
+        self.tree = tree
+        self.cols = tree.cols
+        # 传送门格子 -> [(同一块内可达的传送门, 距离)]
+        self._intra: Dict[int, List[Tuple[int, int]]] = {}
+        # 叶子块编号 -> 补齐块边界墙壁后的局部掩码
+        self._local: Dict[int, bytearray] = {}
+        self._offsets: Dict[int, List[Tuple[int, ...]]] = {}
+        self.stats: Dict[str, int] = {}
+        self._searched: Set[int] = set()
+
+    def _local_masks(self, block: int) -> bytearray:
+        """ 复制叶子块的掩码并把块边界视为墙，BFS 就不会离开这个块 """
+        local = self._local.get(block)
+        if local is None:
+            row0, col0, rows, cols = self.tree.leaves[block]
+            local = bytearray(rows * cols)
+            for row in range(rows):
+                start = (row0 + row) * self.cols + col0
+                local[row * cols:(row + 1) * cols] = self.masks[start:start + cols]
+            for col in range(cols):
+                local[col] |= WALL_BITS["UP"]
+                local[(rows - 1) * cols + col] |= WALL_BITS["DOWN"]
+            for row in range(rows):
+                local[row * cols] |= WALL_BITS["LEFT"]
+                local[row * cols + cols - 1] |= WALL_BITS["RIGHT"]
+            self._local[block] = local
+        return local
+
+    def _block_bfs(
+        self, block: int, source: int, target: Optional[int] = None
+    ) -> Tuple[Dict[int, int], Optional[List[int]]]:
+        """ 在叶子块内从 source 出发 BFS
+
+        返回块内各个传送门（以及 target）的距离；给出 target 时在到达后停止，并返回到 target 的逐格路径。
+        """
+        row0, col0, rows, cols = self.tree.leaves[block]
+        local = self._local_masks(block)
+        moves = self._offsets.get(cols)
+        if moves is None:
+            moves = self._offsets[cols] = _mask_offsets(cols)
+
+        def to_local(cell: int) -> int:
+            row, col = divmod(cell, self.cols)
+            return (row - row0) * cols + col - col0
+
+        def to_global(index: int) -> int:
+            row, col = divmod(index, cols)
+            return (row + row0) * self.cols + col + col0
+
+        begin = to_local(source)
+        goal = to_local(target) if target is not None else -1
+        parent = array("i", [-1]) * len(local)
+        parent[begin] = begin
+        distance = array("i", [0]) * len(local)
+        queue = array("i", [begin])
+        append = queue.append
+        for index in queue:
+            if index == goal:
+                break
+            depth = distance[index] + 1
+            for offset in moves[local[index]]:
+                neighbor = index + offset
+                if parent[neighbor] < 0:
+                    parent[neighbor] = index
+                    distance[neighbor] = depth
+                    append(neighbor)
+        self.stats["cells_visited"] += len(queue)
+        if block not in self._searched:
+            self._searched.add(block)
+            self.stats["touched_cells"] += rows * cols
+
+        reached: Dict[int, int] = {}
+        for cell in self.tree.block_portals[block]:
+            index = to_local(cell)
+            if parent[index] >= 0:
+                reached[cell] = distance[index]
+
+        path = None
+        if target is not None and parent[goal] >= 0:
+            reached[target] = distance[goal]
+            path = [goal]
+            while path[-1] != begin:
+                path.append(parent[path[-1]])
+            path = [to_global(index) for index in reversed(path)]
+        return reached, path
+
+    def _intra_edges(self, cell: int, block: int) -> List[Tuple[int, int]]:
+        edges = self._intra.get(cell)
+        if edges is None:
+            reached, _ = self._block_bfs(block, cell)
+            edges = self._intra[cell] = [(other, dist) for other, dist in reached.items() if other != cell]
+        return edges
+
+    def _block_corridor(self, source_block: int, target_block: int) -> Optional[Set[int]]:
+        """ 在块图上用 A* 找一条块序列（代价为块中心的曼哈顿距离），再向外扩展 corridor 圈 """
+        tree = self.tree
+
+        def distance(first: int, second: int) -> float:
+            (row_a, col_a), (row_b, col_b) = tree.center(first), tree.center(second)
+            return abs(row_a - row_b) + abs(col_a - col_b)
+
+        g: Dict[int, float] = {source_block: 0}
+        came_from: Dict[int, int] = {}
+        queue: List[Tuple[float, float, int]] = [(distance(source_block, target_block), 0, source_block)]
+        while queue:
+            _, cost, block = heapq.heappop(queue)
+            if block == target_block:
+                break
+            if cost > g[block]:
+                continue
+            for neighbor in tree.links[block]:
+                new_cost = cost + distance(block, neighbor)
+                if new_cost < g.get(neighbor, new_cost + 1):
+                    g[neighbor] = new_cost
+                    came_from[neighbor] = block
+                    heapq.heappush(queue, (new_cost + distance(neighbor, target_block), new_cost, neighbor))
+        else:
+            return None
+
+        corridor = {target_block}
+        block = target_block
+        while block != source_block:
+            block = came_from[block]
+            corridor.add(block)
+        for _ in range(self.corridor):
+            corridor.update([neighbor for block in corridor for neighbor in tree.links[block]])
+        return corridor
+
+    def find_path(self, begin: coordinates, end: coordinates) -> Optional[List[int]]:
+        """ 返回从 begin 到 end 的逐格路径（行优先下标，含两端），不可达时返回 None """
+        tree, cols = self.tree, self.cols
+        # expanded: 展开的抽象节点数；cells_visited: 各次块内 BFS 弹出的格子总数；
+        # touched_cells: 本次查询中做过 BFS 的块的格子总数
+        self.stats = {"expanded": 0, "cells_visited": 0, "refined_blocks": 0, "touched_cells": 0}
+        self._searched = set()
+        source, target = begin[0] * cols + begin[1], end[0] * cols + end[1]
+        if source == target:
+            return [source]
+
+        source_block, target_block = tree.block_of(*begin), tree.block_of(*end)
+        waypoints = None
+        if self.corridor is not None:
+            allowed = self._block_corridor(source_block, target_block)
+            if allowed is None:
+                return None
+            waypoints = self._search(source, target, source_block, target_block, end, allowed)
+        if waypoints is None:
+            # 走廊内不连通（或未限制走廊）时在整个抽象图上搜索
+            waypoints = self._search(source, target, source_block, target_block, end, None)
+        if waypoints is None:
+            return None
+        return self._refine(waypoints, {source: source_block, target: target_block})
+
+    def _search(
+        self, source: int, target: int, source_block: int, target_block: int,
+        end: coordinates, allowed: Optional[Set[int]]
+    ) -> Optional[List[int]]:
+        """ 在传送门组成的抽象图上做 A*，allowed 不为 None 时只经过其中的块；返回经过的传送门序列 """
+        tree, cols = self.tree, self.cols
+        portal_blocks = tree.portal_blocks
+        # 终点所在块内的传送门到终点的距离：在终点处做一次块内 BFS
+        to_target, _ = self._block_bfs(target_block, target)
+        from_source, _ = self._block_bfs(source_block, source, target if source_block == target_block else None)
+
+        def heuristic(cell: int) -> int:
+            row, col = divmod(cell, cols)
+            return abs(row - end[0]) + abs(col - end[1])
+
+        g: Dict[int, int] = {source: 0}
+        came_from: Dict[int, int] = {}
+        queue: List[Tuple[int, int, int]] = [(heuristic(source), 0, source)]
+        closed = set()
+        while queue:
+            _, cost, cell = heapq.heappop(queue)
+            if cell == target:
+                break
+            if cell in closed:
+                continue
+            closed.add(cell)
+            self.stats["expanded"] += 1
+
+            if cell == source:
+                edges = list(from_source.items())
+            else:
+                edges = list(self._intra_edges(cell, portal_blocks[cell]))
+                if cell in to_target:
+                    edges.append((target, to_target[cell]))
+            for partner in tree.partners_of(cell):
+                if allowed is None or portal_blocks[partner] in allowed:
+                    edges.append((partner, 1))
+
+            for neighbor, weight in edges:
+                new_cost = cost + weight
+                if neighbor != cell and new_cost < g.get(neighbor, new_cost + 1):
+                    g[neighbor] = new_cost
+                    came_from[neighbor] = cell
+                    heapq.heappush(queue, (new_cost + heuristic(neighbor), new_cost, neighbor))
+        else:
+            return None
+
+        waypoints = [target]
+        while waypoints[-1] != source:
+            waypoints.append(came_from[waypoints[-1]])
+        waypoints.reverse()
+        return waypoints
+
+    def _refine(self, waypoints: List[int], endpoints: Dict[int, int]) -> List[int]:
+        """ 只在抽象路径经过的块里还原逐格路径 """
+        portal_blocks = self.tree.portal_blocks
+
+        def block_of(cell: int) -> int:
+            return endpoints[cell] if cell in endpoints else portal_blocks[cell]
+
+        path = [waypoints[0]]
+        for first, second in zip(waypoints, waypoints[1:]):
+            block = block_of(first)
+            if block != block_of(second):
+                # 穿过传送门，两格相邻
+                path.append(second)
+                continue
+            _, segment = self._block_bfs(block, first, second)
+            self.stats["refined_blocks"] += 1
+            path.extend(segment[1:])
+        return path
+
+
+@AgentRegistry.register("MazeHPAStarAgent")
+class MazeHPAStarAgent(Agent):
+    """ 基于分块树的分层寻路：先在传送门组成的抽象图上搜索，再只细化路径经过的块
+
+    需要完整的地图，第一步规划出整条路径后逐步执行；位置与计划不一致时（例如被 set_state 移动）重新规划。
+    """
+    def __init__(self, leaf_cells: int = TREE_LEAF_CELLS, corridor: Optional[int] = 1) -> None:
+        super().__init__()
+        self.leaf_cells = leaf_cells
+        self.corridor = corridor
+        self._problem: Optional[Problem] = None
+        self._planner: Optional[HierarchicalPlanner] = None
+        self._plan: Deque[Direction] = deque()
+        self._expected: Optional[coordinates] = None
+
+    @classmethod
+    def from_config(cls, **config) -> "MazeHPAStarAgent":
+        return cls(
+            leaf_cells=config.get("leaf_cells", TREE_LEAF_CELLS),
+            corridor=config.get("corridor", 1)
+        )
+
+    def _initialize(self, problem: Problem) -> None:
+        if getattr(problem, "fog", False):
+            raise ValueError("MazeHPAStarAgent 需要完整的地图，不支持迷雾模式")
+
+        static_data = problem.get_static_render_data()
+        rows, cols = static_data["rows"], static_data["cols"]
+        masks = walls_to_masks(static_data["walls"])
+        tree = build_block_tree(masks, rows, cols, leaf_cells=self.leaf_cells)
+        self._planner = HierarchicalPlanner(masks, tree, self.corridor)
+        self._problem = problem
+        self._plan.clear()
+        self._expected = None
+
+    def _replan(self, state: coordinates, goal: coordinates) -> None:
+        self._plan.clear()
+        path = self._planner.find_path(state, goal)
+        if path is None:
+            return
+
+        # 用行列差而不是行优先下标的差确定方向：cols 为 1 时向下与向右的下标差相同
+        cols = self._planner.cols
+        for first, second in zip(path, path[1:]):
+            (row, col), (next_row, next_col) = divmod(first, cols), divmod(second, cols)
+            self._plan.append(Direction.from_tuple((next_row - row, next_col - col)))
+
+    def select_action(self, problem: Problem) -> Optional[Direction]:
+        """ 基于当前问题状态选择动作 """
+        if problem is not self._problem:
+            self._initialize(problem)
+
+        state = problem.get_state()
+        if problem.is_end_state(state):
+            return None
+        if state != self._expected or not self._plan:
+            self._replan(state, problem.get_end_state())
+        if not self._plan:
+            return None
+
+        action = self._plan.popleft()
+        self._expected = (state[0] + action.value[0], state[1] + action.value[1])
+        return action
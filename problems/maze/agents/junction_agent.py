@@ -0,0 +1,64 @@
+from collections import deque
+from typing import Deque, Optional
+from core import Agent, AgentRegistry, Problem
+from ..utils.codec import walls_to_masks
+from ..utils.maze_graph import MazeGraph, build_maze_graph
+from ..utils.types import coordinates, Direction
+
+
+@AgentRegistry.register("MazeJunctionAgent")
+class MazeJunctionAgent(Agent):
+    """ 在死路填充、通道收缩后的图上搜索，代价只与岔路数量有关
+
+    第一步把当前位置作为保留格子构建收缩图并规划整条路径，之后逐步执行；
+    位置与计划不一致时（例如被 set_state 移动）以新位置重新构建并规划。
+    收缩图基于真实的墙壁，因此不支持迷雾模式。
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        self._problem: Optional[Problem] = None
+        self._plan: Deque[Direction] = deque()
+        self._expected: Optional[coordinates] = None
+
+    @classmethod
+    def from_config(cls, **config) -> "MazeJunctionAgent":
+        return cls()
+
+    @staticmethod
+    def _get_graph(problem: Problem, state: coordinates) -> MazeGraph:
+        if getattr(problem, "fog", False):
+            raise ValueError("MazeJunctionAgent 需要完整的地图，不支持迷雾模式")
+
+        get_maze_graph = getattr(problem, "get_maze_graph", None)
+        if get_maze_graph is not None:
+            return get_maze_graph(state)
+
+        static_data = problem.get_static_render_data()
+        return build_maze_graph(
+            walls_to_masks(static_data["walls"]), static_data["rows"], static_data["cols"],
+            (state, problem.get_end_state())
+        )
+
+    def _replan(self, problem: Problem, state: coordinates) -> None:
+        self._plan.clear()
+        path = self._get_graph(problem, state).shortest_path(state, problem.get_end_state())
+        if path is not None:
+            self._plan.extend(path)
+
+    def select_action(self, problem: Problem) -> Optional[Direction]:
+        """ 基于当前问题状态选择动作 """
+        if problem is not self._problem:
+            self._problem = problem
+            self._expected = None
+
+        state = problem.get_state()
+        if problem.is_end_state(state):
+            return None
+        if state != self._expected or not self._plan:
+            self._replan(problem, state)
+        if not self._plan:
+            return None
+
+        action = self._plan.popleft()
+        self._expected = (state[0] + action.value[0], state[1] + action.value[1])
+        return action
@@ -0,0 +1,117 @@
+import atexit
+import multiprocessing
+from multiprocessing.connection import Connection
+from typing import Any, Dict, Optional
+from core import Agent, AgentRegistry, Problem
+from ..utils.shared_maze import MazeDescriptor, SharedMazeView, get_shared_maze
+from ..utils.types import Direction
+
+
+def _agent_worker(conn: Connection, descriptor: MazeDescriptor, agent_name: str, agent_config: Dict[str, Any]) -> None:
+    """ 子进程：收到当前状态后让智能体决策，回传 (方向码, 决策后的状态) """
+    view = SharedMazeView(descriptor)
+    agent = AgentRegistry.get_agent(agent_name).from_config(**agent_config)
+
+    try:
+        while True:
+            state = conn.recv()
+            if state is None:
+                break
+
+            view.set_state(state)
+            action = agent.select_action(view)
+            # 有的智能体会在决策时通过 set_state 直接移动问题（如 NormalDFSAgent），因此一并回传状态
+            conn.send((action.code() if action is not None else -1, view.get_state()))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        view.close()
+        conn.close()
+
+
+@AgentRegistry.register("MazeRemoteAgent")
+class MazeRemoteAgent(Agent):
+    """ 在独立进程中运行任意已注册的智能体
+
+    迷宫墙壁只通过共享内存传递一次（同一问题的多个远程智能体共用一份），管道中只传输当前状态与方向码。
+    非阻塞模式下，智能体尚未给出决策时 select_action 返回 None，主循环可以继续渲染和处理事件。
+    换成另一个问题时关闭原来的子进程，用新问题的迷宫重新启动。
+    """
+    def __init__(
+        self, agent_name: str = "DFSAgentOptimized2",
+        agent_config: Optional[Dict[str, Any]] = None, blocking: bool = False
+    ) -> None:
+        super().__init__()
+        self.agent_name = agent_name
+        self.agent_config = agent_config or {}
+        self.blocking = blocking
+
+        self._problem: Optional[Problem] = None
+        self._process: Optional[multiprocessing.Process] = None
+        self._conn: Optional[Connection] = None
+        self._pending = False
+
+    @classmethod
+    def from_config(cls, **config) -> "MazeRemoteAgent":
+        """ remote_agent 为子进程中运行的智能体名称，其余配置原样传给该智能体（需要可以 pickle） """
+        agent_config = {
+            key: value for key, value in config.items() if key not in ("remote_agent", "blocking")
+        }
+        return cls(
+            agent_name=config.get("remote_agent", "DFSAgentOptimized2"),
+            agent_config=agent_config,
+            blocking=config.get("blocking", False)
+        )
+
+    def _start(self, problem: Problem) -> None:
+        # spawn 出的子进程不会继承父进程中已经初始化的 pygame
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe()
+        self._process = context.Process(
+            target=_agent_worker,
+            args=(child_conn, get_shared_maze(problem).descriptor(), self.agent_name, self.agent_config),
+            daemon=True
+        )
+        self._process.start()
+        child_conn.close()
+        self._problem = problem
+        atexit.register(self.close)
+
+    def select_action(self, problem: Problem) -> Optional[Direction]:
+        """ 基于当前问题状态选择动作 """
+        if problem is not self._problem or self._process is None:
+            # 子进程中的智能体与共享内存中的墙壁都属于上一个问题
+            self.close()
+            self._start(problem)
+
+        if not self._pending:
+            self._conn.send(problem.get_state())
+            self._pending = True
+
+        if not self.blocking and not self._conn.poll():
+            return None
+
+        code, state = self._conn.recv()
+        self._pending = False
+        if state != problem.get_state():
+            problem.set_state(state)
+
+        return Direction.from_code(code) if code >= 0 else None
+
+    def close(self) -> None:
+        """ 通知子进程退出并等待其结束 """
+        if self._process is None:
+            return
+
+        try:
+            self._conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self._process.join(timeout=1)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._conn.close()
+        self._process = None
+        self._problem = None
+        self._pending = False
+        atexit.unregister(self.close)
@@ -0,0 +1,56 @@
+from typing import Any, Dict, List, Optional, Tuple
+from core import Agent, AgentRegistry, Problem
+from ..multi_maze_problem import MazeAgentView
+from ..utils.types import coordinates, Direction
+
+
+@AgentRegistry.register("MazeSwarmAgent")
+class MazeSwarmAgent(Agent):
+    """ 为 MultiMazeProblem 中的每个智能体各创建一个已注册的单智能体，每一拍返回所有智能体的动作
+
+    各个智能体通过 MazeAgentView 只看到自己的位置，被其他智能体占用的相邻格子视为墙壁。
+    同一拍中两个智能体仍可能选中同一个空格子，或者退回一个已被占用的格子；这样被挡住的动作会在之后的拍中
+    原样重新提交，直到真正生效后才再次询问该智能体。因此依赖“动作一定成功”的智能体（如 DFS 系列）
+    记录的路径始终与实际位置一致，拥挤时只会原地等待。
+    """
+    def __init__(self, agent_name: str = "RandomAgent", agent_config: Optional[Dict[str, Any]] = None) -> None:
+        super().__init__()
+        self.agent_name = agent_name
+        self.agent_config = agent_config or {}
+        self._problem: Optional[Problem] = None
+        self.views: List[MazeAgentView] = []
+        self.agents: List[Agent] = []
+        # 每个智能体尚未生效的 (动作, 动作生效后应到达的位置)
+        self.pending: List[Optional[Tuple[Direction, coordinates]]] = []
+
+    @classmethod
+    def from_config(cls, **config) -> "MazeSwarmAgent":
+        """ swarm_agent 为每个智能体使用的智能体名称，其余配置原样传给它 """
+        agent_config = {key: value for key, value in config.items() if key != "swarm_agent"}
+        return cls(agent_name=config.get("swarm_agent", "RandomAgent"), agent_config=agent_config)
+
+    def _start(self, problem: Problem) -> None:
+        agent_class = AgentRegistry.get_agent(self.agent_name)
+        self._problem = problem
+        self.views = [problem.agent_view(index) for index in range(problem.num_agents)]
+        self.agents = [agent_class.from_config(**self.agent_config) for _ in self.views]
+        self.pending = [None] * len(self.views)
+
+    def select_action(self, problem: Problem) -> List[Optional[Direction]]:
+        """ 基于当前问题状态选择所有智能体的动作 """
+        if problem is not self._problem:
+            self._start(problem)
+
+        actions: List[Optional[Direction]] = []
+        for index, (agent, view) in enumerate(zip(self.agents, self.views)):
+            pending = self.pending[index]
+            if pending is not None and view.get_state() != pending[1]:
+                actions.append(pending[0])
+                continue
+
+            action = agent.select_action(view)
+            state = view.get_state()
+            target = view.apply_action_to_state(state, action) if action is not None else state
+            self.pending[index] = (action, target) if target != state else None
+            actions.append(action)
+        return actions
@@ -1,26 +1,74 @@
-
+import copy
+import random
 from math import sqrt
+from array import array
+from collections import OrderedDict
 from core.core_bases import Problem
 from core.core_registers import ProblemRegistry
-from .utils.generate_walls import generate_walls
+from .utils.generate_walls import generate_walls, generate_walls_parallel
+from .utils.codec import walls_to_masks
+from .utils.history import CellBitmap, PathHistory
+from .utils.maze_graph import MazeGraph, build_maze_graph
+from .utils.render_stream import MazeRenderStream, MazeRenderView
+from .utils.visibility import SightTable, build_sight_table
 from .utils.types import coordinates, Direction, Matrix
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+
+# get_maze_graph 最多缓存的收缩图个数；保留集合每次都不同（例如包含当前位置）时淘汰最久未用的
+MAZE_GRAPH_CACHE_SIZE = 4
+
+
+def make_walls(
+    rows: int, cols: int, break_rate: float, max_size: int,
+    seed: Optional[int] = None, workers: int = 1
+) -> Matrix[Set[Direction]]:
+    """ 指定 seed 或多个 workers 时使用分块并行生成，结果只取决于 seed """
+    if seed is not None or workers > 1:
+        seed = seed if seed is not None else random.getrandbits(64)
+        return generate_walls_parallel(rows, cols, break_rate, max_size, seed=seed, workers=workers)
+    return generate_walls(rows, cols, break_rate, max_size)
+
 
 @ProblemRegistry.register("MazeProblem")
 class MazeProblem(Problem):
     def __init__(
         self, rows: int = 36, cols: int = 36, break_rate: float = 0.05, max_size: int = 40, 
         radius_history: int = 1, radius_cur: int = 2,
-        begin: Optional[coordinates] = None, end: Optional[coordinates] = None
+        begin: Optional[coordinates] = None, end: Optional[coordinates] = None,
+        seed: Optional[int] = None, workers: int = 1, fog: bool = False,
+        history_cap: Optional[int] = None, walls: Optional[Matrix[Set[Direction]]] = None,
+        line_of_sight: bool = False
     ) -> None:
-        # generate walls 保证最外围一定是墙壁，并且迷宫一定是连通的
-        self.walls: Matrix[Set[Direction]] = generate_walls(rows, cols, break_rate, max_size)
+        # generate walls 保证最外围一定是墙壁，并且迷宫一定是连通的；给出 walls（例如来自 MazePool）时直接使用，
+        # 此时 rows / cols 以 walls 为准，生成相关的参数被忽略
+        if walls is None:
+            walls = make_walls(rows, cols, break_rate, max_size, seed, workers)
+        else:
+            rows, cols = len(walls), len(walls[0])
+        self.walls: Matrix[Set[Direction]] = walls
         self.begin: coordinates = begin or (0, 0)
         self.end: coordinates = end or (rows - 1, cols - 1)
         self.radius_history: int = radius_history
         self.radius_cur: int = radius_cur
+        # 迷雾模式下只有看到过的格子才能查询到真实的墙壁
+        self.fog: bool = fog
+        # 视野是否被墙壁遮挡：为 False 时视野是不考虑墙壁的正方形窗口
+        self.line_of_sight: bool = line_of_sight
         self.count: int = 0
-        self.history_path: List[coordinates] = [self.begin]
+        # 历史路径最多保留的步数，None 表示不限制
+        self.history_cap: Optional[int] = history_cap
+        # 与 fork 出的副本共享、写入前需要先复制的字段
+        self._shared_fields: Set[str] = set()
+        # 死路填充与通道收缩的结果只取决于墙壁，按保留的格子做 LRU 缓存
+        self._maze_graphs: "OrderedDict[Tuple[coordinates, ...], MazeGraph]" = OrderedDict()
+        # 每格一个字节的墙壁掩码与各半径的视野表，都在第一次使用时才构建
+        self._wall_masks: Optional[bytearray] = None
+        self._sight_tables: Dict[int, SightTable] = {}
+        # restore 回退后加一，渲染增量据此整体重发；get_dynamic_render_data 使用的增量流在第一次渲染时才创建
+        self._render_epoch = 0
+        self._render_stream: Optional[MazeRenderStream] = None
+        self._render_view: Optional[MazeRenderView] = None
         self.init_problem_state()
 
     @classmethod
@@ -34,16 +82,34 @@ class MazeProblem(Problem):
             radius_history=config.get("radius_history", 1),
             radius_cur=config.get("radius_cur", 2),
             begin=config.get("begin"),
-            end=config.get("end")
+            end=config.get("end"),
+            seed=config.get("seed"),
+            workers=config.get("workers", 1),
+            fog=config.get("fog", False),
+            history_cap=config.get("history_cap"),
+            walls=config.get("walls"),
+            line_of_sight=config.get("line_of_sight", False)
         )
 
     def init_problem_state(self) -> None:
         """  初始化问题状态 """
         self.location = self.begin
         self.goal = self.end
-        self.visible = {self.location, self.begin, self.end}
-        self.history_path = [self.begin]
+        rows, cols = len(self.walls), len(self.walls[0])
+        # 走过的格子，每格 1 bit
+        self.visible = CellBitmap(rows, cols)
+        for cell in (self.location, self.begin, self.end):
+            self.visible.add(cell)
+        # 按加入顺序记录 visible 中新增格子的下标，restore 时据此撤销
+        self._visible_log = array("i")
+        self.history_path = PathHistory(self.begin, self.history_cap)
         self.count = 0
+        # 迷雾模式下看到过墙壁的格子，_revealed_log 按揭示顺序记录，供智能体增量获取
+        self.revealed = CellBitmap(rows, cols)
+        self._revealed_log = array("i")
+        self._shared_fields = set()
+        if self.fog:
+            self._reveal(self.location)
 
     def get_start_state(self) -> coordinates:
         """  返回问题的初始状态 """
@@ -63,6 +129,17 @@ class MazeProblem(Problem):
         return self.count
     
     def get_legal_actions(self, state: coordinates) -> Set[Direction]:
+        if self.fog and state not in self.revealed:
+            # 没有看到过的格子按无墙处理，只排除迷宫边界
+            rows, cols = len(self.walls), len(self.walls[0])
+            return {
+                direction for direction in Direction.iter()
+                if 0 <= state[0] + direction.value[0] < rows and 0 <= state[1] + direction.value[1] < cols
+            }
+        return self._get_legal_actions(state)
+
+    def _get_legal_actions(self, state: coordinates) -> Set[Direction]:
+        """ 不受迷雾影响的真实合法动作 """
         reachable = set()
         for direction in Direction.iter():
             if direction in self.walls[state[0]][state[1]]:
@@ -73,17 +150,46 @@ class MazeProblem(Problem):
     
     def apply_action(self, action: Direction) -> coordinates:
         """ 应用决策并返回新的状态 """
-        if action not in self.get_legal_actions(self.location):
+        if action not in self._get_legal_actions(self.location):
             return self.location
         
         dx, dy = action.delta()
-        new_location = (self.location[0] + dx, self.location[1] + dy)
+        old_location = self.location
+        new_location = (old_location[0] + dx, old_location[1] + dy)
         self.location = new_location
         self.count += 1
-        self.history_path.append(new_location)
-        self.visible.add(new_location)
+        if self._shared_fields:
+            self._own("history_path", "visible", "_visible_log")
+        self.history_path.append(old_location, new_location)
+        index = new_location[0] * self.visible.cols + new_location[1]
+        if self.visible.add_index(index):
+            self._visible_log.append(index)
+        if self.fog:
+            self._reveal(new_location)
         
         return new_location
+
+    def _reveal(self, location: coordinates) -> None:
+        """ 揭示当前位置视野内的格子，代价只与视野半径有关 """
+        if self._shared_fields:
+            self._own("revealed", "_revealed_log")
+
+        radius = max(self.radius_cur, self.radius_history)
+        rows, cols = len(self.walls), len(self.walls[0])
+        if self.line_of_sight:
+            for row, col in self.get_sight_table(radius).visible(location):
+                if self.revealed.add_index(row * cols + col):
+                    self._revealed_log.append(row * cols + col)
+            return
+        for row in range(max(0, location[0] - radius), min(rows, location[0] + radius + 1)):
+            for col in range(max(0, location[1] - radius), min(cols, location[1] + radius + 1)):
+                if self.revealed.add_index(row * cols + col):
+                    self._revealed_log.append(row * cols + col)
+
+    def get_revealed_since(self, index: int) -> Tuple[List[coordinates], int]:
+        """ 返回第 index 个之后新揭示的格子以及新的下标；非迷雾模式下墙壁从一开始就全部已知，总是返回空列表 """
+        cols = self.revealed.cols
+        return [divmod(cell, cols) for cell in self._revealed_log[index:]], len(self._revealed_log)
     
     def apply_action_to_state(self, state: coordinates, action: Direction):
         """ 对特定状态使用决策后的状态 """
@@ -95,24 +201,15 @@ class MazeProblem(Problem):
 
     def _get_visible_locations(self) -> Set[coordinates]:
         """ 返回当前状态可见的位置 """
-        visible_locations = self.visible.copy()
-        radius = self.radius_history
-        
-        for location in list(visible_locations):
-            for dx in range(-radius, radius + 1):
-                for dy in range(-radius, radius + 1):
-                    neighbor = (location[0] + dx, location[1] + dy)
-                    if 0 <= neighbor[0] < len(self.walls) and 0 <= neighbor[1] < len(self.walls[0]):
-                        visible_locations.add(neighbor)
-
-        radius = self.radius_cur
-        for dx in range(-radius, radius + 1):
-            for dy in range(-radius, radius + 1):
-                neighbor = (self.location[0] + dx, self.location[1] + dy)
-                if 0 <= neighbor[0] < len(self.walls) and 0 <= neighbor[1] < len(self.walls[0]):
-                    visible_locations.add(neighbor)
-        
-        return visible_locations
+        if self.line_of_sight:
+            return get_sight_visible_locations(
+                self.visible, self.location,
+                self.get_sight_table(self.radius_history), self.get_sight_table(self.radius_cur)
+            )
+        return get_visible_locations(
+            self.visible, self.location, self.radius_history, self.radius_cur,
+            len(self.walls), len(self.walls[0])
+        )
     
     def _get_walls(self) -> Matrix[Set[Direction]]:
         """ 返回墙壁 """
@@ -131,24 +228,165 @@ class MazeProblem(Problem):
             "cols": len(self.walls[0]),
         }
 
+    def open_render_stream(self) -> MazeRenderStream:
+        """ 供其他线程渲染：stream.delta() 只返回上一次之后的变化，由 stream.create_view() 在渲染线程中累积 """
+        return MazeRenderStream(self)
+
     def get_dynamic_render_data(self) -> Dict[str, Any]:
-        """ 返回动态渲染数据 """
-        return {
-            "history_path": self.history_path,
-            "visible": self._get_visible_locations(),
-            "count": self._get_count(),
-            "state": self.get_state()
-        }
+        """ 返回动态渲染数据；历史路径与可见集合在两次调用之间增量更新，会被之后的调用原地修改 """
+        if self._render_stream is None:
+            self._render_stream = self.open_render_stream()
+            self._render_view = self._render_stream.create_view()
+        self._render_view.apply(self._render_stream.delta())
+        return self._render_view.data()
     
+    def get_history_path(self) -> List[coordinates]:
+        """ 以坐标列表的形式返回保留的历史路径 """
+        return self.history_path.positions()
+
     def set_state(self, state: coordinates) -> None:
         self.location = state
 
+    def get_maze_graph(self, *keep: coordinates) -> MazeGraph:
+        """ 预处理：填掉死路并把通道收缩为带权边；起点、终点与 keep 中的格子总是图中的节点
+
+        收缩图基于真实的墙壁，迷雾模式下会泄露没有看到过的墙壁，因此直接拒绝。
+        最近使用的 MAZE_GRAPH_CACHE_SIZE 个收缩图会被缓存。
+        """
+        if self.fog:
+            raise ValueError("收缩图需要完整的地图，不支持迷雾模式")
+
+        key = tuple(sorted({self.begin, self.end, *keep}))
+        graph = self._maze_graphs.get(key)
+        if graph is not None:
+            self._maze_graphs.move_to_end(key)
+            return graph
+
+        rows, cols = len(self.walls), len(self.walls[0])
+        graph = build_maze_graph(self._get_wall_masks(), rows, cols, key)
+        self._maze_graphs[key] = graph
+        if len(self._maze_graphs) > MAZE_GRAPH_CACHE_SIZE:
+            self._maze_graphs.popitem(last=False)
+        return graph
+
+    def _get_wall_masks(self) -> bytearray:
+        if self._wall_masks is None:
+            self._wall_masks = walls_to_masks(self.walls)
+        return self._wall_masks
+
+    def get_sight_table(self, radius: int) -> SightTable:
+        """ radius 以内考虑墙壁遮挡的视野表，按半径缓存；各格的视野在第一次查询时计算 """
+        table = self._sight_tables.get(radius)
+        if table is None:
+            table = build_sight_table(self._get_wall_masks(), len(self.walls), len(self.walls[0]), radius)
+            self._sight_tables[radius] = table
+        return table
+
+    def _own(self, *fields: str) -> None:
+        """ 写时复制：第一次修改与副本共享的字段前先复制一份 """
+        for field in fields:
+            if field in self._shared_fields:
+                setattr(self, field, copy.copy(getattr(self, field)))
+                self._shared_fields.discard(field)
+
+    def snapshot(self) -> Tuple[coordinates, int, int, coordinates, int, int]:
+        """ 历史路径、可见集合与揭示集合只会追加，因此令牌只需记录它们的长度 """
+        return (
+            self.location, self.count, self.history_path.steps, self.history_path.last,
+            len(self._visible_log), len(self._revealed_log)
+        )
+
+    def restore(self, token: Tuple[coordinates, int, int, coordinates, int, int]) -> None:
+        """ 撤销 snapshot 之后的修改，代价与其间的步数成正比 """
+        location, count, history_steps, history_last, visible_length, revealed_length = token
+        self._own("history_path", "visible", "_visible_log", "revealed", "_revealed_log")
+
+        self.history_path.truncate(history_steps, history_last)
+        while len(self._visible_log) > visible_length:
+            self.visible.discard_index(self._visible_log.pop())
+        while len(self._revealed_log) > revealed_length:
+            self.revealed.discard_index(self._revealed_log.pop())
+        self.location = location
+        self.count = count
+        self._render_epoch += 1
+
+    def fork(self) -> "MazeProblem":
+        """ 浅复制出一个副本：墙壁等不可变数据直接共享，历史路径与可见集合写时复制 """
+        child = object.__new__(type(self))
+        child.__dict__.update(self.__dict__)
+        child._render_stream = child._render_view = None
+
+        shared = {"history_path", "visible", "_visible_log", "revealed", "_revealed_log"}
+        self._shared_fields = set(shared)
+        child._shared_fields = set(shared)
+        return child
+
+
+def get_visible_locations(
+    visited: Iterable[coordinates], location: coordinates,
+    radius_history: int, radius_cur: int, rows: int, cols: int
+) -> Set[coordinates]:
+    """ 走过的位置周围 radius_history 以内、当前位置周围 radius_cur 以内的位置均可见 """
+    visible_locations = set(visited)
+    radius = radius_history
+    
+    for cell in visited:
+        for dx in range(-radius, radius + 1):
+            for dy in range(-radius, radius + 1):
+                neighbor = (cell[0] + dx, cell[1] + dy)
+                if 0 <= neighbor[0] < rows and 0 <= neighbor[1] < cols:
+                    visible_locations.add(neighbor)
+
+    radius = radius_cur
+    for dx in range(-radius, radius + 1):
+        for dy in range(-radius, radius + 1):
+            neighbor = (location[0] + dx, location[1] + dy)
+            if 0 <= neighbor[0] < rows and 0 <= neighbor[1] < cols:
+                visible_locations.add(neighbor)
+    
+    return visible_locations
+
+
+def get_sight_visible_locations(
+    visited: Iterable[coordinates], location: coordinates,
+    history_table: SightTable, cur_table: SightTable
+) -> Set[coordinates]:
+    """ get_visible_locations 的视线版本：窗口换成视野表中被墙壁遮挡后剩下的格子，每格只需一次查表 """
+    visible_locations = set(visited)
+    for cell in list(visible_locations):
+        row, col = cell
+        visible_locations.update((row + d_row, col + d_col) for d_row, d_col in history_table.offsets(cell))
+    visible_locations.update(cur_table.visible(location))
+
+    return visible_locations
+
+
+def _position_score(position: coordinates, end_pos: coordinates) -> Tuple[int, int]:
+    manhattan = abs(position[0] - end_pos[0]) + abs(position[1] - end_pos[1])
+    euclidean = sqrt((position[0] - end_pos[0]) ** 2 + (position[1] - end_pos[1]) ** 2)
+
+    return (manhattan, euclidean)
+
 
 def evaluate_func(problem: Problem, state: coordinates, action: Direction) -> Tuple[int, int]:
     start_pos = problem.apply_action_to_state(state, action)
     end_pos = problem.get_end_state()
 
-    manhattan = abs(start_pos[0] - end_pos[0]) + abs(start_pos[0] - end_pos[1])
-    euclidean = sqrt((start_pos[0] - end_pos[0]) ** 2 + (start_pos[0] - end_pos[1]) ** 2)
+    return _position_score(start_pos, end_pos)
+
+
+def evaluate_actions(
+    problem: Problem, state: coordinates, actions: Sequence[Direction]
+) -> List[Tuple[int, int]]:
+    """ evaluate_func 的批量版本：合法动作只查询一次，直接由增量得到后继格子 """
+    legal_actions = problem.get_legal_actions(state)
+    end_pos = problem.get_end_state()
 
-    return (manhattan, euclidean)
\ No newline at end of file
+    scores = []
+    for action in actions:
+        if action in legal_actions:
+            dx, dy = action.delta()
+            scores.append(_position_score((state[0] + dx, state[1] + dy), end_pos))
+        else:
+            scores.append(_position_score(state, end_pos))
+    return scores
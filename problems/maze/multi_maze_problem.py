@@ -0,0 +1,290 @@
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+from core.core_bases import Problem
+from core.core_registers import ProblemRegistry
+from .maze_problem import make_walls
+from .utils.codec import walls_to_masks
+from .utils.types import coordinates, Direction, Matrix, CODE_DELTAS
+
+
+# 掩码 -> 该格子允许的方向
+_LEGAL_BY_MASK = [
+    frozenset(Direction.from_code(code) for code in range(4) if not mask >> code & 1)
+    for mask in range(16)
+]
+
+
+@ProblemRegistry.register("MultiMazeProblem")
+class MultiMazeProblem(Problem):
+    """ 多个智能体同时探索同一个迷宫
+
+    墙壁只保存一份（渲染用的 walls 与每格一个字节的掩码），每个智能体只占用位置与步数两个数组元素；
+    占用网格记录每个格子上的智能体数量，碰撞检查是 O(1) 的。状态为所有智能体位置组成的元组，
+    apply_actions 按智能体编号顺序一次应用所有动作，每一拍的代价与智能体数量成线性关系。
+    end_condition 为 "goal" 时任意智能体到达终点即结束，为 "coverage" 时所有格子都被访问过才结束。
+    """
+    def __init__(
+        self, rows: int = 36, cols: int = 36, break_rate: float = 0.05, max_size: int = 40,
+        num_agents: int = 16, begin: Optional[coordinates] = None, end: Optional[coordinates] = None,
+        collisions: bool = True, end_condition: str = "goal",
+        seed: Optional[int] = None, workers: int = 1
+    ) -> None:
+        if end_condition not in ("goal", "coverage"):
+            raise ValueError(f"不支持的结束条件：{end_condition}")
+        if collisions and num_agents > rows * cols:
+            raise ValueError(f"{rows}x{cols} 的迷宫放不下 {num_agents} 个互不重叠的智能体")
+
+        self.walls: Matrix[Set[Direction]] = make_walls(rows, cols, break_rate, max_size, seed, workers)
+        self.masks = walls_to_masks(self.walls)
+        self.rows: int = rows
+        self.cols: int = cols
+        self.begin: coordinates = begin or (0, 0)
+        self.end: coordinates = end or (rows - 1, cols - 1)
+        self.num_agents: int = num_agents
+        self.collisions: bool = collisions
+        self.end_condition: str = end_condition
+        # 方向码 -> 行优先数组中的偏移
+        self._offsets: Tuple[int, ...] = tuple(dx * cols + dy for dx, dy in CODE_DELTAS)
+        self._spawn_cells: List[int] = self._get_spawn_cells()
+        self.init_problem_state()
+
+    @classmethod
+    def from_config(cls, **config) -> "MultiMazeProblem":
+        """使用配置文件初始化 MultiMazeProblem 实例"""
+        return cls(
+            rows=config.get("rows", 36),
+            cols=config.get("cols", 36),
+            break_rate=config.get("break_rate", 0.05),
+            max_size=config.get("max_size", 40),
+            num_agents=config.get("num_agents", 16),
+            begin=config.get("begin"),
+            end=config.get("end"),
+            collisions=config.get("collisions", True),
+            end_condition=config.get("end_condition", "goal"),
+            seed=config.get("seed"),
+            workers=config.get("workers", 1)
+        )
+
+    def _get_spawn_cells(self) -> List[int]:
+        """ 允许碰撞时全部从起点出发，否则按 BFS 顺序占据离起点最近的格子 """
+        begin = self.begin[0] * self.cols + self.begin[1]
+        if not self.collisions:
+            return [begin] * self.num_agents
+
+        cells = [begin]
+        seen = {begin}
+        for cell in cells:
+            if len(cells) >= self.num_agents:
+                break
+            for code, offset in enumerate(self._offsets):
+                neighbor = cell + offset
+                if not self.masks[cell] >> code & 1 and neighbor not in seen:
+                    seen.add(neighbor)
+                    cells.append(neighbor)
+        return cells[:self.num_agents]
+
+    def init_problem_state(self) -> None:
+        """  初始化问题状态 """
+        cell_count = self.rows * self.cols
+        self.positions = array("i", self._spawn_cells)
+        self.counts = array("i", bytes(4 * self.num_agents))
+        self.occupancy = array("i", bytes(4 * cell_count))
+        self.coverage = bytearray(cell_count)
+        self.covered = 0
+        self.count = 0
+        for cell in self.positions:
+            self.occupancy[cell] += 1
+            if not self.coverage[cell]:
+                self.coverage[cell] = 1
+                self.covered += 1
+
+    def _to_coordinates(self, cell: int) -> coordinates:
+        return divmod(cell, self.cols)
+
+    def get_start_state(self) -> Tuple[coordinates, ...]:
+        return tuple(self._to_coordinates(cell) for cell in self._spawn_cells)
+
+    def get_end_state(self) -> coordinates:
+        return self.end
+
+    def get_state(self) -> Tuple[coordinates, ...]:
+        """ 所有智能体的位置 """
+        return tuple(divmod(cell, self.cols) for cell in self.positions)
+
+    def get_agent_state(self, index: int) -> coordinates:
+        return divmod(self.positions[index], self.cols)
+
+    def is_end_state(self, cur_state: Tuple[coordinates, ...]) -> bool:
+        if self.end_condition == "coverage":
+            return self.covered == self.rows * self.cols
+        return self.end in cur_state
+
+    def get_end_info(self) -> Dict[str, int]:
+        return {"ticks": self.count, "moves": sum(self.counts), "covered": self.covered}
+
+    def get_legal_actions(self, state: coordinates) -> Set[Direction]:
+        """ 单个格子的合法动作，只考虑墙壁；碰撞在应用动作时检查 """
+        return set(_LEGAL_BY_MASK[self.masks[state[0] * self.cols + state[1]]])
+
+    def apply_action_to_state(self, state: coordinates, action: Optional[Direction]) -> coordinates:
+        if action not in _LEGAL_BY_MASK[self.masks[state[0] * self.cols + state[1]]]:
+            return state
+
+        dx, dy = action.delta()
+        return (state[0] + dx, state[1] + dy)
+
+    def _move(self, index: int, code: int) -> bool:
+        cell = self.positions[index]
+        if self.masks[cell] >> code & 1:
+            return False
+
+        target = cell + self._offsets[code]
+        if self.collisions and self.occupancy[target]:
+            return False
+
+        self.occupancy[cell] -= 1
+        self.occupancy[target] += 1
+        self.positions[index] = target
+        self.counts[index] += 1
+        if not self.coverage[target]:
+            self.coverage[target] = 1
+            self.covered += 1
+        return True
+
+    def apply_agent_action(self, index: int, action: Optional[Direction]) -> coordinates:
+        """ 只移动第 index 个智能体，不计入拍数 """
+        if action is not None:
+            self._move(index, action.code())
+        return self.get_agent_state(index)
+
+    def apply_actions(self, actions: Sequence[Optional[Direction]]) -> Tuple[coordinates, ...]:
+        """ 一拍：按编号顺序移动所有智能体，None 表示原地不动；撞墙或目标格子被占用时保持不动 """
+        move = self._move
+        for index, action in enumerate(actions):
+            if action is not None:
+                move(index, action.code())
+        self.count += 1
+        return self.get_state()
+
+    def apply_action(self, action: Optional[Sequence[Optional[Direction]]]) -> Tuple[coordinates, ...]:
+        """ 与单智能体的主循环兼容：动作为所有智能体的动作序列 """
+        if action is None:
+            return self.get_state()
+        return self.apply_actions(action)
+
+    def set_state(self, state: Sequence[coordinates]) -> None:
+        self.occupancy = array("i", bytes(4 * self.rows * self.cols))
+        for index, (row, col) in enumerate(state):
+            cell = row * self.cols + col
+            self.positions[index] = cell
+            self.occupancy[cell] += 1
+
+    def set_agent_state(self, index: int, state: coordinates) -> None:
+        """ 把第 index 个智能体放到 state；开启碰撞且该格子已被占用时保持不动 """
+        target = state[0] * self.cols + state[1]
+        cell = self.positions[index]
+        if target == cell or (self.collisions and self.occupancy[target]):
+            return
+
+        self.occupancy[cell] -= 1
+        self.occupancy[target] += 1
+        self.positions[index] = target
+
+    def agent_view(self, index: int) -> "MazeAgentView":
+        return MazeAgentView(self, index)
+
+    def get_static_render_data(self) -> Dict[str, Any]:
+        """ 返回不随时间变化的静态渲染数据（如地图、起点终点等） """
+        return {
+            "walls": self.walls,
+            "begin": self.begin,
+            "end": self.end,
+            "rows": self.rows,
+            "cols": self.cols,
+        }
+
+    def get_dynamic_render_data(self) -> Dict[str, Any]:
+        """ 返回动态渲染数据，coverage 为每格一个字节的访问标记 """
+        return {
+            "states": self.get_state(),
+            "coverage": bytes(self.coverage),
+            "covered": self.covered,
+            "count": self.count
+        }
+
+    def snapshot(self) -> Tuple[bytes, bytes, bytes, int, int]:
+        return (
+            self.positions.tobytes(), self.counts.tobytes(), bytes(self.coverage),
+            self.covered, self.count
+        )
+
+    def restore(self, token: Tuple[bytes, bytes, bytes, int, int]) -> None:
+        positions, counts, coverage, self.covered, self.count = token
+        self.positions = array("i", positions)
+        self.counts = array("i", counts)
+        self.coverage = bytearray(coverage)
+        self.set_state([self._to_coordinates(cell) for cell in self.positions])
+
+    def fork(self) -> "MultiMazeProblem":
+        """ 墙壁与掩码直接共享，只复制各个智能体的状态数组 """
+        child = object.__new__(type(self))
+        child.__dict__.update(self.__dict__)
+        child.positions = array("i", self.positions)
+        child.counts = array("i", self.counts)
+        child.occupancy = array("i", self.occupancy)
+        child.coverage = bytearray(self.coverage)
+        return child
+
+
+class MazeAgentView(Problem):
+    """ 多智能体迷宫中单个智能体的视角，使现有的单智能体可以直接控制其中一个智能体 """
+    def __init__(self, problem: MultiMazeProblem, index: int) -> None:
+        self.problem = problem
+        self.index = index
+
+    @classmethod
+    def from_config(cls, **config) -> "MazeAgentView":
+        return cls(config["problem"], config["index"])
+
+    def init_problem_state(self) -> None:
+        pass
+
+    def get_start_state(self) -> coordinates:
+        return self.problem.get_start_state()[self.index]
+
+    def get_end_state(self) -> coordinates:
+        return self.problem.end
+
+    def get_end_info(self) -> int:
+        return self.problem.counts[self.index]
+
+    def get_state(self) -> coordinates:
+        return self.problem.get_agent_state(self.index)
+
+    def set_state(self, state: coordinates) -> None:
+        self.problem.set_agent_state(self.index, state)
+
+    def is_end_state(self, cur_state: coordinates) -> bool:
+        return cur_state == self.problem.end
+
+    def get_legal_actions(self, state: coordinates) -> Set[Direction]:
+        """ 开启碰撞时，被其他智能体占用的相邻格子视为墙壁 """
+        actions = self.problem.get_legal_actions(state)
+        if not self.problem.collisions:
+            return actions
+
+        occupancy, offsets = self.problem.occupancy, self.problem._offsets
+        cell = state[0] * self.problem.cols + state[1]
+        return {action for action in actions if not occupancy[cell + offsets[action.code()]]}
+
+    def apply_action_to_state(self, state: coordinates, action: Optional[Direction]) -> coordinates:
+        return self.problem.apply_action_to_state(state, action)
+
+    def apply_action(self, action: Optional[Direction]) -> coordinates:
+        return self.problem.apply_agent_action(self.index, action)
+
+    def get_static_render_data(self) -> Dict[str, Any]:
+        return self.problem.get_static_render_data()
+
+    def get_dynamic_render_data(self) -> Dict[str, Any]:
+        return {"state": self.get_state(), "count": self.get_end_info()}
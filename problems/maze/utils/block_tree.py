@@ -0,0 +1,122 @@
+from typing import Dict, List, Optional, Set, Tuple
+from .codec import WALL_BITS
+from .generate_walls import Block, Split, _plan_blocks, generate_wall_masks_parallel
+
+
+# 默认的块大小：32x32 的块每条边上通常只有几处通路
+TREE_LEAF_CELLS = 1 << 10
+
+
+class BlockTree:
+    """ 生成器的分块结构：按 _plan_blocks 的切分规则得到的叶子块，以及块与块之间的传送门
+
+    大于并行生成叶子块的切分线上只有 _stitch 打通的一扇门和 break_rate 打通的墙；更细的切分线上是块内原有的通路。
+    比生成时更细的块内部不一定连通，所以切分线上的每一处通路都保留为传送门，而不是像 HPA* 那样合并成入口。
+    """
+    def __init__(
+        self, rows: int, cols: int, leaves: List[Block], splits: List[Split], masks: bytes
+    ) -> None:
+        self.rows = rows
+        self.cols = cols
+        self.leaves = leaves
+        self._leaf_ids: Dict[Block, int] = {leaf: index for index, leaf in enumerate(leaves)}
+        # 区域 -> (切分方向, 切分位置)，用于自顶向下查找格子所在的叶子块
+        self._splits: Dict[Block, Tuple[str, int]] = {
+            (row0, col0, rows, cols): (orientation, length)
+            for orientation, row0, col0, rows, cols, length in splits
+        }
+        self.portal_count = 0
+        # 叶子块编号 -> 块内作为传送门的格子
+        self.block_portals: List[List[int]] = [[] for _ in leaves]
+        # 传送门格子 -> 另一侧的格子；块角上的格子可能同时通向两个块，第二个放在 _corner_partners 中。
+        # 8192x8192 的迷宫有上百万对传送门，这里避免为每个格子创建列表
+        self.partners: Dict[int, int] = {}
+        self._corner_partners: Dict[int, int] = {}
+        # 传送门格子 -> 所在叶子块，搜索时不需要再从树根查找
+        self.portal_blocks: Dict[int, int] = {}
+        # 叶子块编号 -> 通过传送门相连的叶子块，即上层的块图
+        self.links: List[Set[int]] = [set() for _ in leaves]
+        for split in splits:
+            self._add_portals(split, masks)
+
+    def block_of(self, row: int, col: int) -> int:
+        """ 格子所在叶子块的编号，代价与树的深度成正比 """
+        region: Block = (0, 0, self.rows, self.cols)
+        while region in self._splits:
+            orientation, length = self._splits[region]
+            row0, col0, rows, cols = region
+            if orientation == "col":
+                if col < col0 + length:
+                    region = (row0, col0, rows, length)
+                else:
+                    region = (row0, col0 + length, rows, cols - length)
+            else:
+                if row < row0 + length:
+                    region = (row0, col0, length, cols)
+                else:
+                    region = (row0 + length, col0, rows - length, cols)
+        return self._leaf_ids[region]
+
+    def block_of_cell(self, cell: int) -> int:
+        return self.block_of(*divmod(cell, self.cols))
+
+    def partners_of(self, cell: int) -> Tuple[int, ...]:
+        """ 与传送门格子相邻、位于其他块中的格子 """
+        if cell not in self.partners:
+            return ()
+        if cell in self._corner_partners:
+            return (self.partners[cell], self._corner_partners[cell])
+        return (self.partners[cell],)
+
+    def _add_portal(self, first: int, second: int) -> None:
+        self.portal_count += 1
+        for cell, other in ((first, second), (second, first)):
+            if cell in self.partners:
+                self._corner_partners[cell] = other
+            else:
+                self.partners[cell] = other
+                block = self.portal_blocks[cell] = self.block_of_cell(cell)
+                self.block_portals[block].append(cell)
+        self.links[self.portal_blocks[first]].add(self.portal_blocks[second])
+        self.links[self.portal_blocks[second]].add(self.portal_blocks[first])
+
+    def center(self, block: int) -> Tuple[float, float]:
+        row0, col0, rows, cols = self.leaves[block]
+        return (row0 + (rows - 1) / 2, col0 + (cols - 1) / 2)
+
+    def _add_portals(self, split: Split, masks: bytes) -> None:
+        """ 扫描一条切分线，线上每一处通路都是一对传送门 """
+        orientation, row0, col0, rows, cols, length = split
+        width = self.cols
+        if orientation == "col":
+            start, count, step = row0 * width + col0 + length - 1, rows, width
+            near_bit, far_bit, across = WALL_BITS["RIGHT"], WALL_BITS["LEFT"], 1
+        else:
+            start, count, step = (row0 + length - 1) * width + col0, cols, 1
+            near_bit, far_bit, across = WALL_BITS["DOWN"], WALL_BITS["UP"], width
+
+        near = masks[start:start + count * step:step]
+        far = masks[start + across:start + across + count * step:step]
+        for position in range(count):
+            if not near[position] & near_bit and not far[position] & far_bit:
+                cell = start + position * step
+                self._add_portal(cell, cell + across)
+
+
+def build_block_tree(
+    masks: bytes, rows: int, cols: int, max_size: int = 50, leaf_cells: int = TREE_LEAF_CELLS
+) -> BlockTree:
+    """ 按生成器的切分规则划分 rows x cols 的区域，并从墙壁掩码中找出块之间的传送门 """
+    leaves: List[Block] = []
+    splits: List[Split] = []
+    _plan_blocks((0, 0, rows, cols), max_size, leaf_cells, leaves, splits)
+    return BlockTree(rows, cols, leaves, splits, masks)
+
+
+def generate_wall_masks_with_tree(
+    rows: int, cols: int, break_rate: float = 0.1, max_size: int = 50,
+    seed: int = 0, workers: Optional[int] = None, leaf_cells: int = TREE_LEAF_CELLS
+) -> Tuple[bytearray, BlockTree]:
+    """ generate_wall_masks_parallel，同时返回分块树 """
+    masks = generate_wall_masks_parallel(rows, cols, break_rate, max_size, seed=seed, workers=workers)
+    return masks, build_block_tree(masks, rows, cols, max_size, leaf_cells)
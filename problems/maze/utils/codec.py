@@ -0,0 +1,93 @@
+from typing import Iterator, Optional, Set
+from .types import Matrix, Direction, DIRECTION_CODES
+
+
+# 每个格子的墙壁编码为 4 bit 掩码：第 i 位对应方向码为 i 的墙
+WALL_BITS = {name: 1 << code for name, code in DIRECTION_CODES.items()}
+
+
+def walls_to_masks(walls: Matrix[Set[Direction]]) -> bytearray:
+    """ 把墙壁矩阵按行优先编码为每格一个字节的掩码 """
+    masks = bytearray(len(walls) * len(walls[0]))
+    index = 0
+    for row in walls:
+        for cell in row:
+            mask = 0
+            for direction in cell:
+                mask |= WALL_BITS[direction.name]
+            masks[index] = mask
+            index += 1
+    return masks
+
+
+def masks_to_walls(masks: bytes, rows: int, cols: int) -> Matrix[Set[Direction]]:
+    """ walls_to_masks 的逆变换 """
+    mask_sets = [
+        {Direction(name) for name, bit in WALL_BITS.items() if mask & bit}
+        for mask in range(16)
+    ]
+    return [
+        [set(mask_sets[masks[row * cols + col]]) for col in range(cols)]
+        for row in range(rows)
+    ]
+
+
+def pack_nibbles(masks: bytes) -> bytes:
+    """ 两个 4 bit 掩码合并为一个字节 """
+    packed = bytearray((len(masks) + 1) // 2)
+    for index, mask in enumerate(masks):
+        packed[index >> 1] |= mask << ((index & 1) << 2)
+    return bytes(packed)
+
+
+def unpack_nibbles(packed: bytes, count: int) -> bytearray:
+    masks = bytearray(count)
+    for index in range(count):
+        masks[index] = (packed[index >> 1] >> ((index & 1) << 2)) & 0xF
+    return masks
+
+
+class PackedPath:
+    """ 每步一个 2 bit 方向码的紧凑序列，4 步占一个字节 """
+    __slots__ = ("_codes", "_length")
+
+    def __init__(self, codes: Optional[bytes] = None, length: int = 0) -> None:
+        self._codes = bytearray(codes or b"")
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def append(self, code: int) -> None:
+        shift = (self._length & 3) << 1
+        if shift == 0:
+            self._codes.append(code)
+        else:
+            self._codes[-1] |= code << shift
+        self._length += 1
+
+    def code_at(self, index: int) -> int:
+        if not 0 <= index < self._length:
+            raise IndexError(index)
+        return (self._codes[index >> 2] >> ((index & 3) << 1)) & 3
+
+    def iter_codes(self, start: int = 0, stop: Optional[int] = None) -> Iterator[int]:
+        stop = self._length if stop is None else min(stop, self._length)
+        codes = self._codes
+        for index in range(start, stop):
+            yield (codes[index >> 2] >> ((index & 3) << 1)) & 3
+
+    def truncate(self, length: int) -> None:
+        """ 只保留前 length 步 """
+        if length >= self._length:
+            return
+        del self._codes[(length + 3) >> 2:]
+        if length & 3:
+            self._codes[-1] &= (1 << ((length & 3) << 1)) - 1
+        self._length = length
+
+    def copy(self) -> "PackedPath":
+        return PackedPath(self._codes, self._length)
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._codes)
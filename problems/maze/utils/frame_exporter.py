@@ -0,0 +1,194 @@
+import os
+import json
+import queue
+import random
+import argparse
+import threading
+import multiprocessing
+from typing import Any, Optional
+from core import Agent, AgentRegistry, Problem, ProblemRegistry, Renderer, RendererRegistry
+
+
+# 队列满时每隔多少秒检查一次后台写盘是否还活着
+WRITER_POLL_INTERVAL = 0.5
+
+
+def _write_frames(frame_queue: Any, directory: str, frame_format: str) -> None:
+    """ 后台写盘：PNG 序列，或者按 (高, 宽, RGB) 顺序拼接的原始帧 frames.rgb """
+    import pygame
+
+    raw_file = open(os.path.join(directory, "frames.rgb"), "wb") if frame_format == "raw" else None
+    count = 0
+    shape = None
+    while True:
+        frame = frame_queue.get()
+        if frame is None:
+            break
+
+        shape = frame.shape
+        if raw_file is not None:
+            raw_file.write(frame.swapaxes(0, 1).tobytes())
+        else:
+            surface = pygame.surfarray.make_surface(frame)
+            pygame.image.save(surface, os.path.join(directory, f"frame_{count:06d}.png"))
+        count += 1
+
+    if raw_file is not None:
+        raw_file.close()
+    if shape is not None:
+        with open(os.path.join(directory, "frames.json"), "w", encoding="utf-8") as file:
+            json.dump({
+                "format": frame_format, "count": count,
+                "width": shape[0], "height": shape[1], "pixel_format": "rgb24"
+            }, file)
+
+
+def _run_writer(frame_queue: Any, directory: str, frame_format: str, errors: Any) -> None:
+    """ 写盘出错时把异常交给 errors，由 submit / close 在主线程中重新抛出 """
+    try:
+        _write_frames(frame_queue, directory, frame_format)
+    except BaseException as error:
+        errors.put(error)
+
+
+class FrameExporter:
+    """ 渲染与编码流水线：帧经有界队列交给后台线程或进程写盘
+
+    队列满时 submit 会阻塞，从而限制内存占用；use_process=True 时 PNG 编码不与渲染争用 GIL。
+    后台写盘失败后，submit 与 close 会重新抛出它的异常，而不是在满队列上一直等待。
+    """
+    def __init__(
+        self, directory: str, frame_format: str = "png",
+        queue_size: int = 64, use_process: bool = False
+    ) -> None:
+        if frame_format not in ("png", "raw"):
+            raise ValueError(f"不支持的帧格式：{frame_format}")
+
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.frame_count = 0
+        self._error: Optional[BaseException] = None
+
+        if use_process:
+            self._queue = multiprocessing.Queue(maxsize=queue_size)
+            self._errors = multiprocessing.Queue()
+            self._worker = multiprocessing.Process(
+                target=_run_writer, args=(self._queue, directory, frame_format, self._errors), daemon=True
+            )
+        else:
+            self._queue = queue.Queue(maxsize=queue_size)
+            self._errors = queue.Queue()
+            self._worker = threading.Thread(
+                target=_run_writer, args=(self._queue, directory, frame_format, self._errors), daemon=True
+            )
+        self._worker.start()
+
+    def __enter__(self) -> "FrameExporter":
+        return self
+
+    def __exit__(self, exc_type, *_) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        # 已经有异常在传播（可能就是写盘的异常），只停止后台写盘，不再抛出新的异常
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def _raise_error(self, timeout: float = 0) -> None:
+        if self._error is None:
+            try:
+                self._error = self._errors.get(timeout=timeout) if timeout else self._errors.get_nowait()
+            except queue.Empty:
+                return
+        raise self._error
+
+    def _put(self, item: Any) -> None:
+        """ 放入队列；队列满时定期检查后台写盘，它已经退出时抛出它的异常 """
+        while True:
+            self._raise_error()
+            if not self._worker.is_alive():
+                # 子进程的异常经管道传回，可能比进程退出稍晚到达
+                self._raise_error(timeout=WRITER_POLL_INTERVAL)
+                raise RuntimeError("写帧的后台线程（进程）已经退出")
+            try:
+                self._queue.put(item, timeout=WRITER_POLL_INTERVAL)
+                return
+            except queue.Full:
+                continue
+
+    def submit(self, frame: Any) -> None:
+        self._put(frame)
+        self.frame_count += 1
+
+    def close(self) -> None:
+        """ 等待队列中剩余的帧全部写完；后台写盘失败时重新抛出它的异常 """
+        if self._error is None and self._worker.is_alive():
+            self._put(None)
+            self._worker.join()
+        self._raise_error()
+
+
+def export_frames(
+    problem: Problem, renderer: Renderer, agent: Agent, exporter: FrameExporter,
+    max_steps: Optional[int] = None, frame_every: int = 1
+) -> int:
+    """ 不受帧率限制地运行一回合，每 frame_every 步导出一帧，返回运行的步数 """
+    problem.init_problem_state()
+    renderer.render()
+    exporter.submit(renderer.grab_frame())
+
+    steps = 0
+    while not problem.is_end_state(problem.get_state()):
+        if max_steps is not None and steps >= max_steps:
+            break
+
+        problem.apply_action(agent.select_action(problem))
+        steps += 1
+        if steps % frame_every == 0:
+            renderer.render()
+            exporter.submit(renderer.grab_frame())
+
+    if steps % frame_every != 0:
+        renderer.render()
+        exporter.submit(renderer.grab_frame())
+
+    return steps
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="离屏渲染一回合并导出帧序列")
+    parser.add_argument("output", help="输出目录")
+    parser.add_argument("--problem", default="MazeProblem")
+    parser.add_argument("--agent", default="DFSAgentOptimized2")
+    parser.add_argument("--rows", type=int, default=36)
+    parser.add_argument("--cols", type=int, default=36)
+    parser.add_argument("--seed", type=int, default=5)
+    parser.add_argument("--format", choices=["png", "raw"], default="png")
+    parser.add_argument("--frame-every", type=int, default=1, help="每隔多少步导出一帧")
+    parser.add_argument("--max-steps", type=int, default=None)
+    parser.add_argument("--queue-size", type=int, default=64)
+    parser.add_argument("--process", action="store_true", help="在子进程而不是线程中编码")
+    args = parser.parse_args()
+
+    from problems import get_evaluate_funcs
+
+    random.seed(args.seed)
+    problem_class = ProblemRegistry.get_problem(args.problem)
+    problem = problem_class.from_config(rows=args.rows, cols=args.cols)
+    # 启发函数取自所选问题所在的包，与 game.py 和参数扫描一致
+    evaluate_func, evaluate_actions = get_evaluate_funcs(problem_class)
+    agent = AgentRegistry.get_agent(args.agent).from_config(
+        evaluate_func=evaluate_func, evaluate_actions=evaluate_actions
+    )
+    renderer_class = RendererRegistry.get_renderer(args.problem.replace("Problem", "Renderer"))
+    renderer = renderer_class.create_offscreen(problem)
+
+    with FrameExporter(args.output, args.format, args.queue_size, args.process) as exporter:
+        steps = export_frames(problem, renderer, agent, exporter, args.max_steps, args.frame_every)
+    print(f"{steps} 步，导出 {exporter.frame_count} 帧到 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 import random
-from typing import Optional, Set
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Set, Tuple
 from problems.maze.utils.types import (Matrix, Direction)
+from problems.maze.utils.codec import (walls_to_masks, masks_to_walls, WALL_BITS)
 from problems.maze.curves import (gen_hilbert, gen_hamilton)
 
 
@@ -134,6 +136,149 @@ def generate_walls(rows: int, cols: int, break_rate: float = 0.1, max_size: int
     return walls
 
 
+# 并行生成时叶子块的最大格子数；它决定了切分方式，与进程数无关，从而保证结果只取决于种子
+PARALLEL_LEAF_CELLS = 1 << 16
+
+# (起始行, 起始列, 行数, 列数)
+Block = Tuple[int, int, int, int]
+# (切分方向 "col" / "row", 起始行, 起始列, 行数, 列数, 切分位置 length)
+Split = Tuple[str, int, int, int, int, int]
+
+
+def _plan_blocks(
+    block: Block, max_size: int, leaf_cells: int, leaves: List[Block], splits: List[Split]
+) -> None:
+    """ 按 _generate_walls 的切分规则把区域划分为叶子块，2 的幂的大正方形也继续对半切分 """
+    row0, col0, rows, cols = block
+    if rows == 1 or cols == 1 or rows * cols < max_size or rows * cols <= leaf_cells:
+        leaves.append(block)
+        return
+
+    length = min(largest_power_of_two(rows), largest_power_of_two(cols))
+    if rows == cols and length == rows:
+        length //= 2
+
+    if cols >= rows:
+        _plan_blocks((row0, col0, rows, length), max_size, leaf_cells, leaves, splits)
+        _plan_blocks((row0, col0 + length, rows, cols - length), max_size, leaf_cells, leaves, splits)
+        splits.append(("col", row0, col0, rows, cols, length))
+    else:
+        _plan_blocks((row0, col0, length, cols), max_size, leaf_cells, leaves, splits)
+        _plan_blocks((row0 + length, col0, rows - length, cols), max_size, leaf_cells, leaves, splits)
+        splits.append(("row", row0, col0, rows, cols, length))
+
+
+def _generate_leaf(task: Tuple[int, int, int, float, int]) -> bytes:
+    """ 在独立的随机数种子下生成一个叶子块（含块内的随机打通），返回墙壁掩码 """
+    rows, cols, max_size, break_rate, seed = task
+    rng = random.Random(seed)
+
+    # _generate_walls 使用全局 random，这里临时替换其状态，结束后恢复调用方的状态
+    outer_state = random.getstate()
+    random.setstate(rng.getstate())
+    try:
+        masks = walls_to_masks(_generate_walls(rows, cols, max_size))
+    finally:
+        random.setstate(outer_state)
+
+    _break_masks(masks, rows, cols, break_rate, rng)
+    return bytes(masks)
+
+
+def _break_masks(masks: bytearray, rows: int, cols: int, break_rate: float, rng: random.Random) -> None:
+    """ 以 break_rate 的概率打通墙壁；块边界上只修改本块一侧，拼接后再对称化 """
+    deltas = [(direction.value, WALL_BITS[direction.name], WALL_BITS[direction.reverse().name])
+              for direction in Direction.iter()]
+    for row in range(rows):
+        for col in range(cols):
+            index = row * cols + col
+            for (d_row, d_col), bit, reverse_bit in deltas:
+                if masks[index] & bit and rng.random() < break_rate:
+                    masks[index] &= ~bit
+                    next_row, next_col = row + d_row, col + d_col
+                    if is_valid_position(next_row, next_col, rows, cols):
+                        masks[next_row * cols + next_col] &= ~reverse_bit
+
+
+def generate_wall_masks_parallel(
+    rows: int, cols: int, break_rate: float = 0.1, max_size: int = 50,
+    seed: int = 0, workers: Optional[int] = None, leaf_cells: int = PARALLEL_LEAF_CELLS
+) -> bytearray:
+    """ 并行生成墙壁掩码（行优先，每格一个字节）
+
+    顶层区域被切分成叶子块，每块使用由 (seed, 块编号) 派生的种子在进程池中生成，
+    拼接后再在每条切分线上打通一扇门。切分方式与种子派生都与 workers 无关，
+    所以相同的种子在任意进程数下都得到相同的迷宫。
+    """
+    if rows <= 0 or cols <= 0:
+        raise ValueError("行数和列数必须是正整数")
+
+    leaves: List[Block] = []
+    splits: List[Split] = []
+    _plan_blocks((0, 0, rows, cols), max_size, leaf_cells, leaves, splits)
+
+    tasks = [
+        (leaf_rows, leaf_cols, max_size, break_rate, random.Random(f"{seed}:{index}").getrandbits(64))
+        for index, (_, _, leaf_rows, leaf_cols) in enumerate(leaves)
+    ]
+    if workers == 1 or len(tasks) == 1:
+        results = [_generate_leaf(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_generate_leaf, tasks))
+
+    masks = bytearray(rows * cols)
+    for (row0, col0, leaf_rows, leaf_cols), leaf_masks in zip(leaves, results):
+        for row in range(leaf_rows):
+            start = (row0 + row) * cols + col0
+            masks[start:start + leaf_cols] = leaf_masks[row * leaf_cols:(row + 1) * leaf_cols]
+
+    _stitch(masks, cols, splits, random.Random(f"{seed}:doors"))
+
+    for row in range(rows):
+        masks[row * cols] |= WALL_BITS["LEFT"]
+        masks[row * cols + cols - 1] |= WALL_BITS["RIGHT"]
+    for col in range(cols):
+        masks[col] |= WALL_BITS["UP"]
+        masks[(rows - 1) * cols + col] |= WALL_BITS["DOWN"]
+
+    return masks
+
+
+def _stitch(masks: bytearray, cols: int, splits: List[Split], rng: random.Random) -> None:
+    """ 对称化每条切分线两侧的墙壁（块内打通只改了一侧），然后打通连接两半的门 """
+    left, right, up, down = WALL_BITS["LEFT"], WALL_BITS["RIGHT"], WALL_BITS["UP"], WALL_BITS["DOWN"]
+    for orientation, row0, col0, rows, split_cols, length in splits:
+        if orientation == "col":
+            col = col0 + length
+            for row in range(row0, row0 + rows):
+                west, east = row * cols + col - 1, row * cols + col
+                if not masks[west] & right or not masks[east] & left:
+                    masks[west] &= ~right
+                    masks[east] &= ~left
+            row = row0 + rng.randrange(rows)
+            masks[row * cols + col - 1] &= ~right
+            masks[row * cols + col] &= ~left
+        else:
+            row = row0 + length
+            for col in range(col0, col0 + split_cols):
+                north, south = (row - 1) * cols + col, row * cols + col
+                if not masks[north] & down or not masks[south] & up:
+                    masks[north] &= ~down
+                    masks[south] &= ~up
+            col = col0 + rng.randrange(split_cols)
+            masks[(row - 1) * cols + col] &= ~down
+            masks[row * cols + col] &= ~up
+
+
+def generate_walls_parallel(
+    rows: int, cols: int, break_rate: float = 0.1, max_size: int = 50,
+    seed: int = 0, workers: Optional[int] = None
+) -> Matrix[Set[Direction]]:
+    """ generate_wall_masks_parallel 的墙壁矩阵形式 """
+    return masks_to_walls(generate_wall_masks_parallel(rows, cols, break_rate, max_size, seed, workers), rows, cols)
+
+
 if __name__ == "__main__":
     walls_grid = generate_walls(15, 8)
     print(walls_grid)
\ No newline at end of file
@@ -0,0 +1,199 @@
+from typing import Dict, Iterator, List, Optional
+from .codec import PackedPath
+from .types import coordinates, CODE_DELTAS
+
+
+_DELTA_CODES: Dict[coordinates, int] = {delta: code for code, delta in enumerate(CODE_DELTAS)}
+
+
+class PathHistory:
+    """ 历史路径：每步一个 2 bit 方向码，另有稀疏的跳转表
+
+    智能体通过 set_state 直接移动后，下一步的起点与上一步的终点不相邻，此时在跳转表中记录该步的起点。
+    指定 cap 时只保留最近 cap 步：方向码累积到 2 * cap 步时丢弃最早的一半，并把丢弃的部分折算进起始位置，
+    因此内存占用不超过 cap / 2 字节，均摊到每一步的代价是 O(1)。
+    """
+    __slots__ = ("cap", "_codes", "_jumps", "_origin", "_start", "_last")
+
+    def __init__(self, begin: coordinates, cap: Optional[int] = None) -> None:
+        if cap is not None and cap < 1:
+            raise ValueError("cap 必须是正整数")
+
+        self.cap = cap
+        self._codes = PackedPath()
+        # 绝对步号 -> 该步的起点（仅在与上一步终点不同时记录）
+        self._jumps: Dict[int, coordinates] = {}
+        # 第 _start 步之后的位置，_codes 中的第 i 个方向码对应第 _start + i 步
+        self._origin: coordinates = begin
+        self._start = 0
+        self._last: coordinates = begin
+
+    @property
+    def steps(self) -> int:
+        """ 总步数，包括已经丢弃的部分 """
+        return self._start + len(self._codes)
+
+    @property
+    def last(self) -> coordinates:
+        return self._last
+
+    def __len__(self) -> int:
+        """ 可以访问的位置个数（位置比步数多一个） """
+        retained = len(self._codes)
+        if self.cap is not None:
+            retained = min(retained, self.cap)
+        return retained + 1
+
+    def append(self, from_state: coordinates, to_state: coordinates) -> None:
+        """ 记录一次从 from_state 到相邻格子 to_state 的移动 """
+        if from_state != self._last:
+            self._jumps[self.steps] = from_state
+        self._codes.append(_DELTA_CODES[(to_state[0] - from_state[0], to_state[1] - from_state[1])])
+        self._last = to_state
+
+        if self.cap is not None and len(self._codes) >= 2 * self.cap:
+            self._drop(len(self._codes) - self.cap)
+
+    def _drop(self, count: int) -> None:
+        """ 丢弃最早的 count 步，把它们折算进起始位置 """
+        jumps = self._jumps
+        row, col = self._origin
+        for step, code in enumerate(self._codes.iter_codes(0, count), self._start):
+            if step in jumps:
+                row, col = jumps.pop(step)
+            d_row, d_col = CODE_DELTAS[code]
+            row, col = row + d_row, col + d_col
+
+        remaining = len(self._codes) - count
+        if count & 3 == 0:
+            codes = PackedPath(self._codes.to_bytes()[count >> 2:], remaining)
+        else:
+            codes = PackedPath()
+            for code in self._codes.iter_codes(count):
+                codes.append(code)
+
+        self._codes = codes
+        self._origin = (row, col)
+        self._start += count
+
+    def truncate(self, steps: int, last: coordinates) -> None:
+        """ 回退到第 steps 步，last 为当时的最后一个位置；已经被丢弃的部分无法恢复，只保留 last """
+        if steps < self._start:
+            self._codes = PackedPath()
+            self._jumps.clear()
+            self._origin = last
+            self._start = steps
+        else:
+            self._codes.truncate(steps - self._start)
+            for step in [step for step in self._jumps if step >= steps]:
+                del self._jumps[step]
+        self._last = last
+
+    def __iter__(self) -> Iterator[coordinates]:
+        """ 依次产生保留的各个位置 """
+        first = self.steps - len(self) + 1
+        jumps = self._jumps
+        row, col = self._origin
+        if self._start >= first:
+            yield (row, col)
+        for step, code in enumerate(self._codes.iter_codes(), self._start):
+            if step in jumps:
+                row, col = jumps[step]
+            d_row, d_col = CODE_DELTAS[code]
+            row, col = row + d_row, col + d_col
+            if step >= first - 1:
+                yield (row, col)
+
+    def positions(self) -> List[coordinates]:
+        """ 供渲染器使用的坐标列表 """
+        return list(self)
+
+    def positions_since(self, steps: int, position: coordinates) -> List[coordinates]:
+        """ 第 steps 步之后的各个位置，position 为第 steps 步时的位置；steps 不能早于已经丢弃的部分 """
+        if steps < self._start:
+            raise ValueError("第 steps 步之前的历史已经被丢弃")
+
+        jumps = self._jumps
+        row, col = position
+        positions: List[coordinates] = []
+        for step, code in enumerate(self._codes.iter_codes(steps - self._start), steps):
+            if step in jumps:
+                row, col = jumps[step]
+            d_row, d_col = CODE_DELTAS[code]
+            row, col = row + d_row, col + d_col
+            positions.append((row, col))
+        return positions
+
+    def copy(self) -> "PathHistory":
+        history = PathHistory.__new__(PathHistory)
+        history.cap = self.cap
+        history._codes = self._codes.copy()
+        history._jumps = dict(self._jumps)
+        history._origin = self._origin
+        history._start = self._start
+        history._last = self._last
+        return history
+
+    __copy__ = copy
+
+
+class CellBitmap:
+    """ 每格 1 bit 的格子集合，支持 in / add / discard / 迭代 """
+    __slots__ = ("rows", "cols", "_bits", "_count")
+
+    def __init__(self, rows: int, cols: int) -> None:
+        self.rows = rows
+        self.cols = cols
+        self._bits = bytearray((rows * cols + 7) >> 3)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, cell: coordinates) -> bool:
+        row, col = cell
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return False
+        index = row * self.cols + col
+        return bool(self._bits[index >> 3] >> (index & 7) & 1)
+
+    def add_index(self, index: int) -> bool:
+        """ 按行优先下标加入，返回是否为新加入的格子 """
+        bit = 1 << (index & 7)
+        if self._bits[index >> 3] & bit:
+            return False
+        self._bits[index >> 3] |= bit
+        self._count += 1
+        return True
+
+    def add(self, cell: coordinates) -> bool:
+        return self.add_index(cell[0] * self.cols + cell[1])
+
+    def discard_index(self, index: int) -> None:
+        bit = 1 << (index & 7)
+        if self._bits[index >> 3] & bit:
+            self._bits[index >> 3] &= ~bit & 0xFF
+            self._count -= 1
+
+    def discard(self, cell: coordinates) -> None:
+        self.discard_index(cell[0] * self.cols + cell[1])
+
+    def __iter__(self) -> Iterator[coordinates]:
+        cols = self.cols
+        for byte_index, byte in enumerate(self._bits):
+            if not byte:
+                continue
+            base = byte_index << 3
+            for offset in range(8):
+                if byte >> offset & 1:
+                    yield divmod(base + offset, cols)
+
+    def copy(self) -> "CellBitmap":
+        bitmap = CellBitmap.__new__(CellBitmap)
+        bitmap.rows = self.rows
+        bitmap.cols = self.cols
+        bitmap._bits = bytearray(self._bits)
+        bitmap._count = self._count
+        return bitmap
+
+    __copy__ = copy
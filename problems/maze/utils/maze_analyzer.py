@@ -0,0 +1,152 @@
+import time
+import random
+import argparse
+from array import array
+from typing import Any, Dict, List, Optional, Set, Tuple
+import numpy as np
+from core.core_bases import Problem
+from .codec import walls_to_masks, WALL_BITS
+from .types import coordinates, Direction, Matrix
+
+
+_DOWN, _LEFT, _RIGHT, _UP = (WALL_BITS[name] for name in ("DOWN", "LEFT", "RIGHT", "UP"))
+
+
+def _mask_offsets(cols: int) -> List[Tuple[int, ...]]:
+    """ 掩码 -> 该格子可以走到的相邻格子在行优先数组中的偏移 """
+    offsets = ((_DOWN, cols), (_LEFT, -1), (_RIGHT, 1), (_UP, -cols))
+    return [tuple(offset for bit, offset in offsets if not mask & bit) for mask in range(16)]
+
+
+def _bfs(masks: bytes, cols: int, begin: int, end: int) -> Tuple[int, Optional[int]]:
+    """ 返回 (可达格子数, 起点到终点的最短步数)；终点不可达时步数为 None
+
+    队列和距离都放在 array 中，1600 万格的迷宫也只占用约 130 MB，且不会创建大量 int 对象。
+    """
+    moves = _mask_offsets(cols)
+    distance = array("i", [-1]) * len(masks)
+    distance[begin] = 0
+    queue = array("i", [begin])
+    append = queue.append
+    # 遍历过程中向 array 追加元素，for 循环会一直处理到队列末尾
+    for cell in queue:
+        depth = distance[cell] + 1
+        for offset in moves[masks[cell]]:
+            neighbor = cell + offset
+            if distance[neighbor] < 0:
+                distance[neighbor] = depth
+                append(neighbor)
+
+    return len(queue), (distance[end] if distance[end] >= 0 else None)
+
+
+def analyze_masks(
+    masks: bytes, rows: int, cols: int,
+    begin: Optional[coordinates] = None, end: Optional[coordinates] = None
+) -> Dict[str, Any]:
+    """ 基于每格一个字节的墙壁掩码分析迷宫，时间与格子数成线性关系
+
+    outer_wall: 最外围是否全是墙；symmetric: 相邻格子之间的墙是否两侧一致（asymmetric_walls 为不一致的数量）；
+    connected: 从起点出发能否到达所有格子（按 get_legal_actions 的语义只看当前格子的墙，且不会走出边界）；
+    dead_ends / corridors / junctions: 通路数为 1 / 2 / 3 及以上的格子数；
+    shortest_path: 起点到终点的最短步数，不可达时为 None。
+    """
+    begin = begin or (0, 0)
+    end = end or (rows - 1, cols - 1)
+    grid = np.frombuffer(bytes(masks), dtype=np.uint8, count=rows * cols).reshape(rows, cols)
+
+    outer_wall = bool(
+        (grid[0] & _UP).all() and (grid[-1] & _DOWN).all()
+        and (grid[:, 0] & _LEFT).all() and (grid[:, -1] & _RIGHT).all()
+    )
+    asymmetric = int(
+        np.count_nonzero(((grid[:-1] & _DOWN) > 0) != ((grid[1:] & _UP) > 0))
+        + np.count_nonzero(((grid[:, :-1] & _RIGHT) > 0) != ((grid[:, 1:] & _LEFT) > 0))
+    )
+
+    # 把边界补成墙，BFS 和通路统计都不需要再做越界判断
+    bounded = grid.copy()
+    bounded[0] |= _UP
+    bounded[-1] |= _DOWN
+    bounded[:, 0] |= _LEFT
+    bounded[:, -1] |= _RIGHT
+
+    popcount = np.array([bin(mask).count("1") for mask in range(256)], dtype=np.uint8)
+    degree_counts = np.bincount((4 - popcount[bounded]).ravel(), minlength=5)
+
+    reached, distance = _bfs(
+        bounded.tobytes(), cols, begin[0] * cols + begin[1], end[0] * cols + end[1]
+    )
+
+    return {
+        "rows": rows,
+        "cols": cols,
+        "outer_wall": outer_wall,
+        "symmetric": asymmetric == 0,
+        "asymmetric_walls": asymmetric,
+        "connected": reached == rows * cols,
+        "reachable": reached,
+        "isolated": int(degree_counts[0]),
+        "dead_ends": int(degree_counts[1]),
+        "corridors": int(degree_counts[2]),
+        "junctions": int(degree_counts[3] + degree_counts[4]),
+        "shortest_path": distance,
+    }
+
+
+def analyze_walls(
+    walls: Matrix[Set[Direction]],
+    begin: Optional[coordinates] = None, end: Optional[coordinates] = None
+) -> Dict[str, Any]:
+    return analyze_masks(walls_to_masks(walls), len(walls), len(walls[0]), begin, end)
+
+
+def analyze_problem(problem: Problem) -> Dict[str, Any]:
+    """ 分析一个迷宫问题实例的墙壁，起点终点取自问题本身 """
+    static_data = problem.get_static_render_data()
+    return analyze_walls(static_data["walls"], static_data["begin"], static_data["end"])
+
+
+def check_maze(stats: Dict[str, Any]) -> None:
+    """ 迷宫不满足 generate_walls 的约定（外墙完整、墙壁对称、全部连通）时抛出 ValueError """
+    problems = [
+        name for name, ok in (
+            ("外墙不完整", stats["outer_wall"]),
+            (f"有 {stats['asymmetric_walls']} 处墙壁不对称", stats["symmetric"]),
+            (f"只有 {stats['reachable']}/{stats['rows'] * stats['cols']} 个格子可达", stats["connected"]),
+        ) if not ok
+    ]
+    if problems:
+        raise ValueError("迷宫不合法：" + "；".join(problems))
+
+
+def main() -> None:
+    from .generate_walls import generate_wall_masks_parallel
+
+    parser = argparse.ArgumentParser(description="生成迷宫并检查连通性、墙壁对称性等统计信息")
+    parser.add_argument("--rows", type=int, default=1024)
+    parser.add_argument("--cols", type=int, default=1024)
+    parser.add_argument("--break-rate", type=float, default=0.05)
+    parser.add_argument("--max-size", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    seed = args.seed if args.seed is not None else random.getrandbits(64)
+    masks = generate_wall_masks_parallel(
+        args.rows, args.cols, args.break_rate, args.max_size, seed=seed, workers=args.workers
+    )
+
+    start = time.perf_counter()
+    stats = analyze_masks(masks, args.rows, args.cols)
+    elapsed = time.perf_counter() - start
+
+    print(f"seed={seed}")
+    for key, value in stats.items():
+        print(f"{key}: {value}")
+    print(f"分析耗时 {elapsed:.3f} s")
+    check_maze(stats)
+
+
+if __name__ == "__main__":
+    main()
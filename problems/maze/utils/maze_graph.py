@@ -0,0 +1,164 @@
+import heapq
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+from .codec import WALL_BITS
+from .types import coordinates, Direction, CODE_DELTAS
+
+
+# (相邻节点, 边长, 从本节点出发的第一步方向码)
+Edge = Tuple[int, int, int]
+
+_REVERSE_CODES = tuple(CODE_DELTAS.index((-dx, -dy)) for dx, dy in CODE_DELTAS)
+# 墙壁掩码 -> 4 - 墙的数量，即不考虑死路填充时的通路数
+_DEGREE_TABLE = bytes(4 - bin(mask & 0xF).count("1") for mask in range(256))
+
+
+class MazeGraph:
+    """ 迷宫的收缩图：填掉不含保留格子的死路，再把度为 2 的通道收缩为带权边
+
+    节点是填充后剩下的岔路、端点以及 keep 中的格子（起点、终点等），均以行优先下标表示。
+    边只记录相邻节点、长度与第一步的方向码，需要逐格的动作时由 expand 沿通道重新走一遍，
+    因此图的大小只与岔路数量有关。
+    """
+    def __init__(self, masks: bytes, rows: int, cols: int, keep: Iterable[coordinates]) -> None:
+        self.rows = rows
+        self.cols = cols
+        self._offsets: Tuple[int, ...] = tuple(dx * cols + dy for dx, dy in CODE_DELTAS)
+        self.masks = self._bounded(masks)
+        self.keep = {row * cols + col for row, col in keep}
+        self.filled = bytearray(rows * cols)
+        self.filled_count = 0
+        self._fill_dead_ends()
+        self.adjacency: Dict[int, List[Edge]] = {}
+        self._contract()
+
+    def _bounded(self, masks: bytes) -> bytearray:
+        """ 把迷宫边界补成墙，之后走通道时不需要做越界判断 """
+        rows, cols = self.rows, self.cols
+        bounded = bytearray(masks)
+        for col in range(cols):
+            bounded[col] |= WALL_BITS["UP"]
+            bounded[(rows - 1) * cols + col] |= WALL_BITS["DOWN"]
+        for row in range(rows):
+            bounded[row * cols] |= WALL_BITS["LEFT"]
+            bounded[row * cols + cols - 1] |= WALL_BITS["RIGHT"]
+        return bounded
+
+    def _open_codes(self, cell: int) -> Iterable[int]:
+        mask = self.masks[cell]
+        return (code for code in range(4) if not mask >> code & 1)
+
+    def _fill_dead_ends(self) -> None:
+        """ 反复填掉通路数不超过 1 的格子，保留的格子不填 """
+        masks, offsets, filled, keep = self.masks, self._offsets, self.filled, self.keep
+        degree = bytearray(masks.translate(_DEGREE_TABLE))
+        stack = array("i", (cell for cell, value in enumerate(degree) if value <= 1 and cell not in keep))
+        while stack:
+            cell = stack.pop()
+            if filled[cell]:
+                continue
+            filled[cell] = 1
+            self.filled_count += 1
+            for code in self._open_codes(cell):
+                neighbor = cell + offsets[code]
+                if not filled[neighbor]:
+                    degree[neighbor] -= 1
+                    if degree[neighbor] <= 1 and neighbor not in keep:
+                        stack.append(neighbor)
+        self._degree = degree
+
+    def _is_node(self, cell: int) -> bool:
+        return self._degree[cell] != 2 or cell in self.keep
+
+    def _walk(self, cell: int, code: int, codes: Optional[List[int]] = None) -> Tuple[int, int]:
+        """ 从节点 cell 沿 code 方向走到下一个节点，返回 (节点, 步数)；给出 codes 时记录每一步的方向码 """
+        masks, offsets, filled = self.masks, self._offsets, self.filled
+        steps = 0
+        while True:
+            cell += offsets[code]
+            steps += 1
+            if codes is not None:
+                codes.append(code)
+            if self._is_node(cell):
+                return cell, steps
+            came_from = _REVERSE_CODES[code]
+            mask = masks[cell]
+            for next_code in range(4):
+                if next_code != came_from and not mask >> next_code & 1 and not filled[cell + offsets[next_code]]:
+                    code = next_code
+                    break
+
+    def _contract(self) -> None:
+        masks, offsets, filled = self.masks, self._offsets, self.filled
+        nodes = [cell for cell in range(len(masks)) if not filled[cell] and self._is_node(cell)]
+        for cell in nodes:
+            edges = self.adjacency[cell] = []
+            for code in self._open_codes(cell):
+                if filled[cell + offsets[code]]:
+                    continue
+                neighbor, steps = self._walk(cell, code)
+                if neighbor != cell:
+                    edges.append((neighbor, steps, code))
+
+    @property
+    def node_count(self) -> int:
+        return len(self.adjacency)
+
+    @property
+    def edge_count(self) -> int:
+        return sum(len(edges) for edges in self.adjacency.values()) // 2
+
+    def to_cell(self, location: coordinates) -> int:
+        return location[0] * self.cols + location[1]
+
+    def expand(self, cell: int, code: int) -> List[Direction]:
+        """ 把从节点 cell 出发、第一步为 code 的边还原为逐格的动作 """
+        codes: List[int] = []
+        self._walk(cell, code, codes)
+        return [Direction.from_code(code) for code in codes]
+
+    def shortest_path(self, begin: coordinates, end: coordinates) -> Optional[List[Direction]]:
+        """ 在收缩图上做 A*，返回逐格的动作序列；begin 与 end 必须是构建时保留的格子 """
+        source, target = self.to_cell(begin), self.to_cell(end)
+        if source not in self.adjacency or target not in self.adjacency:
+            raise ValueError("begin 和 end 必须是构建收缩图时保留的格子")
+
+        def heuristic(cell: int) -> int:
+            row, col = divmod(cell, self.cols)
+            return abs(row - end[0]) + abs(col - end[1])
+
+        g: Dict[int, int] = {source: 0}
+        came_from: Dict[int, Tuple[int, int]] = {}
+        queue: List[Tuple[int, int, int]] = [(heuristic(source), 0, source)]
+        while queue:
+            _, cost, cell = heapq.heappop(queue)
+            if cell == target:
+                break
+            if cost > g[cell]:
+                continue
+            for neighbor, steps, code in self.adjacency[cell]:
+                new_cost = cost + steps
+                if new_cost < g.get(neighbor, new_cost + 1):
+                    g[neighbor] = new_cost
+                    came_from[neighbor] = (cell, code)
+                    heapq.heappush(queue, (new_cost + heuristic(neighbor), new_cost, neighbor))
+        else:
+            return None
+
+        edges: List[Tuple[int, int]] = []
+        cell = target
+        while cell != source:
+            cell, code = came_from[cell]
+            edges.append((cell, code))
+
+        actions: List[Direction] = []
+        for cell, code in reversed(edges):
+            actions.extend(self.expand(cell, code))
+        return actions
+
+
+def build_maze_graph(
+    masks: bytes, rows: int, cols: int, keep: Iterable[coordinates]
+) -> MazeGraph:
+    """ 基于每格一个字节的墙壁掩码构建收缩图，keep 中的格子（至少包括起点和终点）一定是节点 """
+    return MazeGraph(masks, rows, cols, keep)
@@ -0,0 +1,117 @@
+import random
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Deque, Dict, Iterable, Iterator, Optional, Set, Tuple
+from ..maze_problem import MazeProblem
+from .codec import masks_to_walls
+from .types import Direction, Matrix
+from .generate_walls import generate_wall_masks_parallel
+
+
+# (行数, 列数, 打通概率, max_size, 种子)
+Task = Tuple[int, int, float, int, int]
+
+
+def pool_seed(base_seed: int, index: int) -> int:
+    """ 第 index 个迷宫的种子，只取决于 (base_seed, index)，与进程数和取用时机无关 """
+    return random.Random(f"{base_seed}:pool:{index}").getrandbits(64)
+
+
+def _generate(task: Task) -> bytes:
+    rows, cols, break_rate, max_size, seed = task
+    return bytes(generate_wall_masks_parallel(rows, cols, break_rate, max_size, seed=seed, workers=1))
+
+
+class MazePool:
+    """ 在后台进程中预先生成迷宫，按编号顺序提供给连续的多局运行
+
+    最多同时有 size 个迷宫在生成或等待取用，取走一个就补充下一个编号，因此生成与智能体的运行重叠。
+    第 index 个迷宫使用 pool_seed(seed, index) 生成，与 MazeProblem(seed=pool_seed(seed, index)) 的墙壁相同。
+    给出 configs 时改为依次生成其中的每个迷宫（各自的参数与 seed），与 MazeProblem.from_config(**config)
+    的墙壁相同，取完为止；参数扫描用它预先生成后面的单元格要用的迷宫。
+    工作进程只传回每格一个字节的掩码，墙壁矩阵在取用时才还原。
+    每个迷宫可以连续提供 repeat 次（例如让多个智能体跑同一个迷宫），之后几次直接对同一个实例调用
+    init_problem_state，不重新构建。
+    """
+    def __init__(
+        self, config: Optional[Dict[str, Any]] = None, size: int = 4, workers: int = 1,
+        seed: int = 0, start: int = 0, repeat: int = 1, configs: Optional[Iterable[Dict[str, Any]]] = None
+    ) -> None:
+        if size < 1 or repeat < 1:
+            raise ValueError("size 和 repeat 必须是正整数")
+
+        self.config: Dict[str, Any] = dict(config or {})
+        self.size = size
+        self.seed = seed
+        self.repeat = repeat
+        self._configs: Optional[Iterator[Dict[str, Any]]] = iter(configs) if configs is not None else None
+        self._next_index = start
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+        self._pending: Deque[Tuple[int, Dict[str, Any], "Future[bytes]"]] = deque()
+        self._current: Optional[MazeProblem] = None
+        self._served = 0
+        self.index: Optional[int] = None
+        for _ in range(size):
+            self._submit()
+
+    def _next_config(self) -> Optional[Dict[str, Any]]:
+        if self._configs is None:
+            return {**self.config, "seed": pool_seed(self.seed, self._next_index)}
+        config = next(self._configs, None)
+        if config is None:
+            return None
+        if config.get("seed") is None:
+            raise ValueError("configs 中的每个迷宫都需要指定 seed")
+        return {**self.config, **config}
+
+    def _submit(self) -> None:
+        config = self._next_config()
+        if config is None:
+            return
+
+        task: Task = (
+            config.get("rows", 36), config.get("cols", 36), config.get("break_rate", 0.05),
+            config.get("max_size", 40), config["seed"]
+        )
+        self._pending.append((self._next_index, config, self._executor.submit(_generate, task)))
+        self._next_index += 1
+
+    def get_walls(self) -> Matrix[Set[Direction]]:
+        """ 只取下一个迷宫的墙壁，不构建 MazeProblem；对应的迷宫还没生成完时阻塞等待，configs 取完时抛出 IndexError """
+        if not self._pending:
+            raise IndexError("MazePool 中的迷宫已经取完")
+
+        index, config, future = self._pending.popleft()
+        masks = future.result()
+        self._submit()
+
+        self.index = index
+        return masks_to_walls(masks, config.get("rows", 36), config.get("cols", 36))
+
+    def get(self) -> MazeProblem:
+        """ 返回下一局的 MazeProblem；对应的迷宫还没生成完时阻塞等待 """
+        if self._current is not None and self._served < self.repeat:
+            self._served += 1
+            self._current.init_problem_state()
+            return self._current
+
+        config = self._pending[0][1] if self._pending else {}
+        walls = self.get_walls()
+        self._current = MazeProblem.from_config(**{**config, "walls": walls})
+        self._served = 1
+        return self._current
+
+    def __iter__(self) -> Iterator[MazeProblem]:
+        while self._pending or (self._current is not None and self._served < self.repeat):
+            yield self.get()
+
+    def close(self) -> None:
+        """ 取消尚未开始的生成任务并关闭进程池 """
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._pending.clear()
+
+    def __enter__(self) -> "MazePool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -1,6 +1,6 @@
 import pygame
-from core.core_bases import Renderer
-from typing import Any, Dict, Set, Tuple
+from core.core_bases import Problem, Renderer
+from typing import Any, Dict, Optional, Set, Tuple
 from core.core_registers import RendererRegistry
 from .types import Matrix, coordinates, Direction
 
@@ -10,6 +10,21 @@ draw_rect = pygame.draw.rect
 
 @RendererRegistry.register("MazeRenderer")
 class MazeRenderer(Renderer):
+    @classmethod
+    def create_offscreen(cls, problem: Problem, **config) -> "MazeRenderer":
+        """ 创建绘制到内存 Surface 上的渲染器，不需要打开窗口 """
+        cell_size = config.get("cell_size", 16)
+        wall_thickness = config.get("wall_thickness", 1)
+        offset = config.get("offset", 30)
+        static_data = problem.get_static_render_data()
+
+        tot_size = cell_size + wall_thickness
+        screen = pygame.Surface((
+            static_data["cols"] * tot_size + wall_thickness + 2 * offset,
+            static_data["rows"] * tot_size + wall_thickness + 2 * offset
+        ))
+        return cls(screen, problem, **{**config, "offscreen": True})
+
     def init_renderer(self, config: Dict[str, Any] = None) -> None:
         """  初始化渲染器 """
         pygame.font.init()
@@ -28,6 +43,7 @@ class MazeRenderer(Renderer):
         })
         self.font_size = config.get("font_size", 24)
         self.render_mask = config.get("render_mask", True)
+        self.offscreen = config.get("offscreen", False)
 
         self.static_data_dict: Dict[str, Any] = self.problem.get_static_render_data()
         self.dynamic_data_dict: Dict[str, Any] = self.problem.get_dynamic_render_data()
@@ -41,20 +57,25 @@ class MazeRenderer(Renderer):
         ), pygame.SRCALPHA)
         self.render()
 
-    def render(self) -> None:
-        """ 渲染迷宫 """
+    def render(self, dynamic_data: Optional[Dict[str, Any]] = None) -> None:
+        """ 渲染迷宫；dynamic_data 为其他线程发布的状态快照时，不再向问题查询 """
         self.screen.fill(self.color_config["background"])
         self._draw_walls()
         self._draw_task()
 
-        self.dynamic_data_dict = self.problem.get_dynamic_render_data()
+        self.dynamic_data_dict = dynamic_data or self.problem.get_dynamic_render_data()
         self._draw_agent()
         self._draw_counter()
         self._draw_history_path()
         if self.render_mask:
             self._draw_mask()
 
-        pygame.display.flip()
+        if not self.offscreen:
+            pygame.display.flip()
+
+    def grab_frame(self) -> Any:
+        """ 以 NumPy 数组 (宽, 高, 3) 的形式复制当前画面 """
+        return pygame.surfarray.array3d(self.screen)
 
     def _draw_counter(self) -> None:
         font = pygame.font.Font(None, self.font_size)
@@ -0,0 +1,165 @@
+import argparse
+from typing import Any, Dict, Iterable, List, Set, Tuple
+from .render_stream import window
+from .trajectory import Trajectory, load_trajectories
+from .types import coordinates
+
+
+class MazeReplay:
+    """ 回放记录好的轨迹，提供与 MazeProblem 相同的渲染数据接口，可直接交给 MazeRenderer
+
+    渲染用的历史路径与可见集合在相邻两帧之间增量更新，向前播放时每帧的代价只与新走的步数有关；
+    只有向后定位时才从头重建。get_dynamic_render_data 返回的列表与集合会被之后的更新原地修改，
+    需要跨帧保留时应先复制（game.take_snapshot 会复制）。
+    """
+    def __init__(self, trajectory: Trajectory) -> None:
+        self.trajectory = trajectory
+        self.step = 0
+        self.location: coordinates = trajectory.begin
+        # 已解码的路径前缀，向前播放时增量扩展，向后定位时直接截取
+        self._path: List[coordinates] = [trajectory.begin]
+        # 上一次渲染时第 0 ~ _history_step 步的路径，以及它们（连同起点终点）radius_history 以内的格子
+        self._history: List[coordinates] = []
+        self._history_step = -1
+        self._visible: Set[coordinates] = set()
+        # 当前位置 radius_cur 以内、只因当前位置才可见的格子，换帧时先移除
+        self._current_only: List[coordinates] = []
+
+    @property
+    def total_steps(self) -> int:
+        return self.trajectory.steps
+
+    def seek(self, step: int) -> coordinates:
+        """ 定位到第 step 步，只需从最近的关键帧解码 """
+        self.step = max(0, min(step, self.total_steps))
+        if self.step < len(self._path):
+            self.location = self._path[self.step]
+        else:
+            self.location = self.trajectory.position_at(self.step)
+        return self.location
+
+    def advance(self, steps: int = 1) -> coordinates:
+        return self.seek(self.step + steps)
+
+    def get_state(self) -> coordinates:
+        return self.location
+
+    def _decode_until(self, step: int) -> None:
+        if len(self._path) <= step:
+            start = len(self._path) - 1
+            self._path.extend(self.trajectory.iter_positions(start, step, self._path[-1]))
+
+    def _mark_visited(self, cells: Iterable[coordinates]) -> None:
+        trajectory, visible = self.trajectory, self._visible
+        for cell in cells:
+            visible.update(window(cell, trajectory.radius_history, trajectory.rows, trajectory.cols))
+
+    def _update_visible(self) -> None:
+        """ 把历史路径与可见集合推进到当前步；向后定位时从头重建 """
+        trajectory = self.trajectory
+        for cell in self._current_only:
+            self._visible.discard(cell)
+
+        if self.step < self._history_step:
+            self._history.clear()
+            self._visible.clear()
+            self._history_step = -1
+        if self._history_step < 0:
+            self._mark_visited((trajectory.begin, trajectory.end))
+
+        self._decode_until(self.step)
+        new_cells = self._path[self._history_step + 1:self.step + 1]
+        self._history.extend(new_cells)
+        self._mark_visited(new_cells)
+        self._history_step = self.step
+
+        self._current_only = [
+            cell for cell in window(self.location, trajectory.radius_cur, trajectory.rows, trajectory.cols)
+            if cell not in self._visible
+        ]
+        self._visible.update(self._current_only)
+
+    def get_static_render_data(self) -> Dict[str, Any]:
+        return {
+            "walls": self.trajectory.walls,
+            "begin": self.trajectory.begin,
+            "end": self.trajectory.end,
+            "rows": self.trajectory.rows,
+            "cols": self.trajectory.cols,
+        }
+
+    def get_dynamic_render_data(self) -> Dict[str, Any]:
+        self._update_visible()
+        return {
+            "history_path": self._history,
+            "visible": self._visible,
+            "count": self.step,
+            "state": self.location
+        }
+
+
+def play_replay(
+    replay: MazeReplay, speed: float = 10.0, fps: int = 50,
+    screen_size: Tuple[int, int] = (800, 800), **renderer_config
+) -> None:
+    """ 以每秒 speed 步的速度播放
+
+    空格暂停，左右方向键后退 / 前进一秒，上下方向键把速度加倍 / 减半，Home / End 跳到开头 / 结尾。
+    """
+    import pygame
+    from .maze_renderer import MazeRenderer
+
+    screen = pygame.display.set_mode(screen_size)
+    renderer = MazeRenderer(screen, replay, **renderer_config)
+    clock = pygame.time.Clock()
+
+    position = float(replay.step)
+    paused = False
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    paused = not paused
+                elif event.key == pygame.K_RIGHT:
+                    position += max(1.0, speed)
+                elif event.key == pygame.K_LEFT:
+                    position -= max(1.0, speed)
+                elif event.key == pygame.K_UP:
+                    speed *= 2
+                elif event.key == pygame.K_DOWN:
+                    speed /= 2
+                elif event.key == pygame.K_HOME:
+                    position = 0.0
+                elif event.key == pygame.K_END:
+                    position = float(replay.total_steps)
+
+        if not paused:
+            position += speed / fps
+        position = max(0.0, min(position, float(replay.total_steps)))
+
+        replay.seek(int(position))
+        renderer.render()
+        clock.tick(fps)
+
+    pygame.quit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="回放迷宫轨迹文件")
+    parser.add_argument("path", help="TrajectoryRecorder 生成的轨迹文件")
+    parser.add_argument("--episode", type=int, default=0, help="回合编号")
+    parser.add_argument("--speed", type=float, default=10.0, help="每秒播放的步数")
+    parser.add_argument("--fps", type=int, default=50, help="帧率")
+    parser.add_argument("--start", type=int, default=0, help="从第几步开始播放")
+    args = parser.parse_args()
+
+    replay = MazeReplay(load_trajectories(args.path)[args.episode])
+    replay.seek(args.start)
+    play_replay(replay, speed=args.speed, fps=args.fps)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import pygame
+from typing import Any, Dict, List, Tuple
+from core.core_registers import RendererRegistry
+from .maze_renderer import MazeRenderer
+
+
+@RendererRegistry.register("MultiMazeRenderer")
+class MultiMazeRenderer(MazeRenderer):
+    """ 多智能体迷宫渲染器：所有智能体共用一张预先绘制好的精灵，通过一次 blits 调用绘制
+
+    遮罩表示覆盖情况：没有任何智能体到过的格子被遮住。
+    """
+    def init_renderer(self, config: Dict[str, Any] = None) -> None:
+        self.sprite: pygame.Surface = None
+        super().init_renderer(config)
+
+    def _get_sprite(self) -> pygame.Surface:
+        if self.sprite is None:
+            self.sprite = pygame.Surface((self.cell_size, self.cell_size), pygame.SRCALPHA)
+            pygame.draw.circle(
+                self.sprite, self.color_config["agent"],
+                (self.cell_size // 2, self.cell_size // 2), self.cell_size // 3
+            )
+        return self.sprite
+
+    def _draw_agent(self) -> None:
+        """ 一次性绘制所有智能体，开销与智能体数量成线性关系 """
+        sprite = self._get_sprite()
+        tot_size = self.cell_size + self.wall_thickness
+        origin = self.offset + self.wall_thickness
+        blits: List[Tuple[pygame.Surface, Tuple[int, int]]] = [
+            (sprite, (col * tot_size + origin, row * tot_size + origin))
+            for row, col in self.dynamic_data_dict["states"]
+        ]
+        self.screen.blits(blits, doreturn=False)
+
+    def _draw_counter(self) -> None:
+        font = pygame.font.Font(None, self.font_size)
+        covered = self.dynamic_data_dict["covered"] / (self.rows * self.cols)
+        text = font.render(
+            f"Tick: {self.dynamic_data_dict['count']}  Covered: {covered:.1%}",
+            True, self.color_config["text"]
+        )
+        self.screen.blit(text, (self.offset / 2, self.offset / 2))
+
+    def _draw_history_path(self) -> None:
+        """ 多智能体不记录各自的历史路径，覆盖情况由遮罩表示 """
+        pass
+
+    def _draw_mask(self) -> None:
+        self.mask_surface.fill((0, 0, 0, 0))
+        coverage = self.dynamic_data_dict["coverage"]
+        cols = self.cols
+        for cell in range(self.rows * cols):
+            if not coverage[cell]:
+                self._draw_mask_at(*divmod(cell, cols))
+
+        self.screen.blit(self.mask_surface, (self.offset, self.offset))
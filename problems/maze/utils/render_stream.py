@@ -0,0 +1,135 @@
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Set
+from .history import CellBitmap, PathHistory
+from .types import coordinates
+
+if TYPE_CHECKING:
+    from ..maze_problem import MazeProblem
+
+
+def window(location: coordinates, radius: int, rows: int, cols: int) -> Iterator[coordinates]:
+    """ location 周围 radius 以内、位于迷宫内的格子 """
+    row, col = location
+    for d_row in range(max(-radius, -row), min(radius, rows - 1 - row) + 1):
+        for d_col in range(max(-radius, -col), min(radius, cols - 1 - col) + 1):
+            yield (row + d_row, col + d_col)
+
+
+class MazeRenderView:
+    """ 渲染一侧：把 MazeRenderStream 产生的增量累积成 MazeRenderer 需要的动态渲染数据
+
+    data() 返回的列表与集合会被之后的 apply 原地修改，只能在两次 apply 之间使用。
+    """
+    def __init__(self) -> None:
+        self.history: List[coordinates] = []
+        self.visible: Set[coordinates] = set()
+        # 只因当前位置才可见的格子，下一次 apply 时先移除
+        self._current_only: List[coordinates] = []
+        self.count = 0
+        self.state: Optional[coordinates] = None
+
+    def apply(self, delta: Dict[str, Any]) -> None:
+        visible = self.visible
+        for cell in self._current_only:
+            visible.discard(cell)
+
+        if delta["history_reset"]:
+            self.history.clear()
+        self.history.extend(delta["history"])
+        if delta["visible_reset"]:
+            visible.clear()
+        visible.update(delta["visible"])
+        self._current_only = [cell for cell in delta["current"] if cell not in visible]
+        visible.update(self._current_only)
+
+        self.count = delta["count"]
+        self.state = delta["state"]
+
+    def data(self) -> Dict[str, Any]:
+        return {
+            "history_path": self.history,
+            "visible": self.visible,
+            "count": self.count,
+            "state": self.state,
+        }
+
+
+class MazeRenderStream:
+    """ 模拟一侧：每次 delta() 只返回上一次之后新走的路径与新变得可见的格子
+
+    历史路径与走过的格子只会追加，因此只需记住上一次读到的步数与日志长度；
+    问题被 restore 回退、重新初始化或历史路径超出 history_cap 时，对应的部分整体重发。
+    delta 中只有新建的列表与不可变的坐标，可以直接交给其他线程。
+    """
+    def __init__(self, problem: "MazeProblem") -> None:
+        self.problem = problem
+        self._history: Optional[PathHistory] = None
+        self._history_steps = 0
+        self._history_last: Optional[coordinates] = None
+        self._visible_log: Optional[Any] = None
+        self._visible_index = 0
+        self._epoch = -1
+        # 已经发出的历史可见格子（不含只因当前位置可见的格子）
+        self._sent: Optional[CellBitmap] = None
+
+    def create_view(self) -> MazeRenderView:
+        return MazeRenderView()
+
+    def _history_delta(self) -> Dict[str, Any]:
+        history = self.problem.history_path
+        reset = (
+            history is not self._history or self._epoch != self.problem._render_epoch
+            or history.cap is not None or history.steps < self._history_steps
+        )
+        positions = (
+            history.positions() if reset
+            else history.positions_since(self._history_steps, self._history_last)
+        )
+        self._history = history
+        self._history_steps = history.steps
+        self._history_last = history.last
+        return {"history_reset": reset, "history": positions}
+
+    def _visited_windows(self, cells: Iterable[coordinates]) -> List[coordinates]:
+        """ 走过的格子及其 radius_history 以内（或视线可达）的格子中尚未发出的部分 """
+        problem, sent = self.problem, self._sent
+        rows, cols = len(problem.walls), len(problem.walls[0])
+        table = problem.get_sight_table(problem.radius_history) if problem.line_of_sight else None
+        new_cells: List[coordinates] = []
+        for cell in cells:
+            neighbors = (
+                table.visible(cell) if table is not None
+                else window(cell, problem.radius_history, rows, cols)
+            )
+            for neighbor in neighbors:
+                if sent.add(neighbor):
+                    new_cells.append(neighbor)
+        return new_cells
+
+    def _visible_delta(self) -> Dict[str, Any]:
+        problem = self.problem
+        log = problem._visible_log
+        reset = (
+            log is not self._visible_log or self._epoch != problem._render_epoch
+            or len(log) < self._visible_index
+        )
+        if reset:
+            self._sent = CellBitmap(problem.visible.rows, problem.visible.cols)
+            visited: Iterable[coordinates] = problem.visible
+        else:
+            cols = problem.visible.cols
+            visited = [divmod(index, cols) for index in log[self._visible_index:]]
+        cells = self._visited_windows(visited)
+        self._visible_log = log
+        self._visible_index = len(log)
+
+        if problem.line_of_sight:
+            current = problem.get_sight_table(problem.radius_cur).visible(problem.location)
+        else:
+            current = list(window(problem.location, problem.radius_cur, len(problem.walls), len(problem.walls[0])))
+        return {"visible_reset": reset, "visible": cells, "current": current}
+
+    def delta(self) -> Dict[str, Any]:
+        delta = {**self._history_delta(), **self._visible_delta()}
+        self._epoch = self.problem._render_epoch
+        delta.update(count=self.problem.count, state=self.problem.location)
+        return delta
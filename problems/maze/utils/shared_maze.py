@@ -0,0 +1,133 @@
+import sys
+import atexit
+from multiprocessing import shared_memory
+from typing import Any, Dict, Optional, Set, Tuple
+from core.core_bases import Problem
+from .codec import walls_to_masks, WALL_BITS
+from .types import coordinates, Direction
+
+
+# (共享内存名称, rows, cols, begin, end)，可以直接发送给子进程
+MazeDescriptor = Tuple[str, int, int, coordinates, coordinates]
+
+# 掩码 -> 该格子允许的方向
+_LEGAL_BY_MASK = [
+    frozenset(Direction(name) for name, bit in WALL_BITS.items() if not mask & bit)
+    for mask in range(16)
+]
+
+
+class SharedMaze:
+    """ 把墙壁编码为每格一个字节的掩码放入共享内存，多个子进程读取同一份数据而无需 pickle walls """
+    def __init__(self, problem: Problem) -> None:
+        static_data = problem.get_static_render_data()
+        masks = walls_to_masks(static_data["walls"])
+
+        self.rows: int = static_data["rows"]
+        self.cols: int = static_data["cols"]
+        self.begin: coordinates = static_data["begin"]
+        self.end: coordinates = static_data["end"]
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, len(masks)))
+        self.shm.buf[:len(masks)] = masks
+        self._closed = False
+
+    def descriptor(self) -> MazeDescriptor:
+        return (self.shm.name, self.rows, self.cols, self.begin, self.end)
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self.shm.close()
+            self.shm.unlink()
+
+
+_shared_mazes: Dict[int, Tuple[Problem, SharedMaze]] = {}
+
+
+def get_shared_maze(problem: Problem) -> SharedMaze:
+    """ 同一个问题实例只创建一份共享内存，进程退出时统一释放 """
+    entry = _shared_mazes.get(id(problem))
+    if entry is None or entry[0] is not problem:
+        entry = (problem, SharedMaze(problem))
+        _shared_mazes[id(problem)] = entry
+    return entry[1]
+
+
+def release_shared_mazes() -> None:
+    for _, shared_maze in _shared_mazes.values():
+        shared_maze.close()
+    _shared_mazes.clear()
+
+
+atexit.register(release_shared_mazes)
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """ 子进程只读取共享内存，由创建它的父进程负责回收 """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # 更早的版本中，multiprocessing 启动的子进程与父进程共用 resource tracker，重复登记不会导致提前回收
+    return shared_memory.SharedMemory(name=name)
+
+
+class SharedMazeView(Problem):
+    """ 子进程中基于共享墙壁掩码的迷宫视图，只维护当前位置和步数 """
+    def __init__(self, descriptor: MazeDescriptor) -> None:
+        name, self.rows, self.cols, self.begin, self.end = descriptor
+        self._shm = _attach(name)
+        self._masks = self._shm.buf
+        self.location: coordinates = self.begin
+        self.count = 0
+
+    @classmethod
+    def from_config(cls, **config) -> "SharedMazeView":
+        return cls(config["descriptor"])
+
+    def close(self) -> None:
+        self._masks.release()
+        self._shm.close()
+
+    def init_problem_state(self) -> None:
+        self.location = self.begin
+        self.count = 0
+
+    def get_start_state(self) -> coordinates:
+        return self.begin
+
+    def get_end_state(self) -> coordinates:
+        return self.end
+
+    def get_end_info(self) -> int:
+        return self.count
+
+    def get_state(self) -> coordinates:
+        return self.location
+
+    def set_state(self, state: coordinates) -> None:
+        self.location = state
+
+    def is_end_state(self, cur_state: coordinates) -> bool:
+        return cur_state == self.end
+
+    def get_legal_actions(self, state: coordinates) -> Set[Direction]:
+        return set(_LEGAL_BY_MASK[self._masks[state[0] * self.cols + state[1]]])
+
+    def apply_action_to_state(self, state: coordinates, action: Optional[Direction]) -> coordinates:
+        if action not in _LEGAL_BY_MASK[self._masks[state[0] * self.cols + state[1]]]:
+            return state
+
+        dx, dy = action.delta()
+        return (state[0] + dx, state[1] + dy)
+
+    def apply_action(self, action: Optional[Direction]) -> coordinates:
+        new_location = self.apply_action_to_state(self.location, action)
+        if new_location != self.location:
+            self.location = new_location
+            self.count += 1
+        return new_location
+
+    def get_static_render_data(self) -> Dict[str, Any]:
+        return {"begin": self.begin, "end": self.end, "rows": self.rows, "cols": self.cols}
+
+    def get_dynamic_render_data(self) -> Dict[str, Any]:
+        return {"count": self.count, "state": self.location}
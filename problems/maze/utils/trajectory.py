@@ -0,0 +1,198 @@
+import sys
+import struct
+from array import array
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Set, Tuple
+from .codec import PackedPath, walls_to_masks, masks_to_walls, pack_nibbles, unpack_nibbles
+from .types import Matrix, coordinates, Direction, CODE_DELTAS
+
+
+MAGIC = b"MZTR"
+VERSION = 1
+
+# magic, version, keyframe_interval, rows, cols, begin(2), end(2),
+# radius_history, radius_cur, steps, keyframe_count, jump_count
+_HEADER = struct.Struct("<4sHIIIIIIIHHQII")
+
+_DELTA_CODES: Dict[coordinates, int] = {delta: code for code, delta in enumerate(CODE_DELTAS)}
+
+
+def _to_little_endian(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(data: bytes) -> array:
+    values = array("I")
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+class TrajectoryRecorder:
+    """ 把每一回合写成：头部 + 墙壁掩码 + 关键帧 + 跳转表 + 每步一个 2 bit 方向码
+
+    第 k 个关键帧是第 k * keyframe_interval 步之后的位置，因此定位任意一步最多只需
+    解码 keyframe_interval 个方向码。智能体通过 set_state 直接移动（如 NormalDFSAgent）
+    时，该步的起点与上一步终点不相邻，这种情况记录在稀疏的跳转表中。
+    """
+    def __init__(self, path: str, keyframe_interval: int = 4096) -> None:
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval 必须是正整数")
+
+        self.file: BinaryIO = open(path, "wb")
+        self.keyframe_interval = keyframe_interval
+        self._static: Optional[Dict[str, Any]] = None
+
+    def __enter__(self) -> "TrajectoryRecorder":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def begin_episode(self, problem) -> None:
+        """ 开始记录新的一回合，未结束的上一回合会先写入文件 """
+        if self._static is not None:
+            self.end_episode()
+
+        self._static = problem.get_static_render_data()
+        self._radius_history: int = getattr(problem, "radius_history", 1)
+        self._radius_cur: int = getattr(problem, "radius_cur", 2)
+        self._path = PackedPath()
+        self._keyframes = array("I", problem.get_state())
+        self._jumps = array("I")
+        self._last: coordinates = problem.get_state()
+
+    def record_move(self, from_state: coordinates, to_state: coordinates) -> None:
+        """ 记录一次成功的移动 """
+        step = len(self._path)
+        if from_state != self._last:
+            self._jumps.extend((step, from_state[0], from_state[1]))
+
+        self._path.append(_DELTA_CODES[(to_state[0] - from_state[0], to_state[1] - from_state[1])])
+        self._last = to_state
+        if (step + 1) % self.keyframe_interval == 0:
+            self._keyframes.extend(to_state)
+
+    def end_episode(self) -> None:
+        if self._static is None:
+            return
+
+        static = self._static
+        header = _HEADER.pack(
+            MAGIC, VERSION, self.keyframe_interval,
+            static["rows"], static["cols"], *static["begin"], *static["end"],
+            self._radius_history, self._radius_cur,
+            len(self._path), len(self._keyframes) // 2, len(self._jumps) // 3
+        )
+        self.file.write(header)
+        self.file.write(pack_nibbles(walls_to_masks(static["walls"])))
+        self.file.write(_to_little_endian(self._keyframes))
+        self.file.write(_to_little_endian(self._jumps))
+        self.file.write(self._path.to_bytes())
+        self.file.flush()
+        self._static = None
+
+    def close(self) -> None:
+        self.end_episode()
+        self.file.close()
+
+
+class Trajectory:
+    """ 一回合的记录，可以在 O(keyframe_interval) 时间内定位到任意一步 """
+    def __init__(
+        self, keyframe_interval: int, rows: int, cols: int,
+        begin: coordinates, end: coordinates, radius_history: int, radius_cur: int,
+        wall_masks: bytes, keyframes: array, jumps: array, path: PackedPath
+    ) -> None:
+        self.keyframe_interval = keyframe_interval
+        self.rows = rows
+        self.cols = cols
+        self.begin = begin
+        self.end = end
+        self.radius_history = radius_history
+        self.radius_cur = radius_cur
+        self.path = path
+        self._wall_masks = wall_masks
+        self._walls: Optional[Matrix[Set[Direction]]] = None
+        self._keyframes = keyframes
+        self._jumps: Dict[int, coordinates] = {
+            jumps[i]: (jumps[i + 1], jumps[i + 2]) for i in range(0, len(jumps), 3)
+        }
+
+    @property
+    def steps(self) -> int:
+        return len(self.path)
+
+    @property
+    def walls(self) -> Matrix[Set[Direction]]:
+        if self._walls is None:
+            self._walls = masks_to_walls(self._wall_masks, self.rows, self.cols)
+        return self._walls
+
+    def position_at(self, step: int) -> coordinates:
+        """ 第 step 步之后的位置（第 0 步为起点） """
+        if not 0 <= step <= self.steps:
+            raise IndexError(step)
+
+        keyframe = step // self.keyframe_interval
+        location = (self._keyframes[2 * keyframe], self._keyframes[2 * keyframe + 1])
+        for location in self.iter_positions(keyframe * self.keyframe_interval, step, location):
+            pass
+        return location
+
+    def iter_positions(self, start: int, stop: int, location: coordinates) -> Iterator[coordinates]:
+        """ 已知第 start 步之后位于 location，依次产生第 start + 1 ~ stop 步之后的位置 """
+        jumps = self._jumps
+        row, col = location
+        for step, code in enumerate(self.path.iter_codes(start, stop), start):
+            if step in jumps:
+                row, col = jumps[step]
+            d_row, d_col = CODE_DELTAS[code]
+            row, col = row + d_row, col + d_col
+            yield (row, col)
+
+
+def _read_episode(data: memoryview, offset: int) -> Tuple[Trajectory, int]:
+    (
+        magic, version, keyframe_interval, rows, cols, begin_row, begin_col, end_row, end_col,
+        radius_history, radius_cur, steps, keyframe_count, jump_count
+    ) = _HEADER.unpack_from(data, offset)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"无法识别的轨迹文件（偏移 {offset}）")
+    offset += _HEADER.size
+
+    wall_size = (rows * cols + 1) // 2
+    wall_masks = unpack_nibbles(data[offset:offset + wall_size], rows * cols)
+    offset += wall_size
+
+    keyframes = _from_little_endian(data[offset:offset + keyframe_count * 8])
+    offset += keyframe_count * 8
+
+    jumps = _from_little_endian(data[offset:offset + jump_count * 12])
+    offset += jump_count * 12
+
+    code_size = (steps + 3) // 4
+    path = PackedPath(bytes(data[offset:offset + code_size]), steps)
+    offset += code_size
+
+    trajectory = Trajectory(
+        keyframe_interval, rows, cols, (begin_row, begin_col), (end_row, end_col),
+        radius_history, radius_cur, wall_masks, keyframes, jumps, path
+    )
+    return trajectory, offset
+
+
+def load_trajectories(path: str) -> List[Trajectory]:
+    """ 读取文件中记录的全部回合 """
+    with open(path, "rb") as file:
+        data = memoryview(file.read())
+
+    trajectories: List[Trajectory] = []
+    offset = 0
+    while offset < len(data):
+        trajectory, offset = _read_episode(data, offset)
+        trajectories.append(trajectory)
+    return trajectories
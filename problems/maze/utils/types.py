@@ -35,6 +35,15 @@ class Direction(Action):
                 return direction
         raise ValueError(f"无效的增量: {delta}。有效的增量有：{', '.join(str(direction.value) for direction in cls.iter())}。")
     
+    @classmethod
+    def from_code(cls, code: int) -> "Direction":
+        """ 由 2 bit 方向码还原方向 """
+        return cls(DIRECTION_NAMES[code])
+
+    def code(self) -> int:
+        """ 把方向编码为 0~3 的整数，用于紧凑存储 """
+        return DIRECTION_CODES[self.name]
+
     def delta(self) -> Tuple[int, int]:
         """ 把方向变成增量 """
         return self.value
@@ -57,3 +66,9 @@ class Direction(Action):
 
     def __hash__(self):
         return hash(self.name)
+
+
+# 方向码与 Direction._members 的顺序一致：DOWN=0, LEFT=1, RIGHT=2, UP=3
+DIRECTION_NAMES: Tuple[str, ...] = tuple(Direction._members.keys())
+DIRECTION_CODES = MappingProxyType({name: code for code, name in enumerate(DIRECTION_NAMES)})
+CODE_DELTAS: Tuple[Tuple[int, int], ...] = tuple(Direction._members.values())
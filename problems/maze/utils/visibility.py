@@ -0,0 +1,118 @@
+from functools import lru_cache
+from typing import Dict, List, Tuple
+from .codec import WALL_BITS
+from .types import coordinates
+
+
+_DOWN, _UP = WALL_BITS["DOWN"], WALL_BITS["UP"]
+_RIGHT, _LEFT = WALL_BITS["RIGHT"], WALL_BITS["LEFT"]
+
+
+def _window_offsets(radius: int) -> Tuple[coordinates, ...]:
+    """ (2 * radius + 1)^2 窗口内的偏移，第 k 个偏移对应视野掩码的第 k 位 """
+    return tuple(
+        (d_row, d_col) for d_row in range(-radius, radius + 1) for d_col in range(-radius, radius + 1)
+    )
+
+
+@lru_cache(maxsize=1 << 14)
+def _decode(radius: int, mask: int) -> Tuple[coordinates, ...]:
+    """ 视野掩码 -> 偏移列表；迷宫的局部形状有限，不同的掩码并不多 """
+    offsets = _window_offsets(radius)
+    return tuple(offsets[bit] for bit in range(len(offsets)) if mask >> bit & 1)
+
+
+class SightTable:
+    """ 考虑墙壁的视野表：每格在 radius 窗口内视线可达的格子，编码为 (2 * radius + 1)^2 位的掩码
+
+    视线是两格中心之间的线段，依次穿过的每条格子边都不能有墙；恰好穿过格点时，绕格点的两条路线有一条畅通即可。
+    视线在墙壁上是对称的。每格的掩码在第一次查询时计算并缓存，之后的查询只是查表。
+    """
+    def __init__(self, masks: bytes, rows: int, cols: int, radius: int) -> None:
+        if radius < 0:
+            raise ValueError("radius 不能为负数")
+        self.masks = masks
+        self.rows = rows
+        self.cols = cols
+        self.radius = radius
+        self._offsets = _window_offsets(radius)
+        self._table: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        """ 已经计算过的格子数 """
+        return len(self._table)
+
+    def mask(self, location: coordinates) -> int:
+        cell = location[0] * self.cols + location[1]
+        mask = self._table.get(cell)
+        if mask is None:
+            mask = self._table[cell] = self._compute(location)
+        return mask
+
+    def offsets(self, location: coordinates) -> Tuple[coordinates, ...]:
+        return _decode(self.radius, self.mask(location))
+
+    def visible(self, location: coordinates) -> List[coordinates]:
+        """ 从 location 能看到的格子（包括自身） """
+        row, col = location
+        return [(row + d_row, col + d_col) for d_row, d_col in self.offsets(location)]
+
+    def _compute(self, location: coordinates) -> int:
+        rows, cols = self.rows, self.cols
+        row, col = location
+        mask = 0
+        for bit, (d_row, d_col) in enumerate(self._offsets):
+            if 0 <= row + d_row < rows and 0 <= col + d_col < cols and self._clear(row, col, d_row, d_col):
+                mask |= 1 << bit
+        return mask
+
+    def _open(self, cell: int, step_row: int, step_col: int) -> bool:
+        """ 从 cell 向 (step_row, step_col) 中的一个方向跨过格子边时没有墙 """
+        if step_row:
+            return not self.masks[cell] & (_DOWN if step_row > 0 else _UP)
+        return not self.masks[cell] & (_RIGHT if step_col > 0 else _LEFT)
+
+    def _clear(self, row: int, col: int, d_row: int, d_col: int) -> bool:
+        """ 从 (row, col) 的中心到偏移 (d_row, d_col) 的格子中心的视线上没有墙
+
+        按网格遍历的方式逐格前进：已跨过 i 条横线、j 条竖线时，下一条横线在 (2i + 1) / 2|d_row| 处，
+        下一条竖线在 (2j + 1) / 2|d_col| 处，用整数交叉相乘比较先后。
+        """
+        cols = self.cols
+        step_row = (d_row > 0) - (d_row < 0)
+        step_col = (d_col > 0) - (d_col < 0)
+        span_row, span_col = abs(d_row), abs(d_col)
+        cell = row * cols + col
+        crossed_rows = crossed_cols = 0
+        while crossed_rows < span_row or crossed_cols < span_col:
+            next_row = (2 * crossed_rows + 1) * span_col
+            next_col = (2 * crossed_cols + 1) * span_row
+            if crossed_cols == span_col or (crossed_rows < span_row and next_row < next_col):
+                if not self._open(cell, step_row, 0):
+                    return False
+                cell += step_row * cols
+                crossed_rows += 1
+            elif crossed_rows == span_row or next_col < next_row:
+                if not self._open(cell, 0, step_col):
+                    return False
+                cell += step_col
+                crossed_cols += 1
+            else:
+                # 恰好穿过格点：先纵后横、先横后纵两条路线有一条畅通即可
+                vertical_first = (
+                    self._open(cell, step_row, 0) and self._open(cell + step_row * cols, 0, step_col)
+                )
+                horizontal_first = (
+                    self._open(cell, 0, step_col) and self._open(cell + step_col, step_row, 0)
+                )
+                if not (vertical_first or horizontal_first):
+                    return False
+                cell += step_row * cols + step_col
+                crossed_rows += 1
+                crossed_cols += 1
+        return True
+
+
+def build_sight_table(masks: bytes, rows: int, cols: int, radius: int) -> SightTable:
+    """ 基于每格一个字节的墙壁掩码构建视野表，各格的掩码按需计算 """
+    return SightTable(masks, rows, cols, radius)
@@ -0,0 +1,33 @@
+import importlib
+from core.core_discovery import get_package_plugins
+from .puzzle_problem import PuzzleProblem, evaluate_func, evaluate_actions
+from .utils.board import BoardLayout, get_layout
+from .utils.types import Move
+
+
+def _plugin_modules():
+    """ 插件清单中由本包注册的渲染器：名称 -> 模块路径 """
+    return get_package_plugins(__name__, "renderer")
+
+
+def __getattr__(name: str):
+    # 渲染器依赖 pygame，按清单只在真正需要时才导入所在的模块
+    module_path = _plugin_modules().get(name)
+    if module_path is not None:
+        return getattr(importlib.import_module(module_path), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted({*globals(), *_plugin_modules()})
+
+
+__all__ = [
+    "PuzzleProblem",
+    "BoardLayout",
+    "get_layout",
+    "Move",
+    "evaluate_func",
+    "evaluate_actions",
+    *sorted(_plugin_modules())
+]
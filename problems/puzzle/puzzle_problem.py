@@ -0,0 +1,126 @@
+import random
+from core.core_bases import Problem
+from core.core_registers import ProblemRegistry
+from .utils.board import BoardLayout, get_layout
+from .utils.types import Move
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence
+
+
+@ProblemRegistry.register("PuzzleProblem")
+class PuzzleProblem(Problem):
+    """ size x size 的滑块拼图（size=3/4/5 即 8/15/24 数码），目标是 1, 2, ... 按行排列、空格在右下角
+
+    状态是 BoardLayout 编码的 int，自带增量维护的 Zobrist 哈希；动作 Move 表示空格的移动方向。
+    初始状态依次取 tiles、从目标状态随机移动 shuffle 步、在可还原的排列中均匀随机。
+    """
+    def __init__(
+        self, size: int = 3, shuffle: Optional[int] = None, seed: Optional[int] = None,
+        tiles: Optional[Sequence[int]] = None
+    ) -> None:
+        self.layout: BoardLayout = get_layout(size)
+        self.size = size
+        rng = random.Random(seed) if seed is not None else random
+        if tiles is not None:
+            if not self.layout.is_solvable(tiles):
+                raise ValueError("tiles 无法还原到目标状态")
+            self.begin = self.layout.pack(tiles)
+        elif shuffle is not None:
+            self.begin = self.layout.scrambled(shuffle, rng)
+        else:
+            self.begin = self.layout.pack(self.layout.random_tiles(rng))
+        self.end = self.layout.goal
+        self.count: int = 0
+        self.init_problem_state()
+
+    @classmethod
+    def from_config(cls, **config) -> "PuzzleProblem":
+        """ 使用配置文件初始化 PuzzleProblem 实例 """
+        return cls(
+            size=config.get("size", 3),
+            shuffle=config.get("shuffle"),
+            seed=config.get("seed"),
+            tiles=config.get("tiles")
+        )
+
+    def init_problem_state(self) -> None:
+        self.state = self.begin
+        self.count = 0
+
+    def get_start_state(self) -> int:
+        return self.begin
+
+    def get_end_state(self) -> int:
+        return self.end
+
+    def get_end_info(self) -> int:
+        return self.count
+
+    def get_state(self) -> int:
+        return self.state
+
+    def is_end_state(self, cur_state: int) -> bool:
+        return cur_state == self.end
+
+    def get_legal_actions(self, state: int) -> FrozenSet[Move]:
+        """ 只取决于空格位置，返回预先计算好的集合 """
+        return self.layout.legal_moves[self.layout.blank(state)]
+
+    def apply_action(self, action: Move) -> int:
+        new_state = self.layout.move(self.state, action)
+        if new_state != self.state:
+            self.state = new_state
+            self.count += 1
+        return self.state
+
+    def apply_action_to_state(self, state: int, action: Move) -> int:
+        """ 增量更新编码与 Zobrist 哈希，不合法的动作返回原状态 """
+        return self.layout.move(state, action)
+
+    def state_hash(self, state: int) -> int:
+        """ 状态中自带的 64 位 Zobrist 哈希，供定长置换表取下标 """
+        return self.layout.zobrist_hash(state)
+
+    def get_static_render_data(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "goal": self.layout.unpack(self.end)
+        }
+
+    def get_dynamic_render_data(self) -> Dict[str, Any]:
+        return {
+            "tiles": self.layout.unpack(self.state),
+            "count": self.count,
+            "state": self.state
+        }
+
+    def set_state(self, state: int) -> None:
+        self.state = state
+
+    def fork(self) -> "PuzzleProblem":
+        """ 状态都是 int，编码表只读，浅复制即可 """
+        child = object.__new__(type(self))
+        child.__dict__.update(self.__dict__)
+        return child
+
+
+def evaluate_func(problem: PuzzleProblem, state: int, action: Move) -> int:
+    """ 移动后各数字块到目标位置的曼哈顿距离之和 """
+    return problem.layout.manhattan(problem.apply_action_to_state(state, action))
+
+
+def evaluate_actions(problem: PuzzleProblem, state: int, actions: Sequence[Move]) -> List[int]:
+    """ evaluate_func 的批量版本：一次移动只改变一个数字块的距离，在当前状态的距离上增量计算 """
+    layout = problem.layout
+    cells, bits, distances = layout.cells, layout.bits, layout.distances
+    base = layout.manhattan(state)
+    blank = layout.blank(state)
+
+    scores = []
+    for action in actions:
+        target = layout.targets[blank].get(action)
+        if target is None:
+            scores.append(base)
+            continue
+        tile = state >> target * bits & layout.tile_mask
+        scores.append(base - distances[tile * cells + target] + distances[tile * cells + blank])
+    return scores
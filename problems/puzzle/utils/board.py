@@ -0,0 +1,138 @@
+import random
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+from .types import Move
+
+
+# 空格位置占用的位数，最大支持 32 格的棋盘
+BLANK_BITS = 5
+
+
+class BoardLayout:
+    """ size x size 滑块棋盘的整数编码，状态是一个 int：
+
+    - 低 cells * bits 位：第 i 格的数字块编号放在 [i * bits, (i + 1) * bits)，空格为 0
+    - 接下来 BLANK_BITS 位：空格所在的格子
+    - 最高 64 位：Zobrist 哈希，即每个数字块在所在格子的随机数的异或
+
+    一次移动只交换空格与一个数字块，编码、空格位置与哈希都只需异或两个数就能增量更新。
+    哈希与棋盘一一对应，因此整个 int 仍可直接作为字典键；定长置换表用 zobrist_hash 取下标。
+    """
+    def __init__(self, size: int) -> None:
+        if size < 2 or size * size > 1 << BLANK_BITS:
+            raise ValueError(f"不支持的棋盘大小：{size}")
+
+        self.size = size
+        self.cells = size * size
+        # 8 / 15 数码每格 4 bit；24 数码的编号到 24，需要 5 bit
+        self.bits = max(4, (self.cells - 1).bit_length())
+        self.tile_mask = (1 << self.bits) - 1
+        self.blank_shift = self.cells * self.bits
+        self.hash_shift = self.blank_shift + BLANK_BITS
+        self.board_mask = (1 << self.blank_shift) - 1
+
+        # zobrist[cell][tile]，空格不参与哈希
+        rng = random.Random(f"puzzle:{size}")
+        self.zobrist: List[List[int]] = [
+            [0] + [rng.getrandbits(64) for _ in range(1, self.cells)] for _ in range(self.cells)
+        ]
+        # 空格位置 -> {移动: 与之交换的格子}
+        self.targets: List[Dict[Move, int]] = []
+        for cell in range(self.cells):
+            row, col = divmod(cell, size)
+            self.targets.append({
+                move: (row + move.value[0]) * size + col + move.value[1] for move in Move.iter()
+                if 0 <= row + move.value[0] < size and 0 <= col + move.value[1] < size
+            })
+        self.legal_moves: List[frozenset] = [frozenset(targets) for targets in self.targets]
+        # distances[tile * cells + cell]：数字块 tile 在 cell 时到目标格子的曼哈顿距离，空格为 0
+        self.distances: List[int] = [0] * self.cells
+        for tile in range(1, self.cells):
+            goal_row, goal_col = divmod(tile - 1, size)
+            self.distances.extend(
+                abs(cell // size - goal_row) + abs(cell % size - goal_col) for cell in range(self.cells)
+            )
+        self.goal = self.pack(list(range(1, self.cells)) + [0])
+
+    def pack(self, tiles: Sequence[int]) -> int:
+        """ 按行优先顺序的数字块编号（空格为 0）编码为状态 """
+        if sorted(tiles) != list(range(self.cells)):
+            raise ValueError(f"tiles 必须是 0 ~ {self.cells - 1} 的一个排列")
+
+        board = 0
+        hash_value = 0
+        for cell, tile in enumerate(tiles):
+            board |= tile << cell * self.bits
+            hash_value ^= self.zobrist[cell][tile]
+        blank = list(tiles).index(0)
+        return board | blank << self.blank_shift | hash_value << self.hash_shift
+
+    def unpack(self, state: int) -> List[int]:
+        bits, mask = self.bits, self.tile_mask
+        return [state >> cell * bits & mask for cell in range(self.cells)]
+
+    def blank(self, state: int) -> int:
+        return state >> self.blank_shift & ((1 << BLANK_BITS) - 1)
+
+    def zobrist_hash(self, state: int) -> int:
+        return state >> self.hash_shift
+
+    def move(self, state: int, move: Move) -> int:
+        """ 空格朝 move 方向移动一格后的状态，越界的移动返回原状态 """
+        blank = state >> self.blank_shift & ((1 << BLANK_BITS) - 1)
+        target = self.targets[blank].get(move)
+        if target is None:
+            return state
+
+        bits = self.bits
+        tile = state >> target * bits & self.tile_mask
+        zobrist = self.zobrist
+        return (
+            state ^ tile << target * bits ^ tile << blank * bits
+            ^ (blank ^ target) << self.blank_shift
+            ^ (zobrist[target][tile] ^ zobrist[blank][tile]) << self.hash_shift
+        )
+
+    def manhattan(self, state: int) -> int:
+        """ 各数字块到目标位置的曼哈顿距离之和，是可采纳的启发函数 """
+        bits, mask, cells, distances = self.bits, self.tile_mask, self.cells, self.distances
+        return sum(distances[(state >> cell * bits & mask) * cells + cell] for cell in range(cells))
+
+    def is_solvable(self, tiles: Sequence[int]) -> bool:
+        """ 逆序数的奇偶性（偶数宽度时加上空格所在行）与目标状态相同时才能还原 """
+        numbers = [tile for tile in tiles if tile]
+        inversions = sum(
+            1 for i in range(len(numbers)) for j in range(i + 1, len(numbers)) if numbers[i] > numbers[j]
+        )
+        if self.size % 2:
+            return inversions % 2 == 0
+        blank_row = list(tiles).index(0) // self.size
+        return (inversions + blank_row) % 2 == (self.size - 1) % 2
+
+    def random_tiles(self, rng: random.Random) -> List[int]:
+        """ 在可还原的排列中均匀随机取一个 """
+        tiles = list(range(self.cells))
+        rng.shuffle(tiles)
+        if not self.is_solvable(tiles):
+            # 交换两个数字块改变逆序数的奇偶性
+            first, second = [index for index, tile in enumerate(tiles) if tile][:2]
+            tiles[first], tiles[second] = tiles[second], tiles[first]
+        return tiles
+
+    def scrambled(self, moves: int, rng: random.Random) -> int:
+        """ 从目标状态出发随机移动 moves 步（不立即走回头路），得到的状态一定可以还原 """
+        state = self.goal
+        last: Tuple[Move, ...] = ()
+        for _ in range(moves):
+            choices = [move for move in self.legal_moves[self.blank(state)] if move not in last]
+            choices.sort(key=Move.code)
+            move = rng.choice(choices)
+            state = self.move(state, move)
+            last = (move.reverse(),)
+        return state
+
+
+@lru_cache(maxsize=None)
+def get_layout(size: int) -> BoardLayout:
+    """ 同一大小的棋盘共享一份编码表 """
+    return BoardLayout(size)
@@ -0,0 +1,86 @@
+import pygame
+from core.core_bases import Problem, Renderer
+from typing import Any, Dict, Optional
+from core.core_registers import RendererRegistry
+
+
+draw_rect = pygame.draw.rect
+
+
+@RendererRegistry.register("PuzzleRenderer")
+class PuzzleRenderer(Renderer):
+    @classmethod
+    def create_offscreen(cls, problem: Problem, **config) -> "PuzzleRenderer":
+        """ 创建绘制到内存 Surface 上的渲染器，不需要打开窗口 """
+        tile_size = config.get("tile_size", 80)
+        gap = config.get("gap", 4)
+        offset = config.get("offset", 30)
+        size = problem.get_static_render_data()["size"]
+
+        length = size * (tile_size + gap) + gap + 2 * offset
+        screen = pygame.Surface((length, length))
+        return cls(screen, problem, **{**config, "offscreen": True})
+
+    def init_renderer(self, config: Dict[str, Any] = None) -> None:
+        """ 初始化渲染器 """
+        pygame.font.init()
+        self.tile_size = config.get("tile_size", 80)
+        self.gap = config.get("gap", 4)
+        self.offset = config.get("offset", 30)
+        self.color_config = config.get("color_config", {
+            "background": (255, 255, 255),
+            "board": (60, 60, 60),
+            "tile": (240, 200, 120),
+            "placed": (150, 210, 150),
+            "number": (0, 0, 0),
+            "text": (0, 0, 255)
+        })
+        self.font_size = config.get("font_size", 24)
+        self.offscreen = config.get("offscreen", False)
+
+        self.static_data_dict: Dict[str, Any] = self.problem.get_static_render_data()
+        self.dynamic_data_dict: Dict[str, Any] = self.problem.get_dynamic_render_data()
+        self.size = self.static_data_dict["size"]
+        self.goal = self.static_data_dict["goal"]
+        self.number_font = pygame.font.Font(None, self.tile_size // 2)
+        self.render()
+
+    def render(self, dynamic_data: Optional[Dict[str, Any]] = None) -> None:
+        """ 渲染棋盘；dynamic_data 为其他线程发布的状态快照时，不再向问题查询 """
+        self.screen.fill(self.color_config["background"])
+        self.dynamic_data_dict = dynamic_data or self.problem.get_dynamic_render_data()
+        self._draw_board()
+        self._draw_counter()
+
+        if not self.offscreen:
+            pygame.display.flip()
+
+    def grab_frame(self) -> Any:
+        """ 以 NumPy 数组 (宽, 高, 3) 的形式复制当前画面 """
+        return pygame.surfarray.array3d(self.screen)
+
+    def _draw_counter(self) -> None:
+        font = pygame.font.Font(None, self.font_size)
+        text = font.render(
+            f"Count: {self.dynamic_data_dict['count']}",
+            True, self.color_config["text"]
+        )
+        self.screen.blit(text, (self.offset / 2, self.offset / 2))
+
+    def _draw_board(self) -> None:
+        """ 绘制棋盘与数字块，已经在目标位置的数字块用另一种颜色 """
+        step = self.tile_size + self.gap
+        length = self.size * step + self.gap
+        draw_rect(self.screen, self.color_config["board"], (self.offset, self.offset, length, length))
+
+        for cell, tile in enumerate(self.dynamic_data_dict["tiles"]):
+            if not tile:
+                continue
+            row, col = divmod(cell, self.size)
+            x = self.offset + self.gap + col * step
+            y = self.offset + self.gap + row * step
+            color = self.color_config["placed"] if self.goal[cell] == tile else self.color_config["tile"]
+            draw_rect(self.screen, color, (x, y, self.tile_size, self.tile_size))
+
+            number = self.number_font.render(str(tile), True, self.color_config["number"])
+            self.screen.blit(number, number.get_rect(center=(x + self.tile_size // 2, y + self.tile_size // 2)))
@@ -0,0 +1,67 @@
+from core import Action
+from types import MappingProxyType
+from typing import List, Tuple
+
+
+class Move(Action):
+    """ 空格的移动方向：空格与该方向上相邻的数字块交换位置 """
+    _members = MappingProxyType({
+        "DOWN": (1, 0),
+        "LEFT": (0, -1),
+        "RIGHT": (0, 1),
+        "UP": (-1, 0)
+    })
+
+    def __init__(self, action_str: str) -> None:
+        self.name = action_str
+        self.value = self._members[action_str]
+
+    @classmethod
+    def iter(cls) -> List["Move"]:
+        return [MOVES[name] for name in cls._members]
+
+    @classmethod
+    def from_tuple(cls, delta: Tuple[int, int]) -> "Move":
+        for move in cls.iter():
+            if move.value == delta:
+                return move
+        raise ValueError(f"无效的增量: {delta}。有效的增量有：{', '.join(str(move.value) for move in cls.iter())}。")
+
+    @classmethod
+    def from_code(cls, code: int) -> "Move":
+        """ 由 2 bit 方向码还原方向 """
+        return MOVES[MOVE_NAMES[code]]
+
+    def code(self) -> int:
+        """ 把方向编码为 0~3 的整数，与迷宫的 Direction 编码一致 """
+        return MOVE_CODES[self.name]
+
+    def delta(self) -> Tuple[int, int]:
+        return self.value
+
+    def reverse(self) -> "Move":
+        """ 反向移动，撤销这一步 """
+        return MOVES[_REVERSE_NAMES[self.name]]
+
+    def __repr__(self) -> str:
+        move_str = {
+            "UP": '↑',
+            "DOWN": '↓',
+            "LEFT": '←',
+            "RIGHT": '→'
+        }
+        return move_str[self.name]
+
+    def __eq__(self, value: "Move"):
+        return isinstance(value, Move) and self.name == value.name
+
+    def __hash__(self):
+        return hash(self.name)
+
+
+# 方向码与 Move._members 的顺序一致：DOWN=0, LEFT=1, RIGHT=2, UP=3
+MOVE_NAMES: Tuple[str, ...] = tuple(Move._members.keys())
+MOVE_CODES = MappingProxyType({name: code for code, name in enumerate(MOVE_NAMES)})
+_REVERSE_NAMES = MappingProxyType({"DOWN": "UP", "UP": "DOWN", "LEFT": "RIGHT", "RIGHT": "LEFT"})
+# 四个方向各只有一个实例，搜索时不必反复创建对象
+MOVES = MappingProxyType({name: Move(name) for name in MOVE_NAMES})
@@ -0,0 +1,24 @@
+import os
+
+# render_every 开启时用离屏 Surface 渲染，需在导入 pygame 之前设置
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from .config import DEFAULT_OPTIONS, load_config, expand_grid, expand_cells, cell_key  # noqa: E402
+from .memory import MemoryProfiler, classify  # noqa: E402
+from .store import ResultStore, STATUSES  # noqa: E402
+from .sweep import run_cell, run_sweep, make_renderer  # noqa: E402
+
+__all__ = [
+    "DEFAULT_OPTIONS",
+    "load_config",
+    "expand_grid",
+    "expand_cells",
+    "cell_key",
+    "ResultStore",
+    "STATUSES",
+    "MemoryProfiler",
+    "classify",
+    "run_cell",
+    "run_sweep",
+    "make_renderer"
+]
@@ -0,0 +1,56 @@
+import sys
+import argparse
+from . import load_config, expand_cells, run_sweep, ResultStore
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m runner",
+        description="按配置文件展开参数网格，并行运行并把每个单元格的结果写入 SQLite，可中断后继续"
+    )
+    parser.add_argument("config", help="JSON 或 TOML 格式的扫参配置")
+    parser.add_argument("--workers", "-j", type=int, help="工作进程数，覆盖配置中的 workers")
+    parser.add_argument("--database", "-d", help="结果库路径，覆盖配置中的 database")
+    parser.add_argument("--retry-errors", action="store_true", help="重新运行出错的单元格")
+    parser.add_argument("--dry-run", action="store_true", help="只统计单元格数量，不运行")
+    parser.add_argument("--memory", type=int, metavar="STEPS", help="开启内存分析，每隔 STEPS 步拍一次快照")
+    parser.add_argument("--memory-dir", help="内存分析报告的输出目录")
+    parser.add_argument("--effort", action="store_true", default=None, help="统计智能体的搜索工作量")
+    parser.add_argument(
+        "--no-track-states", dest="effort_track_states", action="store_false", default=None,
+        help="统计搜索工作量时不记录不同状态数"
+    )
+    parser.add_argument("--render-every", type=int, metavar="STEPS", help="每隔 STEPS 步离屏渲染一帧")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    config = load_config(args.config)
+    for option, value in (
+        ("memory_interval", args.memory), ("memory_dir", args.memory_dir), ("render_every", args.render_every),
+        ("effort", args.effort), ("effort_track_states", args.effort_track_states)
+    ):
+        if value is not None:
+            config[option] = value
+
+    if args.dry_run:
+        cells = expand_cells(config)
+        with ResultStore(args.database or config["database"]) as store:
+            done = store.completed_keys(include_errors=not args.retry_errors)
+        remaining = sum(cell["key"] not in done for cell in cells)
+        print(f"共 {len(cells)} 个单元格，待运行 {remaining} 个")
+        return 0
+
+    try:
+        summary = run_sweep(config, workers=args.workers, database=args.database, retry_errors=args.retry_errors)
+    except KeyboardInterrupt:
+        print("\n已中断，已完成的单元格都已写入结果库，重新运行同一配置即可继续")
+        return 130
+
+    print(", ".join(f"{name}: {count}" for name, count in summary.items()))
+    return 1 if summary.get("error") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+import json
+import hashlib
+import itertools
+from typing import Any, Dict, Iterator, List, Mapping
+
+
+# 配置文件中除参数网格之外的运行选项及其默认值
+DEFAULT_OPTIONS: Dict[str, Any] = {
+    "problem": "MazeProblem",
+    "problem_params": {},
+    "agents": [],
+    "agent_params": {},
+    "seeds": [0],
+    "max_steps": 100000,
+    # 非阻塞的智能体连续多少次返回 None 且状态不变时判定为卡住
+    "idle_limit": 1000,
+    # "模块:属性" 形式的启发函数；None 表示使用问题所在包导出的函数，空字符串表示不使用
+    "evaluate": None,
+    "evaluate_actions": None,
+    "workers": 1,
+    # 单进程运行 MazeProblem 时在后台预先生成的迷宫数，0 表示不预生成
+    "maze_pool": 2,
+    "database": "sweep.sqlite",
+    # 每隔多少步用离屏 Surface 渲染一帧，0 表示不渲染
+    "render_every": 0,
+    # 内存分析：每隔多少步拍一次 tracemalloc 快照，0 表示关闭
+    "memory_interval": 0,
+    "memory_top": 25,
+    "memory_frames": 4,
+    "memory_dir": "memory",
+    # 搜索工作量统计：用 CountingProblem 包装交给智能体的问题，每隔 effort_interval 步统计一次智能体的内存
+    "effort": False,
+    "effort_interval": 10000,
+    # 是否记录出现过的不同状态数；状态空间很大时（如 IDA* 求解 15/24 数码）关闭以免集合无限增长
+    "effort_track_states": True,
+}
+
+
+def load_config(path: str) -> Dict[str, Any]:
+    """ 读取 JSON 或 TOML 格式的扫参配置，缺省的选项取 DEFAULT_OPTIONS """
+    if path.endswith(".toml"):
+        import tomllib
+        with open(path, "rb") as file:
+            config = tomllib.load(file)
+    else:
+        with open(path, "r", encoding="utf-8") as file:
+            config = json.load(file)
+
+    unknown = set(config) - set(DEFAULT_OPTIONS)
+    if unknown:
+        raise ValueError(f"未知的配置项：{', '.join(sorted(unknown))}")
+    return {**DEFAULT_OPTIONS, **config}
+
+
+def expand_grid(params: Mapping[str, Any]) -> Iterator[Dict[str, Any]]:
+    """ 展开参数网格：值为列表的参数取笛卡尔积，其余参数保持不变
+
+    需要把列表本身作为参数值时（例如 begin 坐标），写成只有一个元素的列表：{"begin": [[0, 0]]}。
+    """
+    names = sorted(params)
+    choices = [params[name] if isinstance(params[name], list) else [params[name]] for name in names]
+    for values in itertools.product(*choices):
+        yield dict(zip(names, values))
+
+
+def cell_key(cell: Mapping[str, Any]) -> str:
+    """ 由单元格的全部参数得到稳定的键，配置文件中参数的顺序不影响结果 """
+    encoded = json.dumps(cell, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+def expand_cells(config: Mapping[str, Any]) -> List[Dict[str, Any]]:
+    """ 问题参数 × 智能体 × 智能体参数 × 种子，得到所有待运行的单元格 """
+    if not config["agents"]:
+        raise ValueError("配置中至少需要一个智能体")
+
+    cells: List[Dict[str, Any]] = []
+    for problem_params in expand_grid(config["problem_params"]):
+        for agent in config["agents"]:
+            for agent_params in expand_grid(config["agent_params"]):
+                for seed in config["seeds"]:
+                    cell = {
+                        "problem": config["problem"],
+                        "problem_params": problem_params,
+                        "agent": agent,
+                        "agent_params": agent_params,
+                        "seed": seed,
+                        "max_steps": config["max_steps"],
+                        # 启发函数、卡住判定与状态统计都会影响结果，同样计入键中
+                        "evaluate": config["evaluate"],
+                        "evaluate_actions": config["evaluate_actions"],
+                        "idle_limit": config["idle_limit"],
+                        "effort_track_states": config["effort_track_states"],
+                    }
+                    # 渲染与内存分析会改变测得的耗时，开启时作为单元格的一部分，与普通运行的结果分开保存
+                    for option in ("render_every", "memory_interval", "effort"):
+                        if config[option]:
+                            cell[option] = config[option]
+                    cell["key"] = cell_key(cell)
+                    cells.append(cell)
+    return cells
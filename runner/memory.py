@@ -0,0 +1,164 @@
+import os
+import json
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional, Tuple
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SUBSYSTEMS = ("problem", "agent", "renderer", "core", "runner", "other")
+# 分析器自身的分配（快照、采样记录）不计入任何子系统
+_IGNORED_FILES = {tracemalloc.__file__, __file__}
+
+
+def classify(filename: str) -> Optional[str]:
+    """ 按源文件路径判断所属子系统，项目之外的文件返回 None
+
+    渲染器（*renderer*.py 与帧导出）优先，其次是智能体目录（agents/ 与各问题下的 agents/）以及打分缓存，
+    其余 problems/ 下的文件属于问题。
+    """
+    path = os.path.abspath(filename)
+    if not path.startswith(PROJECT_ROOT + os.sep):
+        return None
+
+    parts = os.path.relpath(path, PROJECT_ROOT).split(os.sep)
+    name = parts[-1]
+    if "renderer" in name or name == "frame_exporter.py":
+        return "renderer"
+    if "agents" in parts[:-1] or name == "core_scoring.py":
+        return "agent"
+    if parts[0] in ("problems", "core", "runner"):
+        return "problem" if parts[0] == "problems" else parts[0]
+    return "other"
+
+
+def _slope(points: List[Tuple[int, int]]) -> Optional[float]:
+    """ 最小二乘拟合的斜率（字节 / 步），少于两个采样点时为 None """
+    if len(points) < 2:
+        return None
+    count = len(points)
+    mean_x = sum(x for x, _ in points) / count
+    mean_y = sum(y for _, y in points) / count
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    if variance == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+
+class MemoryProfiler:
+    """ 每隔 interval 步拍一次 tracemalloc 快照，把当前存活的内存按子系统归类
+
+    每块内存沿调用栈从最内层往外找第一个属于本项目的帧，按该帧的文件归入问题、智能体、渲染器等子系统，
+    所以标准库与 C 扩展（例如 pygame）分配的内存会记在调用它们的项目代码上。
+    子系统的峰值是各次采样中的最大值；增长率是字节数对步数的线性拟合斜率，
+    late_growth 只拟合后一半采样，明显大于 growth 时说明增长在加速（例如二次增长）。
+    """
+    def __init__(self, interval: int, top: int = 25, frames: int = 4) -> None:
+        if interval < 1:
+            raise ValueError("interval 必须是正整数")
+        self.interval = interval
+        self.top = top
+        self.frames = frames
+        self.samples: List[Dict[str, Any]] = []
+        self._classified: Dict[str, Optional[str]] = {}
+        self._first: Optional[tracemalloc.Snapshot] = None
+        self._last: Optional[tracemalloc.Snapshot] = None
+        self._start_time = 0.0
+        self.traced_peak = 0
+
+    def start(self) -> None:
+        tracemalloc.start(self.frames)
+        self._start_time = time.perf_counter()
+
+    def _classify(self, filename: str) -> Optional[str]:
+        if filename not in self._classified:
+            self._classified[filename] = classify(filename)
+        return self._classified[filename]
+
+    def _attribute(self, snapshot: tracemalloc.Snapshot) -> Dict[str, int]:
+        totals = dict.fromkeys(SUBSYSTEMS, 0)
+        for statistic in snapshot.statistics("traceback"):
+            if statistic.traceback[-1].filename in _IGNORED_FILES:
+                continue
+            subsystem = "other"
+            # 帧按从外到内的顺序排列
+            for frame in reversed(statistic.traceback):
+                found = self._classify(frame.filename)
+                if found is not None:
+                    subsystem = found
+                    break
+            totals[subsystem] += statistic.size
+        return totals
+
+    def sample(self, step: int) -> None:
+        # 不用 Snapshot.filter_traces：它对每条记录做通配符匹配，在大快照上比分析本身慢得多
+        snapshot = tracemalloc.take_snapshot()
+        if self._first is None:
+            self._first = snapshot
+        self._last = snapshot
+        self.samples.append({
+            "step": step,
+            "time_s": time.perf_counter() - self._start_time,
+            "bytes": self._attribute(snapshot),
+        })
+
+    def maybe_sample(self, step: int) -> None:
+        if step % self.interval == 0:
+            self.sample(step)
+
+    def stop(self, step: int) -> None:
+        if not self.samples or self.samples[-1]["step"] != step:
+            self.sample(step)
+        self.traced_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    def summary(self) -> Dict[str, Any]:
+        """ 各子系统的峰值、最终值与增长率，写入结果库的 extra 字段 """
+        subsystems: Dict[str, Dict[str, Any]] = {}
+        half = len(self.samples) // 2
+        for name in SUBSYSTEMS:
+            points = [(sample["step"], sample["bytes"][name]) for sample in self.samples]
+            if not any(size for _, size in points):
+                continue
+            subsystems[name] = {
+                "peak_bytes": max(size for _, size in points),
+                "final_bytes": points[-1][1],
+                "growth_bytes_per_step": _slope(points),
+                "late_growth_bytes_per_step": _slope(points[half:]),
+            }
+        return {"traced_peak_bytes": self.traced_peak, "subsystems": subsystems}
+
+    def _site(self, statistic: Any, diff: bool = False) -> Dict[str, Any]:
+        frame = statistic.traceback[0]
+        site = {
+            "file": os.path.relpath(frame.filename, PROJECT_ROOT) if self._classify(frame.filename) else frame.filename,
+            "line": frame.lineno,
+            "subsystem": self._classify(frame.filename) or "other",
+            "size_bytes": statistic.size,
+            "count": statistic.count,
+        }
+        if diff:
+            site["size_diff_bytes"] = statistic.size_diff
+            site["count_diff"] = statistic.count_diff
+        return site
+
+    def report(self) -> Dict[str, Any]:
+        """ 完整报告：摘要、全部采样、最终存活内存最多的分配点，以及相对第一次采样增长最多的分配点 """
+        report = {**self.summary(), "interval": self.interval, "samples": self.samples}
+        if self._last is not None:
+            sites = [
+                item for item in self._last.statistics("lineno")
+                if item.traceback[0].filename not in _IGNORED_FILES
+            ]
+            growth = [
+                item for item in self._last.compare_to(self._first, "lineno")
+                if item.traceback[0].filename not in _IGNORED_FILES
+            ]
+            report["top_sites"] = [self._site(item) for item in sites[:self.top]]
+            report["top_growth"] = [self._site(item, diff=True) for item in growth[:self.top]]
+        return report
+
+    def dump(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.report(), file, ensure_ascii=False, indent=2)
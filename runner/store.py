@@ -0,0 +1,90 @@
+import json
+import sqlite3
+import time
+from typing import Any, Dict, List, Mapping, Optional, Set
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    problem TEXT NOT NULL,
+    problem_params TEXT NOT NULL,
+    agent TEXT NOT NULL,
+    agent_params TEXT NOT NULL,
+    seed INTEGER,
+    status TEXT NOT NULL,
+    steps INTEGER,
+    end_info TEXT,
+    elapsed_s REAL,
+    error TEXT,
+    extra TEXT,
+    finished_at TEXT NOT NULL
+)
+"""
+
+# status 的取值：ok 到达终止状态；max_steps 达到步数上限；stuck 智能体放弃（返回 None 且状态不变）；error 抛出异常
+STATUSES = ("ok", "max_steps", "stuck", "error")
+
+
+class ResultStore:
+    """ 扫参结果库：每个单元格一行，以参数的哈希为主键
+
+    每写入一行就提交一次，进程在任意时刻被中断，已经完成的单元格都不会丢失。
+    只有主进程写数据库，工作进程把结果交回主进程，因此不需要处理 SQLite 的并发写入。
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(_SCHEMA)
+        self._connection.commit()
+
+    def completed_keys(self, include_errors: bool = True) -> Set[str]:
+        """ 已经有结果的单元格；include_errors 为 False 时出错的单元格会被重新运行 """
+        query = "SELECT key FROM results"
+        if not include_errors:
+            query += " WHERE status != 'error'"
+        return {key for (key,) in self._connection.execute(query)}
+
+    def write(self, result: Mapping[str, Any]) -> None:
+        """ 写入（或覆盖）一个单元格的结果并立即提交 """
+        self._connection.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                result["key"], result["problem"], json.dumps(result["problem_params"], sort_keys=True),
+                result["agent"], json.dumps(result["agent_params"], sort_keys=True), result["seed"],
+                result["status"], result.get("steps"), _dumps(result.get("end_info")),
+                result.get("elapsed_s"), result.get("error"), _dumps(result.get("extra")),
+                time.strftime("%Y-%m-%dT%H:%M:%S")
+            )
+        )
+        self._connection.commit()
+
+    def rows(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """ 以字典列表的形式读出结果，JSON 字段会被解码 """
+        query, args = "SELECT * FROM results", ()
+        if status is not None:
+            query, args = query + " WHERE status = ?", (status,)
+        cursor = self._connection.execute(query, args)
+        names = [column[0] for column in cursor.description]
+        rows = []
+        for values in cursor:
+            row = dict(zip(names, values))
+            for name in ("problem_params", "agent_params", "end_info", "extra"):
+                if row[name] is not None:
+                    row[name] = json.loads(row[name])
+            rows.append(row)
+        return rows
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _dumps(value: Any) -> Optional[str]:
+    return None if value is None else json.dumps(value, default=str)
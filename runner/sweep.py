@@ -0,0 +1,268 @@
+import os
+import time
+import random
+import importlib
+import traceback
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Mapping, Optional
+from core import AgentRegistry, ProblemRegistry, RendererRegistry, CountingProblem, Problem, Renderer
+from problems import get_evaluate_funcs
+from problems.maze import MazePool
+from .config import cell_key, expand_cells
+from .memory import MemoryProfiler
+from .store import ResultStore
+
+
+# 非阻塞的智能体返回 None 后再次询问前等待的时间（秒）
+IDLE_POLL_INTERVAL = 0.001
+
+
+def resolve(path: Optional[str]) -> Optional[Callable]:
+    """ 把 "模块:属性" 形式的字符串解析为对象，空值表示不使用 """
+    if not path:
+        return None
+    module_path, _, attribute = path.partition(":")
+    return getattr(importlib.import_module(module_path), attribute)
+
+
+def make_renderer(problem_name: str, problem: Problem) -> Renderer:
+    """ 创建绘制到内存 Surface 上的渲染器，渲染器名称按 game.py 的约定由问题名称得到 """
+    import pygame
+
+    renderer_name = problem_name.replace("Problem", "Renderer")
+    renderer_class = RendererRegistry.get_renderer(renderer_name)
+    if renderer_class is None:
+        raise ValueError(f"未注册的渲染器：{renderer_name}")
+    if hasattr(renderer_class, "create_offscreen"):
+        return renderer_class.create_offscreen(problem)
+    return renderer_class(pygame.Surface((800, 800)), problem)
+
+
+def run_cell(
+    cell: Mapping[str, Any], memory_options: Optional[Mapping[str, Any]] = None,
+    effort_interval: int = 10000, walls: Optional[Any] = None
+) -> Dict[str, Any]:
+    """ 运行一个单元格（一局），返回可以写入 ResultStore 的结果；异常被记录为 error 状态而不是抛出
+
+    单元格开启内存分析时，问题与智能体的构建也在分析范围内，完整报告写到 memory_dir/<key>.json，
+    各子系统的峰值与增长率放在结果的 extra 字段中。开启 effort 时智能体拿到的是 CountingProblem，
+    各方法的调用次数、不同状态数（effort_track_states 为 False 时不统计）与智能体内存的峰值
+    （每 effort_interval 步及结束时统计）同样放在 extra 中。
+    智能体返回 None 时，阻塞的智能体立即记为 stuck；blocking 为 False 的智能体（还在等待决策）
+    只有连续 idle_limit 次返回 None 且状态不变时才记为 stuck，等待的轮次不计入步数。
+    walls 为 MazePool 预先生成的墙壁，给出时问题直接使用，不再生成。
+    """
+    result: Dict[str, Any] = {
+        name: cell[name] for name in ("key", "problem", "problem_params", "agent", "agent_params", "seed")
+    }
+    memory_options = memory_options or {}
+    profiler: Optional[MemoryProfiler] = None
+    if cell.get("memory_interval"):
+        profiler = MemoryProfiler(
+            cell["memory_interval"], top=memory_options.get("top", 25), frames=memory_options.get("frames", 4)
+        )
+        profiler.start()
+
+    render_every = cell.get("render_every", 0)
+    evaluate, evaluate_actions = cell.get("evaluate"), cell.get("evaluate_actions")
+    idle_limit = cell.get("idle_limit", 1000)
+    counter: Optional[CountingProblem] = None
+    start = time.perf_counter()
+    steps = 0
+    try:
+        random.seed(cell["seed"])
+        problem_class = ProblemRegistry.get_problem(cell["problem"])
+        agent_class = AgentRegistry.get_agent(cell["agent"])
+        # 问题参数中没有单独指定 seed 时使用单元格的种子，保证同一单元格总是得到同一个问题实例
+        problem_config = {"seed": cell["seed"], **cell["problem_params"]}
+        if walls is not None:
+            problem_config["walls"] = walls
+        problem = problem_class.from_config(**problem_config)
+        default_func, default_actions = get_evaluate_funcs(problem_class)
+        agent = agent_class.from_config(
+            evaluate_func=default_func if evaluate is None else resolve(evaluate),
+            evaluate_actions=default_actions if evaluate_actions is None else resolve(evaluate_actions),
+            **cell["agent_params"]
+        )
+        renderer = make_renderer(cell["problem"], problem) if render_every else None
+        if cell.get("effort"):
+            counter = CountingProblem(problem, track_states=cell.get("effort_track_states", True))
+        agent_problem = counter or problem
+
+        blocking = getattr(agent, "blocking", True)
+        idle, idle_state = 0, None
+        status = "max_steps"
+        while steps < cell["max_steps"]:
+            if profiler is not None:
+                profiler.maybe_sample(steps)
+            if renderer is not None and steps % render_every == 0:
+                renderer.render()
+            if problem.is_end_state(problem.get_state()):
+                status = "ok"
+                break
+
+            action = agent.select_action(agent_problem)
+            if counter is not None and steps % effort_interval == 0:
+                counter.sample_agent(agent)
+            if action is None:
+                # 非阻塞的智能体（如 MazeRemoteAgent）在等待决策时返回 None，连续 idle_limit 次且状态不变才算卡住
+                if blocking:
+                    status = "stuck"
+                    break
+                state = problem.get_state()
+                idle = idle + 1 if state == idle_state else 1
+                idle_state = state
+                if idle >= idle_limit:
+                    status = "stuck"
+                    break
+                time.sleep(IDLE_POLL_INTERVAL)
+                continue
+            idle = 0
+            problem.apply_action(action)
+            steps += 1
+        else:
+            if problem.is_end_state(problem.get_state()):
+                status = "ok"
+
+        result.update(status=status, steps=steps, end_info=problem.get_end_info())
+        if counter is not None:
+            counter.sample_agent(agent)
+    except Exception:
+        result.update(status="error", error=traceback.format_exc())
+
+    result["elapsed_s"] = time.perf_counter() - start
+    extra: Dict[str, Any] = {}
+    if profiler is not None:
+        profiler.stop(steps)
+        profiler.dump(os.path.join(memory_options.get("dir", "memory"), f"{cell['key']}.json"))
+        extra["memory"] = profiler.summary()
+    if counter is not None:
+        extra["effort"] = counter.summary()
+    if extra:
+        result["extra"] = extra
+    return result
+
+
+def _maze_config(cell: Mapping[str, Any]) -> Dict[str, Any]:
+    """ 单元格的问题参数，与 run_cell 构建问题时使用的参数相同 """
+    return {"seed": cell["seed"], **cell["problem_params"]}
+
+
+def _make_maze_pool(config: Mapping[str, Any], cells: List[Dict[str, Any]]) -> Optional[MazePool]:
+    """ 单进程运行 MazeProblem 时，用 MazePool 在后台生成后面单元格的迷宫，使生成与智能体的运行重叠
+
+    cells 会被原地排序，使用同一个迷宫的单元格相邻，只生成一次。内存分析需要把迷宫生成计入问题，
+    迷宫没有固定种子时结果无法复现，这两种情况不使用预生成。
+    """
+    if (
+        config["problem"] != "MazeProblem" or config["maze_pool"] < 1 or config["memory_interval"]
+        or any(_maze_config(cell).get("seed") is None or "walls" in cell["problem_params"] for cell in cells)
+    ):
+        return None
+
+    cells.sort(key=lambda cell: cell_key(_maze_config(cell)))
+    configs: List[Dict[str, Any]] = []
+    for cell in cells:
+        maze_config = _maze_config(cell)
+        if not configs or cell_key(configs[-1]) != cell_key(maze_config):
+            configs.append(maze_config)
+    return MazePool(size=config["maze_pool"], configs=configs)
+
+
+def _check_names(config: Mapping[str, Any]) -> None:
+    """ 在启动工作进程之前检查问题与智能体是否已注册 """
+    if ProblemRegistry.get_problem(config["problem"]) is None:
+        raise ValueError(f"未注册的问题：{config['problem']}")
+    for agent in config["agents"]:
+        if AgentRegistry.get_agent(agent) is None:
+            raise ValueError(f"未注册的智能体：{agent}")
+
+
+def run_sweep(
+    config: Mapping[str, Any], workers: Optional[int] = None, database: Optional[str] = None,
+    retry_errors: bool = False, verbose: bool = True
+) -> Dict[str, int]:
+    """ 展开参数网格，跳过结果库中已有的单元格，其余单元格并行运行，每完成一个就写入结果库
+
+    中断后使用同一份配置重新运行即可从中断处继续。返回各个状态的单元格数量。
+    """
+    _check_names(config)
+    cells = expand_cells(config)
+    workers = workers or config["workers"]
+    memory_options = {
+        "top": config["memory_top"], "frames": config["memory_frames"], "dir": config["memory_dir"]
+    }
+    run = partial(run_cell, memory_options=memory_options, effort_interval=config["effort_interval"])
+
+    summary: Dict[str, int] = {"total": len(cells), "skipped": 0}
+    with ResultStore(database or config["database"]) as store:
+        done = store.completed_keys(include_errors=not retry_errors)
+        pending: List[Dict[str, Any]] = [cell for cell in cells if cell["key"] not in done]
+        summary["skipped"] = len(cells) - len(pending)
+        if verbose:
+            print(f"共 {len(cells)} 个单元格，已完成 {summary['skipped']} 个，待运行 {len(pending)} 个", flush=True)
+
+        finished = 0
+
+        def finish(result: Dict[str, Any]) -> None:
+            nonlocal finished
+            store.write(result)
+            finished += 1
+            summary[result["status"]] = summary.get(result["status"], 0) + 1
+            if verbose:
+                print(_format_result(result, finished, len(pending)), flush=True)
+
+        if workers == 1:
+            pool = _make_maze_pool(config, pending)
+            try:
+                maze_key, walls = None, None
+                for cell in pending:
+                    if pool is not None and cell_key(_maze_config(cell)) != maze_key:
+                        maze_key, walls = cell_key(_maze_config(cell)), pool.get_walls()
+                    finish(run(cell, walls=walls))
+            finally:
+                if pool is not None:
+                    pool.close()
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(run, cell) for cell in pending]
+                try:
+                    for future in as_completed(futures):
+                        finish(future.result())
+                except KeyboardInterrupt:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+
+    return summary
+
+
+def _format_result(result: Mapping[str, Any], index: int, total: int) -> str:
+    params = ", ".join(f"{name}={value}" for name, value in result["problem_params"].items())
+    agent_params = ", ".join(f"{name}={value}" for name, value in result["agent_params"].items())
+    agent = f"{result['agent']}({agent_params})" if agent_params else result["agent"]
+    return (
+        f"[{index}/{total}] {result['status']:<9} {agent:<28} seed={result['seed']:<4} {params} "
+        f"steps={result.get('steps')} {result['elapsed_s']:.3f} s" + _format_memory(result) + _format_effort(result)
+    )
+
+
+def _format_memory(result: Mapping[str, Any]) -> str:
+    memory = (result.get("extra") or {}).get("memory")
+    if not memory:
+        return ""
+    parts = [
+        f"{name}={stats['peak_bytes'] / 1024 / 1024:.1f}MiB"
+        for name, stats in memory["subsystems"].items() if name in ("problem", "agent", "renderer")
+    ]
+    return f" peak={memory['traced_peak_bytes'] / 1024 / 1024:.1f}MiB " + " ".join(parts)
+
+
+def _format_effort(result: Mapping[str, Any]) -> str:
+    effort = (result.get("extra") or {}).get("effort")
+    if not effort:
+        return ""
+    return (
+        f" legal={effort['get_legal_actions']} applied={effort['apply_action_to_state']}"
+        f" states={effort.get('distinct_states', '-')} agent={effort['agent_peak_bytes'] / 1024 / 1024:.1f}MiB"
+    )
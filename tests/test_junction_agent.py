@@ -0,0 +1,30 @@
+import random
+import pytest
+from problems.maze.maze_problem import MazeProblem
+from problems.maze.agents.junction_agent import MazeJunctionAgent
+
+
+def _run(problem: MazeProblem, max_steps: int = 10000) -> int:
+    agent = MazeJunctionAgent.from_config()
+    steps = 0
+    while steps < max_steps and not problem.is_end_state(problem.get_state()):
+        problem.apply_action(agent.select_action(problem))
+        steps += 1
+    return steps
+
+
+def test_reaches_end_without_fog():
+    random.seed(3)
+    problem = MazeProblem(rows=24, cols=24)
+    _run(problem)
+    assert problem.is_end_state(problem.get_state())
+
+
+def test_rejects_fog():
+    """ 收缩图基于真实的墙壁，迷雾模式下不能用它规划 """
+    random.seed(3)
+    problem = MazeProblem(rows=24, cols=24, fog=True)
+    with pytest.raises(ValueError):
+        _run(problem)
+    with pytest.raises(ValueError):
+        problem.get_maze_graph(problem.get_state())